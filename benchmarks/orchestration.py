@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+"""
+Orchestration Benchmark for DevOps CLI
+Runs every tool's install/update against fake package managers that record
+their calls and sleep a fixed time, and reports wall time, orchestration
+overhead and redundant commands per tool
+"""
+
+import argparse
+import importlib
+import io
+import json
+import os
+import shutil
+import stat
+import sys
+import tempfile
+import time
+from collections import Counter
+from contextlib import contextmanager, redirect_stdout
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+TOOLS = ['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform']
+
+DISTROS = {
+    'ubuntu': 'Ubuntu 22.04.3 LTS',
+    'centos': 'CentOS Stream 9',
+}
+
+# Fake executables: name -> (simulated seconds, stdout)
+FAKE_COMMANDS = {
+    'apt': (0.20, ''),
+    'apt-get': (0.20, ''),
+    'apt-key': (0.02, ''),
+    'add-apt-repository': (0.05, ''),
+    'dpkg': (0.02, ''),
+    'yum': (0.20, ''),
+    'yum-config-manager': (0.05, ''),
+    'dnf': (0.20, ''),
+    'rpm': (0.02, ''),
+    'snap': (0.20, ''),
+    'curl': (0.10, ''),
+    'wget': (0.10, ''),
+    'gpg': (0.02, ''),
+    'systemctl': (0.05, ''),
+    'usermod': (0.01, ''),
+    'lsb_release': (0.0, 'jammy'),
+    'unzip': (0.05, ''),
+    'java': (0.0, 'openjdk version "17.0.9"'),
+    'docker': (0.0, 'Docker version 24.0.7, build afdd53b'),
+    'kubectl': (0.0, 'Client Version: v1.28.4'),
+    'helm': (0.0, 'v3.14.2+gc309b6f'),
+    'terraform': (0.0, 'Terraform v1.5.7'),
+    'prometheus': (0.0, 'prometheus, version 2.48.0'),
+    'aws': (0.0, 'aws-cli/2.15.3 Python/3.11.6 Linux/6.2.0'),
+    'gcloud': (0.0, 'Google Cloud SDK 457.0.0'),
+    'az': (0.0, 'azure-cli 2.55.0'),
+}
+
+# Commands that refresh package metadata; running one twice in a row is waste
+METADATA_REFRESH = ('apt update', 'apt-get update', 'yum makecache', 'dnf makecache')
+
+FAKE_TEMPLATE = """#!/bin/sh
+start=$(date +%s%N)
+sleep {delay}
+{output}
+end=$(date +%s%N)
+printf '%s\\t%s\\t%s\\t%s\\n' "$start" "$end" "{name}" "$*" >> "$BENCH_LOG"
+exit ${{BENCH_EXIT_{variable}:-0}}
+"""
+
+# sudo only hands over to other fakes; anything else is recorded and skipped.
+# Files the installers write themselves (apt sources lists) are redirected
+# into the work directory by _sandbox_files, so the real system is left alone.
+SUDO_TEMPLATE = """#!/bin/sh
+now=$(date +%s%N)
+printf '%s\\t%s\\t%s\\t%s\\n' "$now" "$now" "sudo" "$*" >> "$BENCH_LOG"
+if [ -x "{fake_dir}/$1" ]; then
+    exec "{fake_dir}/$@"
+fi
+exit 0
+"""
+
+
+def _write_executable(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+    os.chmod(path, os.stat(path).st_mode | stat.S_IXUSR | stat.S_IXGRP | stat.S_IXOTH)
+
+
+def create_fakes(fake_dir, delay_scale=1.0):
+    """Write the fake executables into fake_dir"""
+    for name, (delay, output) in FAKE_COMMANDS.items():
+        echo = f"echo '{output}'" if output else ':'
+        _write_executable(os.path.join(fake_dir, name), FAKE_TEMPLATE.format(
+            delay=f"{delay * delay_scale:.3f}", output=echo, name=name,
+            variable=name.replace('-', '_').upper()))
+    _write_executable(os.path.join(fake_dir, 'sudo'), SUDO_TEMPLATE.format(fake_dir=fake_dir))
+
+
+def read_log(path):
+    """Parse the call log into (start, end, name, args) tuples"""
+    calls = []
+    if not os.path.exists(path):
+        return calls
+    with open(path, 'r', encoding='utf-8', errors='replace') as f:
+        for line in f:
+            fields = line.rstrip('\n').split('\t', 3)
+            if len(fields) == 4:
+                calls.append((int(fields[0]) / 1e9, int(fields[1]) / 1e9, fields[2], fields[3]))
+    return calls
+
+
+def busy_time(calls):
+    """Length of the union of all fake command intervals"""
+    total = 0.0
+    current_start = current_end = None
+    for start, end, _, _ in sorted(calls):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def analyse(calls, wall):
+    """Summarise one run's call log"""
+    commands = [f"{name} {args}".strip() for _, _, name, args in calls if name != 'sudo']
+    repeats = {command: count for command, count in Counter(commands).items() if count > 1}
+    refreshes = sum(1 for command in commands if command.startswith(METADATA_REFRESH))
+    external = busy_time([call for call in calls if call[2] != 'sudo'])
+    return {
+        'wall': round(wall, 3),
+        'external': round(external, 3),
+        'overhead': round(max(wall - external, 0.0), 3),
+        'commands': len(commands),
+        'metadata_refreshes': refreshes,
+        'redundant_commands': sum(count - 1 for count in repeats.values()),
+        'repeated': repeats,
+    }
+
+
+@contextmanager
+def _quiet(verbose):
+    """Silence installer output, including what child processes write to fd 1/2"""
+    if verbose:
+        yield
+        return
+    saved = [os.dup(1), os.dup(2)]
+    devnull = os.open(os.devnull, os.O_WRONLY)
+    sys.stdout.flush()
+    try:
+        os.dup2(devnull, 1)
+        os.dup2(devnull, 2)
+        with redirect_stdout(io.StringIO()):
+            yield
+    finally:
+        os.dup2(saved[0], 1)
+        os.dup2(saved[1], 2)
+        for fd in saved + [devnull]:
+            os.close(fd)
+
+
+def _use_distro(distro_name, modules):
+    """Make the installers believe they run on the given distribution"""
+    import dependencies
+    for module in modules + [dependencies]:
+        if hasattr(module, 'get_linux_distro'):
+            module.get_linux_distro = lambda: distro_name
+    dependencies.dependency_manager.distro = distro_name
+
+
+def _sandbox_files(fake_root, modules):
+    """Redirect the installers' own open() of system paths (e.g. /etc/apt/sources.list.d) into fake_root"""
+    import builtins
+
+    def sandboxed_open(path, mode='r', *args, **kwargs):
+        if isinstance(path, str) and os.path.isabs(path) and not path.startswith(fake_root):
+            redirected = fake_root + path
+            if any(flag in mode for flag in 'wax+'):
+                os.makedirs(os.path.dirname(redirected), exist_ok=True)
+                path = redirected
+            elif os.path.exists(redirected):
+                path = redirected
+        return builtins.open(path, mode, *args, **kwargs)
+
+    for module in modules:
+        module.open = sandboxed_open
+
+
+def run_benchmark(tools, actions, distro, delay_scale=1.0, verbose=False):
+    """Run each tool's actions against fresh fakes; returns {'tool action': result}"""
+    work_dir = tempfile.mkdtemp(prefix='devops-cli-bench-')
+    fake_dir = os.path.join(work_dir, 'bin')
+    os.makedirs(fake_dir)
+    create_fakes(fake_dir, delay_scale)
+
+    # Everything the installers might touch stays inside work_dir, and
+    # network access fails fast instead of reaching the internet.
+    os.environ.update({
+        'PATH': fake_dir + os.pathsep + os.environ.get('PATH', ''),
+        'HOME': work_dir,
+        'DEVOPS_CLI_CACHE_DIR': os.path.join(work_dir, 'cache'),
+        'HTTP_PROXY': 'http://127.0.0.1:9',
+        'HTTPS_PROXY': 'http://127.0.0.1:9',
+        'USER': 'bench',
+    })
+    os.environ.pop('NO_PROXY', None)
+    os.environ.pop('no_proxy', None)
+    os.chdir(work_dir)
+
+    modules = [importlib.import_module(f"tools.{tool}") for tool in tools]
+    _use_distro(DISTROS[distro], modules)
+    _sandbox_files(os.path.join(work_dir, 'root'), modules)
+    # Measure the package-manager routes: the release-binary route would only
+    # fail fast at the dead proxy
+    import strategies
+    strategies.set_strategy(strategies.PACKAGE)
+
+    results = {}
+    for tool, module in zip(tools, modules):
+        for action in actions:
+            log_path = os.path.join(work_dir, f"{tool}-{action}.log")
+            os.environ['BENCH_LOG'] = log_path
+            start = time.time()
+            try:
+                with _quiet(verbose):
+                    returned = getattr(module, action)(version=None)
+            except Exception as e:
+                returned = f"{type(e).__name__}: {e}"
+            wall = time.time() - start
+            result = analyse(read_log(log_path), wall)
+            result['returned'] = returned if isinstance(returned, (bool, type(None))) else str(returned)
+            result['status'] = 'failed' if returned is False or isinstance(result['returned'], str) else 'ok'
+            results[f"{tool} {action}"] = result
+
+    os.chdir(REPO_ROOT)
+    shutil.rmtree(work_dir, ignore_errors=True)
+    return results
+
+
+def print_report(results, baseline=None):
+    print(f"{'RUN':<22} {'STATUS':<7} {'WALL':>7} {'EXTERNAL':>9} {'OVERHEAD':>9} {'CMDS':>5} {'REFRESH':>8} {'REDUNDANT':>10}")
+    for name, result in results.items():
+        line = (f"{name:<22} {result['status']:<7} {result['wall']:>6.2f}s {result['external']:>8.2f}s "
+                f"{result['overhead']:>8.2f}s {result['commands']:>5} {result['metadata_refreshes']:>8} "
+                f"{result['redundant_commands']:>10}")
+        if baseline and name in baseline:
+            delta = result['wall'] - baseline[name]['wall']
+            line += f"  ({delta:+.2f}s vs baseline)"
+        print(line)
+    total_wall = sum(r['wall'] for r in results.values())
+    total_overhead = sum(r['overhead'] for r in results.values())
+    print(f"\nTotal wall {total_wall:.2f}s, orchestration overhead {total_overhead:.2f}s, "
+          f"{sum(r['redundant_commands'] for r in results.values())} redundant command(s)")
+
+    for name, result in results.items():
+        for command, count in sorted(result['repeated'].items()):
+            print(f"   {name}: '{command}' ran {count} times")
+    failed = [name for name, result in results.items() if result['status'] != 'ok']
+    if failed:
+        print(f"\n❌ Failed (timings not comparable): {', '.join(failed)}")
+        for name in failed:
+            if isinstance(results[name]['returned'], str):
+                print(f"   {name}: {results[name]['returned']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark installer orchestration against fake package managers')
+    parser.add_argument('tools', nargs='*', default=TOOLS, help='Tools to benchmark (default: all)')
+    parser.add_argument('--action', action='append', choices=['install', 'update'],
+                        help='Installer entry points to run (default: install and update)')
+    parser.add_argument('--distro', choices=sorted(DISTROS), default='ubuntu', help='Linux distribution to simulate')
+    parser.add_argument('--delay-scale', type=float, default=1.0, help='Multiply every fake command delay')
+    parser.add_argument('--json', metavar='FILE', help='Write results to FILE (use as a baseline later)')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare wall times against an earlier --json file')
+    parser.add_argument('--verbose', action='store_true', help='Show installer output')
+    args = parser.parse_args()
+
+    if sys.platform != 'linux':
+        print("❌ The orchestration benchmark simulates Linux installers and only runs on Linux")
+        return 1
+    unknown = [tool for tool in args.tools if tool not in TOOLS]
+    if unknown:
+        print(f"❌ Unknown tools: {', '.join(unknown)}")
+        return 1
+
+    json_path = os.path.abspath(args.json) if args.json else None
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    results = run_benchmark(args.tools, args.action or ['install', 'update'], args.distro,
+                            args.delay_scale, args.verbose)
+    print_report(results, baseline)
+    if json_path:
+        with open(json_path, 'w', encoding='utf-8') as f:
+            json.dump({'distro': args.distro, 'delay_scale': args.delay_scale, 'results': results}, f, indent=2)
+        print(f"\n📊 Results written to {json_path}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Local Release Server for DevOps CLI
+Serves recorded (or built-in synthetic) GitHub release lists, the Docker
+Desktop release notes and HashiCorp release indexes so version lookups can be
+exercised offline, with injected latency, ETag 304s, GitHub-style rate limiting
+and Link-header pagination. Point the CLI at it with DEVOPS_CLI_RELEASE_SERVER.
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+FIXTURE_FORMAT = 1
+
+# Hosts whose requests count against the GitHub rate limit
+RATE_LIMITED_HOSTS = ('api.github.com',)
+
+DEFAULT_PER_PAGE = 30
+MAX_PER_PAGE = 100
+
+# What 'record' fetches: fixture key -> kind. Release lists are paginated on replay.
+SOURCES = {
+    'api.github.com/repos/kubernetes/kubernetes/releases': 'releases',
+    'api.github.com/repos/aws/aws-cli/releases': 'releases',
+    'api.github.com/repos/Azure/azure-cli/releases': 'releases',
+    'api.github.com/repos/helm/helm/releases': 'releases',
+    'api.github.com/repos/prometheus/prometheus/releases': 'releases',
+    'api.github.com/repos/hashicorp/terraform/releases': 'releases',
+    'api.github.com/repos/jenkinsci/jenkins/releases': 'releases',
+    'api.github.com/repos/GoogleCloudPlatform/cloud-sdk/releases': 'releases',
+    'api.github.com/repos/docker/desktop/releases': 'releases',
+    'docs.docker.com/desktop/release-notes/': 'raw',
+    'releases.hashicorp.com/terraform/index.json': 'raw',
+}
+
+# Synthetic release series: fixture key -> (tag format, major.minor list, patches per minor)
+SYNTHETIC_SERIES = {
+    'api.github.com/repos/kubernetes/kubernetes/releases': ('v{}', ['1.26', '1.27', '1.28', '1.29'], 12),
+    'api.github.com/repos/aws/aws-cli/releases': ('{}', ['2.13', '2.14', '2.15'], 15),
+    'api.github.com/repos/Azure/azure-cli/releases': ('azure-cli-{}', ['2.53', '2.54', '2.55', '2.56'], 3),
+    'api.github.com/repos/helm/helm/releases': ('v{}', ['3.12', '3.13', '3.14'], 4),
+    'api.github.com/repos/prometheus/prometheus/releases': ('v{}', ['2.46', '2.47', '2.48', '2.49', '2.50'], 2),
+    'api.github.com/repos/hashicorp/terraform/releases': ('v{}', ['1.5', '1.6', '1.7'], 8),
+    'api.github.com/repos/jenkinsci/jenkins/releases': ('jenkins-{}', ['2.426', '2.440', '2.452'], 3),
+    'api.github.com/repos/docker/desktop/releases': ('v{}', ['4.26', '4.27', '4.28'], 2),
+}
+
+
+def _release(tag, index, prerelease=False):
+    published = datetime(2024, 3, 1, tzinfo=timezone.utc) - timedelta(days=3 * index)
+    return {
+        'tag_name': tag,
+        'name': tag,
+        'draft': False,
+        'prerelease': prerelease,
+        'published_at': published.strftime('%Y-%m-%dT%H:%M:%SZ'),
+        'html_url': f'https://github.com/example/example/releases/tag/{tag}',
+        # Real release bodies are a few KB of changelog; keep payload sizes realistic
+        'body': f'## Changes in {tag}\n' + '* Fixed an issue with the widget frobnicator\n' * 50,
+    }
+
+
+def _synthetic_releases(tag_format, minors, patches):
+    releases = []
+    for minor in reversed(minors):
+        for patch in reversed(range(patches)):
+            releases.append(_release(tag_format.format(f'{minor}.{patch}'), len(releases)))
+        releases.append(_release(tag_format.format(f'{minor}.0-rc.1'), len(releases), prerelease=True))
+    return releases
+
+
+def _synthetic_docker_notes(minors, patches):
+    sections = []
+    for minor in reversed(minors):
+        for patch in reversed(range(patches)):
+            number = f'{minor}.{patch}'
+            sections.append(f'<h2 id="{number.replace(".", "")}">{number}</h2>\n'
+                            f'<p>2024-02-01</p>\n<h3 id="bug-fixes">Bug fixes and enhancements</h3>\n'
+                            + '<ul>' + '<li>Fixed an issue with the Docker Engine.</li>' * 20 + '</ul>')
+    return ('<!DOCTYPE html><html><head><title>Docker Desktop release notes</title></head><body>'
+            '<h1>Docker Desktop release notes</h1>\n' + '\n'.join(sections) + '</body></html>')
+
+
+def _synthetic_hashicorp(product, minors, patches):
+    """HashiCorp index.json plus a SHA256SUMS file per version"""
+    responses = {}
+    versions = {}
+    for minor in minors:
+        for patch in range(patches):
+            number = f'{minor}.{patch}'
+            builds = [{'name': product, 'version': number, 'os': os_name, 'arch': arch,
+                       'filename': f'{product}_{number}_{os_name}_{arch}.zip',
+                       'url': f'https://releases.hashicorp.com/{product}/{number}/{product}_{number}_{os_name}_{arch}.zip'}
+                      for os_name in ('linux', 'darwin', 'windows') for arch in ('amd64', 'arm64')]
+            versions[number] = {'name': product, 'version': number,
+                                'shasums': f'{product}_{number}_SHA256SUMS', 'builds': builds}
+            sums = ''.join(f"{hashlib.sha256(build['filename'].encode()).hexdigest()}  {build['filename']}\n"
+                           for build in builds)
+            responses[f'releases.hashicorp.com/{product}/{number}/{product}_{number}_SHA256SUMS'] = {
+                'kind': 'raw', 'content_type': 'text/plain', 'body': sums}
+    responses[f'releases.hashicorp.com/{product}/index.json'] = {
+        'kind': 'raw', 'content_type': 'application/json', 'body': json.dumps({'name': product, 'versions': versions})}
+    return responses
+
+
+def synthetic_fixtures():
+    """Deterministic fixtures shaped like the real services, for when nothing was recorded"""
+    responses = {key: {'kind': 'releases', 'items': _synthetic_releases(*series)}
+                 for key, series in SYNTHETIC_SERIES.items()}
+    responses['docs.docker.com/desktop/release-notes/'] = {
+        'kind': 'raw', 'content_type': 'text/html; charset=utf-8',
+        'body': _synthetic_docker_notes(['4.26', '4.27', '4.28'], 3)}
+    responses.update(_synthetic_hashicorp('terraform', ['1.5', '1.6', '1.7'], 8))
+    # api.github.com/repos/GoogleCloudPlatform/cloud-sdk has no fixture: like upstream, it is a 404
+    return {'format': FIXTURE_FORMAT, 'source': 'synthetic', 'responses': responses}
+
+
+def load_fixtures(path=None):
+    """Fixtures recorded with 'record', or the synthetic set when path is None"""
+    if path is None:
+        return synthetic_fixtures()
+    with open(path, 'r', encoding='utf-8') as f:
+        fixtures = json.load(f)
+    if fixtures.get('format') != FIXTURE_FORMAT:
+        raise ValueError(f"Unsupported fixture format in {path}: {fixtures.get('format')}")
+    return fixtures
+
+
+class RateLimiter:
+    """GitHub-style fixed window: 'limit' requests per 'window' seconds"""
+
+    def __init__(self, limit, window):
+        self.limit = limit
+        self.window = window
+        self.reset()
+
+    def reset(self):
+        self.used = 0
+        self.window_start = time.time()
+
+    def take(self, charge=True):
+        """Count one request; returns (allowed, headers)"""
+        now = time.time()
+        if now - self.window_start >= self.window:
+            self.reset()
+        allowed = self.used < self.limit or not charge
+        if allowed and charge:
+            self.used += 1
+        headers = {
+            'X-RateLimit-Limit': str(self.limit),
+            'X-RateLimit-Remaining': str(max(self.limit - self.used, 0)),
+            'X-RateLimit-Used': str(self.used),
+            'X-RateLimit-Reset': str(int(self.window_start + self.window)),
+        }
+        return allowed, headers
+
+
+class ReleaseServer:
+    """Threaded HTTP server replaying fixtures; use as a context manager"""
+
+    def __init__(self, fixtures=None, host='127.0.0.1', port=0, latency=0.0, jitter=0.0,
+                 rate_limit=None, rate_window=3600, seed=0):
+        self.fixtures = fixtures or synthetic_fixtures()
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_limiter = RateLimiter(rate_limit, rate_window) if rate_limit is not None else None
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._requests = Counter()
+        self._bytes = 0
+        self._httpd = ThreadingHTTPServer((host, port), _handler_for(self))
+        self._httpd.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self):
+        host, port = self._httpd.server_address[:2]
+        return f'http://{host}:{port}'
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='release-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def reset(self):
+        """Forget request counts and refill the rate limit"""
+        with self._lock:
+            self._requests.clear()
+            self._bytes = 0
+            if self.rate_limiter is not None:
+                self.rate_limiter.reset()
+
+    def stats(self):
+        """Requests served so far: totals, by status and by fixture key"""
+        with self._lock:
+            by_status = Counter()
+            by_key = Counter()
+            for (key, status), count in self._requests.items():
+                by_status[str(status)] += count
+                by_key[key] += count
+            return {'requests': sum(by_status.values()), 'bytes': self._bytes,
+                    'by_status': dict(by_status), 'by_key': dict(by_key)}
+
+    def _delay(self):
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        if delay > 0:
+            time.sleep(delay)
+
+    def _record(self, key, status, size):
+        with self._lock:
+            self._requests[(key, status)] += 1
+            self._bytes += size
+
+    def respond(self, path, headers):
+        """(status, headers, body) for one GET"""
+        parts = urlsplit(path)
+        key = parts.path.lstrip('/')
+        self._delay()
+        status, response_headers, body = self._lookup(key, parse_qs(parts.query), headers)
+
+        host = key.split('/', 1)[0]
+        if self.rate_limiter is not None and host in RATE_LIMITED_HOSTS:
+            with self._lock:
+                # Like GitHub, conditional requests answered with 304 are free
+                allowed, limit_headers = self.rate_limiter.take(charge=status != 304)
+            response_headers.update(limit_headers)
+            if not allowed:
+                body = json.dumps({'message': 'API rate limit exceeded for 127.0.0.1.',
+                                   'documentation_url': 'https://docs.github.com/rest/overview/rate-limits'})
+                return 403, dict(limit_headers, **{'Content-Type': 'application/json'}), body.encode()
+        return status, response_headers, body
+
+    def _lookup(self, key, query, headers):
+        entry = self.fixtures['responses'].get(key)
+        if entry is None:
+            return 404, {'Content-Type': 'application/json'}, json.dumps({'message': 'Not Found'}).encode()
+
+        response_headers = {}
+        if entry['kind'] == 'releases':
+            body, links = self._paginate(key, entry['items'], query)
+            content_type = 'application/json; charset=utf-8'
+            if links:
+                response_headers['Link'] = links
+        else:
+            body = entry['body'].encode('utf-8')
+            content_type = entry.get('content_type', 'application/octet-stream')
+
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        response_headers['ETag'] = etag
+        if headers.get('If-None-Match') == etag:
+            return 304, response_headers, b''
+        response_headers['Content-Type'] = content_type
+        return 200, response_headers, body
+
+    def _paginate(self, key, items, query):
+        try:
+            per_page = min(max(int(query.get('per_page', [DEFAULT_PER_PAGE])[0]), 1), MAX_PER_PAGE)
+            page = max(int(query.get('page', ['1'])[0]), 1)
+        except ValueError:
+            per_page, page = DEFAULT_PER_PAGE, 1
+        last = max((len(items) + per_page - 1) // per_page, 1)
+        body = json.dumps(items[(page - 1) * per_page:page * per_page]).encode('utf-8')
+
+        def link(number, rel):
+            return f'<{self.url}/{key}?per_page={per_page}&page={number}>; rel="{rel}"'
+
+        links = []
+        if page < last:
+            links += [link(page + 1, 'next'), link(last, 'last')]
+        if page > 1:
+            links += [link(1, 'first'), link(page - 1, 'prev')]
+        return body, ', '.join(links)
+
+
+def _handler_for(server):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            if self.path == '/_stats':
+                status, headers, body = 200, {'Content-Type': 'application/json'}, json.dumps(server.stats()).encode()
+            else:
+                status, headers, body = server.respond(self.path, self.headers)
+                server._record(urlsplit(self.path).path.lstrip('/'), status, len(body))
+            self.send_response(status)
+            for name, value in headers.items():
+                self.send_header(name, value)
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_POST(self):
+            if self.path == '/_reset':
+                server.reset()
+                self.send_response(204)
+            else:
+                self.send_response(405)
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def record(path, pages=3, token=None):
+    """Fetch every source from the live services and save them as fixtures"""
+    import requests
+
+    session = requests.Session()
+    session.headers['User-Agent'] = 'DevOps-CLI release fixture recorder'
+    if token:
+        session.headers['Authorization'] = f'Bearer {token}'
+
+    responses = {}
+    for key, kind in SOURCES.items():
+        url = f'https://{key}'
+        if kind == 'releases':
+            items = []
+            next_url = f'{url}?per_page={MAX_PER_PAGE}'
+            for _ in range(pages):
+                response = session.get(next_url, timeout=30)
+                if response.status_code != 200:
+                    break
+                items.extend(response.json())
+                next_url = response.links.get('next', {}).get('url')
+                if not next_url:
+                    break
+            if items:
+                responses[key] = {'kind': 'releases', 'items': items}
+        else:
+            response = session.get(url, timeout=30)
+            if response.status_code == 200:
+                responses[key] = {'kind': 'raw', 'content_type': response.headers.get('Content-Type', ''),
+                                  'body': response.text}
+        status = f"{len(responses[key].get('items', []))} releases" if key in responses else 'not recorded'
+        print(f"{'✅' if key in responses else '⚠️ '} {key}: {status}")
+
+    fixtures = {'format': FIXTURE_FORMAT, 'source': 'recorded',
+                'recorded_at': datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'), 'responses': responses}
+    partial = f'{path}.part'
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(fixtures, f)
+    os.replace(partial, path)
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Replay release metadata for offline version lookups')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve = subparsers.add_parser('serve', help='Serve fixtures over HTTP')
+    serve.add_argument('--fixtures', metavar='FILE', help='Recorded fixtures (default: built-in synthetic set)')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--latency', type=float, default=0.0, help='Seconds added to every response')
+    serve.add_argument('--jitter', type=float, default=0.0, help='Up to this many extra random seconds')
+    serve.add_argument('--rate-limit', type=int, help='GitHub API requests allowed per window before 403s')
+    serve.add_argument('--rate-window', type=float, default=3600, help='Rate limit window in seconds')
+
+    record_parser = subparsers.add_parser('record', help='Record fixtures from the live services')
+    record_parser.add_argument('output', help='Fixture file to write')
+    record_parser.add_argument('--pages', type=int, default=3, help='Release pages (of 100) to keep per repository')
+    record_parser.add_argument('--token', help='GitHub token, to avoid the unauthenticated rate limit')
+    args = parser.parse_args()
+
+    if args.command == 'record':
+        record(args.output, args.pages, args.token)
+        print(f"📼 Fixtures written to {args.output}")
+        return 0
+
+    server = ReleaseServer(load_fixtures(args.fixtures), port=args.port, latency=args.latency,
+                           jitter=args.jitter, rate_limit=args.rate_limit, rate_window=args.rate_window)
+    print(f"🛰️  Serving {len(server.fixtures['responses'])} fixtures on {server.url}")
+    print(f"   export DEVOPS_CLI_RELEASE_SERVER={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,198 @@
+#!/usr/bin/env python3
+"""
+Version Lookup Benchmark for DevOps CLI
+Runs the versioning and enhanced_versioning lookups against the local release
+server and reports throughput, latency percentiles and the requests each
+lookup costs, with and without injected latency and rate limiting
+"""
+
+import argparse
+import io
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from release_server import ReleaseServer, load_fixtures
+
+TOOLS = ['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform']
+
+# name: server settings. Rate limiting runs once: exhausted lookups back off for seconds each.
+SCENARIOS = {
+    'fast': {'latency': 0.0, 'jitter': 0.0},
+    'latency': {'latency': 0.05, 'jitter': 0.05},
+    'rate-limited': {'latency': 0.0, 'jitter': 0.0, 'rate_limit': 5, 'iterations': 1},
+}
+
+MODULES = ('versioning', 'enhanced_versioning')
+
+
+def percentile(values, fraction):
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(max(int(round(fraction * len(ordered) + 0.5)) - 1, 0), len(ordered) - 1)
+    return ordered[index]
+
+
+def _lookup_function(module_name, os_type, warm):
+    """A callable(tool) doing one version lookup, with caches dropped first unless warm"""
+    if module_name == 'versioning':
+        import versioning
+
+        def lookup(tool):
+            if not warm:
+                versioning._version_cache.clear()
+            return versioning.get_version_candidates(tool, os_type, 'Ubuntu 22.04.3 LTS')
+        return lookup
+
+    import enhanced_versioning
+    manager = enhanced_versioning.VersionManager()
+
+    def lookup(tool):
+        if not warm:
+            manager.cache.clear()
+        return manager.get_versions(tool, os_type)
+    return lookup
+
+
+@contextmanager
+def _quiet(verbose):
+    if verbose:
+        yield
+        return
+    with redirect_stdout(io.StringIO()):
+        yield
+
+
+def run_lookups(server, module_name, tools, iterations, concurrency, os_type, warm, verbose):
+    """Time every lookup; returns the measurements plus what the server saw"""
+    lookup = _lookup_function(module_name, os_type, warm)
+    jobs = [tool for _ in range(iterations) for tool in tools]
+    latencies = []
+
+    def timed(tool):
+        start = time.perf_counter()
+        versions = lookup(tool)
+        return time.perf_counter() - start, versions
+
+    server.reset()
+    start = time.perf_counter()
+    with _quiet(verbose), ThreadPoolExecutor(max_workers=concurrency) as pool:
+        for elapsed, _ in pool.map(timed, jobs):
+            latencies.append(elapsed)
+    wall = time.perf_counter() - start
+
+    stats = server.stats()
+    return {
+        'lookups': len(jobs),
+        'wall': round(wall, 3),
+        'throughput': round(len(jobs) / wall, 2) if wall else None,
+        'p50': round(percentile(latencies, 0.50), 4),
+        'p95': round(percentile(latencies, 0.95), 4),
+        'p99': round(percentile(latencies, 0.99), 4),
+        'max': round(max(latencies), 4) if latencies else 0.0,
+        'requests': stats['requests'],
+        'requests_per_lookup': round(stats['requests'] / len(jobs), 2) if jobs else 0.0,
+        'bytes': stats['bytes'],
+        'by_status': stats['by_status'],
+        'errors': sum(count for status, count in stats['by_status'].items() if int(status) >= 400),
+    }
+
+
+def run_benchmark(scenarios, modules, tools, iterations, concurrency, os_type, warm, fixtures_path, verbose):
+    """Run every module under every scenario, each against a fresh server"""
+    fixtures = load_fixtures(fixtures_path)
+    work_dir = tempfile.mkdtemp(prefix='devops-cli-versioning-bench-')
+    # Only the local server is reachable; anything that slips past the
+    # rewrite fails fast at a dead proxy instead of reaching the internet.
+    os.environ.update({
+        'DEVOPS_CLI_CACHE_DIR': os.path.join(work_dir, 'cache'),
+        'HTTP_PROXY': 'http://127.0.0.1:9',
+        'HTTPS_PROXY': 'http://127.0.0.1:9',
+        'NO_PROXY': '127.0.0.1,localhost',
+    })
+    os.environ.pop('no_proxy', None)
+    if not verbose:
+        logging.getLogger('enhanced_versioning').setLevel(logging.CRITICAL)
+
+    results = {}
+    try:
+        for scenario in scenarios:
+            settings = dict(SCENARIOS[scenario])
+            scenario_iterations = settings.pop('iterations', iterations)
+            for module_name in modules:
+                with ReleaseServer(fixtures, **settings) as server:
+                    os.environ['DEVOPS_CLI_RELEASE_SERVER'] = server.url
+                    results[f"{scenario} {module_name}"] = run_lookups(
+                        server, module_name, tools, scenario_iterations, concurrency, os_type, warm, verbose)
+    finally:
+        os.environ.pop('DEVOPS_CLI_RELEASE_SERVER', None)
+        shutil.rmtree(work_dir, ignore_errors=True)
+    return {'source': fixtures.get('source'), 'results': results}
+
+
+def print_report(report, baseline=None):
+    print(f"Fixtures: {report['source']}")
+    print(f"{'RUN':<34} {'LOOKUPS':>7} {'PER SEC':>8} {'P50':>8} {'P95':>8} {'P99':>8} {'REQS':>5} "
+          f"{'REQ/LOOKUP':>10} {'403':>4} {'ERRORS':>6}")
+    for name, result in report['results'].items():
+        line = (f"{name:<34} {result['lookups']:>7} {result['throughput'] or 0:>8.1f} "
+                f"{result['p50'] * 1000:>6.1f}ms {result['p95'] * 1000:>6.1f}ms {result['p99'] * 1000:>6.1f}ms "
+                f"{result['requests']:>5} {result['requests_per_lookup']:>10.2f} "
+                f"{result['by_status'].get('403', 0):>4} {result['errors']:>6}")
+        if baseline and name in baseline:
+            before = baseline[name]['p50']
+            line += f"  (p50 {(result['p50'] - before) * 1000:+.1f}ms vs baseline)"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark version lookups against the local release server')
+    parser.add_argument('tools', nargs='*', default=TOOLS, help='Tools to look up (default: all)')
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help='Server behaviour to simulate (default: all)')
+    parser.add_argument('--module', action='append', choices=MODULES, help='Lookup implementation (default: both)')
+    parser.add_argument('--iterations', type=int, default=5, help='Lookups per tool')
+    parser.add_argument('--concurrency', type=int, default=1, help='Lookups running at once')
+    parser.add_argument('--os', dest='os_type', choices=['Linux', 'Darwin', 'Windows'], default='Darwin',
+                        help='Platform to look up for; Linux docker asks apt instead of the release notes')
+    parser.add_argument('--warm', action='store_true', help='Keep in-memory version caches between lookups')
+    parser.add_argument('--fixtures', metavar='FILE', help='Recorded fixtures (default: built-in synthetic set)')
+    parser.add_argument('--json', metavar='FILE', help='Write results to FILE (use as a baseline later)')
+    parser.add_argument('--baseline', metavar='FILE', help='Compare p50 latency against an earlier --json file')
+    parser.add_argument('--verbose', action='store_true', help='Show lookup output and logging')
+    args = parser.parse_args()
+
+    unknown = [tool for tool in args.tools if tool not in TOOLS]
+    if unknown:
+        print(f"❌ Unknown tools: {', '.join(unknown)}")
+        return 1
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+
+    report = run_benchmark(args.scenario or list(SCENARIOS), args.module or list(MODULES), args.tools,
+                           args.iterations, args.concurrency, args.os_type, args.warm, args.fixtures, args.verbose)
+    print_report(report, baseline)
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n📊 Results written to {args.json}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
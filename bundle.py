@@ -0,0 +1,177 @@
+"""
+Offline Bundle Export for DevOps CLI
+Resolves versions, downloads release artifacts and checksum manifests in
+parallel and writes a self-describing archive for air-gapped installs
+"""
+
+import hashlib
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+from utils import get_os, get_linux_distro, get_platform_tag
+from versioning import resolve_version, get_artifact_url
+from integrity import IntegrityError, get_manifest_url, load_manifest_text, parse_manifest
+from downloads import download_file
+from mirror import INDEX_NAME, BUNDLE_FORMAT
+
+# Tools whose installers can run from a release artifact in the bundle. Docker,
+# az, gcloud and Jenkins are installed from vendor package repositories and
+# cannot be bundled.
+BUNDLE_TOOLS = ['kubectl', 'helm', 'terraform', 'prometheus', 'awscli']
+
+
+def parse_tool_spec(spec):
+    """Split 'terraform@1.5.7' into ('terraform', '1.5.7'); no version means latest"""
+    tool_name, _, tool_version = spec.partition('@')
+    return tool_name, tool_version or 'latest'
+
+
+def _bundle_path(url):
+    """Location of a downloaded URL inside the bundle, derived from the URL itself"""
+    parsed = urlparse(url)
+    return f"files/{parsed.hostname}{parsed.path}"
+
+
+def _sha256_file(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def plan_bundle(tool_specs, platforms, jobs=8):
+    """Resolve versions and artifact URLs for every (tool, platform) pair"""
+    os_type = get_os()
+    distro = get_linux_distro() if os_type == 'Linux' else None
+    requested = [parse_tool_spec(spec) for spec in tool_specs]
+
+    # Version lookups hit the network, so resolve all tools concurrently
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        resolved = list(pool.map(
+            lambda item: (item[0], resolve_version(item[0], item[1], os_type, distro)), requested
+        ))
+
+    artifacts = []
+    for tool_name, tool_version in resolved:
+        if not tool_version:
+            print(f"⚠️  Could not resolve a version for {tool_name}, skipping")
+            continue
+        seen_urls = set()
+        for platform_tag in platforms:
+            url = get_artifact_url(tool_name, tool_version, platform_tag)
+            if not url:
+                print(f"⚠️  {tool_name} {tool_version} has no artifact for {platform_tag}, skipping")
+                continue
+            if url in seen_urls:
+                continue
+            seen_urls.add(url)
+            artifacts.append({
+                'tool': tool_name,
+                'version': tool_version,
+                'platform': platform_tag,
+                'url': url,
+                'checksum_url': get_manifest_url(tool_name, tool_version, url),
+            })
+    return artifacts
+
+
+def create_bundle(tool_specs, platforms=None, output='devops-cli-bundle.tar', jobs=8):
+    """Download artifacts for the requested tools and write an offline bundle"""
+    platforms = platforms or [get_platform_tag()]
+    unsupported = [spec for spec in tool_specs if parse_tool_spec(spec)[0] not in BUNDLE_TOOLS]
+    if unsupported:
+        print(f"❌ Cannot bundle: {', '.join(unsupported)}")
+        print(f"Bundleable tools: {', '.join(BUNDLE_TOOLS)}")
+        return False
+
+    start = time.time()
+    print(f"🔍 Resolving versions for {len(tool_specs)} tool(s) on {', '.join(platforms)}...")
+    artifacts = plan_bundle(tool_specs, platforms, jobs)
+    if not artifacts:
+        print("❌ Nothing to bundle")
+        return False
+
+    staging = tempfile.mkdtemp(prefix='devops-cli-bundle-')
+    partial = output + '.part'
+    files = {}
+    try:
+        # Checksum manifests first, so every artifact download can be verified
+        manifest_urls = sorted({a['checksum_url'] for a in artifacts if a['checksum_url']})
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            manifest_texts = dict(zip(manifest_urls, pool.map(load_manifest_text, manifest_urls)))
+        for manifest_url, text in manifest_texts.items():
+            path = _bundle_path(manifest_url)
+            os.makedirs(os.path.dirname(os.path.join(staging, path)), exist_ok=True)
+            with open(os.path.join(staging, path), 'w', encoding='utf-8') as f:
+                f.write(text)
+            files[manifest_url] = {'path': path}
+
+        def fetch(artifact):
+            expected = None
+            if artifact['checksum_url']:
+                entries = parse_manifest(manifest_texts[artifact['checksum_url']])
+                filename = artifact['url'].rsplit('/', 1)[-1]
+                expected = entries.get(filename) or entries.get('')
+                if not expected:
+                    raise IntegrityError(f"No checksum for {filename} in {artifact['checksum_url']}")
+            path = _bundle_path(artifact['url'])
+            print(f"📥 Downloading {artifact['tool']} {artifact['version']} ({artifact['platform']})...")
+            download_file(artifact['url'], os.path.join(staging, path), timeout=300, sha256=expected)
+            return path, expected or _sha256_file(os.path.join(staging, path))
+
+        with ThreadPoolExecutor(max_workers=jobs) as pool:
+            results = list(pool.map(fetch, artifacts))
+
+        for artifact, (path, sha256) in zip(artifacts, results):
+            artifact['path'] = path
+            artifact['sha256'] = sha256
+            artifact['size'] = os.path.getsize(os.path.join(staging, path))
+            files[artifact['url']] = {'path': path, 'sha256': sha256, 'size': artifact['size']}
+
+        tools = {}
+        for artifact in artifacts:
+            tools.setdefault(artifact['tool'], {}).setdefault(artifact['version'], []).append(artifact['platform'])
+
+        index = {
+            'format': BUNDLE_FORMAT,
+            'created': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'platforms': platforms,
+            'tools': tools,
+            'artifacts': artifacts,
+            'files': files,
+        }
+
+        # Artifacts are already compressed, so the bundle itself is a plain tar
+        # with the index first, letting readers find it without a full scan.
+        with tarfile.open(partial, 'w') as archive:
+            index_bytes = json.dumps(index, indent=2, sort_keys=True).encode('utf-8')
+            info = tarfile.TarInfo(INDEX_NAME)
+            info.size = len(index_bytes)
+            info.mtime = int(time.time())
+            archive.addfile(info, io.BytesIO(index_bytes))
+            for url in sorted(files):
+                archive.add(os.path.join(staging, files[url]['path']), arcname=files[url]['path'])
+        os.replace(partial, output)
+    except Exception as e:
+        print(f"❌ Failed to create bundle: {e}")
+        return False
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+        if os.path.exists(partial):
+            os.remove(partial)
+
+    total = sum(a['size'] for a in artifacts)
+    print(f"✅ Bundle written to {output}: {len(artifacts)} artifact(s), "
+          f"{total / (1024 * 1024):.1f} MiB in {time.time() - start:.1f}s")
+    for tool_name, versions in sorted(index['tools'].items()):
+        for tool_version, tool_platforms in versions.items():
+            print(f"   {tool_name} {tool_version}: {', '.join(tool_platforms)}")
+    return True
@@ -0,0 +1,98 @@
+"""
+Thin Entry Point for DevOps CLI
+Forwards query commands to a running 'devops-cli daemon' over its Unix socket
+and streams the output back; every other command, and any query the daemon
+cannot take, runs in-process through main.py. Only standard-library modules
+are imported here so that a forwarded call stays cheap.
+"""
+
+import json
+import os
+import socket
+import sys
+
+# Read-only commands whose answer only depends on the environment sent along
+FORWARDED_COMMANDS = ('list', 'versions', 'status', 'verify')
+ENV_KEYS = ('PATH', 'HOME', 'XDG_CACHE_HOME', 'XDG_CONFIG_HOME', 'GITHUB_TOKEN')
+CONNECT_TIMEOUT = 0.2  # seconds
+
+
+def get_socket_path():
+    """DEVOPS_CLI_SOCKET, else devops-cli.sock in XDG_RUNTIME_DIR, else a per-user socket in /tmp"""
+    path = os.environ.get('DEVOPS_CLI_SOCKET')
+    if path:
+        return path
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'devops-cli.sock')
+    return os.path.join(os.environ.get('TMPDIR') or '/tmp', f"devops-cli-{os.getuid()}.sock")
+
+
+def environment():
+    """The parts of the environment a forwarded command's output depends on"""
+    return {key: value for key, value in os.environ.items() if key in ENV_KEYS or key.startswith('DEVOPS_CLI_')}
+
+
+def connect(timeout=CONNECT_TIMEOUT):
+    """A connected socket to the daemon, or None when none is listening"""
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(get_socket_path())
+    except OSError:
+        sock.close()
+        return None
+    sock.settimeout(None)
+    return sock
+
+
+def request(message, timeout=CONNECT_TIMEOUT):
+    """Send one request and yield the daemon's reply messages; yields nothing if it is not running"""
+    sock = connect(timeout)
+    if sock is None:
+        return
+    with sock, sock.makefile('rb') as replies:
+        sock.sendall(json.dumps(message).encode('utf-8') + b'\n')
+        for line in replies:
+            yield json.loads(line)
+
+
+def forward(argv):
+    """Run argv in the daemon, streaming its output; returns the exit code, or None to run locally"""
+    if not argv or argv[0] not in FORWARDED_COMMANDS or os.environ.get('DEVOPS_CLI_NO_DAEMON'):
+        return None
+    printed = False
+    try:
+        for message in request({'argv': argv, 'env': environment(), 'cwd': os.getcwd()}):
+            if 'out' in message:
+                sys.stdout.write(message['out'])
+                sys.stdout.flush()
+                printed = True
+            elif 'err' in message:
+                sys.stderr.write(message['err'])
+                sys.stderr.flush()
+                printed = True
+            elif 'exit' in message:
+                return message['exit']
+            else:  # 'fallback': the daemon will not run this one
+                return None
+    except (OSError, ValueError):
+        pass
+    if printed:
+        sys.stderr.write("devops-cli: lost the connection to the daemon\n")
+        return 1
+    return None
+
+
+def main():
+    code = forward(sys.argv[1:])
+    if code is None:
+        import main as cli
+        return cli.main()
+    sys.exit(code)
+
+
+if __name__ == '__main__':
+    main()
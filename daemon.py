@@ -0,0 +1,198 @@
+"""
+Resident Daemon for DevOps CLI
+'devops-cli daemon' keeps imports, detected host facts, version and probe
+caches and pooled HTTP connections warm in one process and answers the query
+commands that client.py forwards over a Unix socket
+"""
+
+import json
+import os
+import signal
+import socket
+import socketserver
+import struct
+import sys
+import threading
+import time
+from contextlib import redirect_stdout, redirect_stderr
+
+from client import FORWARDED_COMMANDS, environment, get_socket_path, request
+from utils import get_os, get_linux_distro, get_http_session
+import metrics
+import process
+import tracing
+
+
+class _Framed:
+    """File-like object sending each write to the client as one JSON line"""
+
+    def __init__(self, wfile, key):
+        self.wfile = wfile
+        self.key = key
+
+    def write(self, text):
+        if text:
+            self.wfile.write(json.dumps({self.key: text}).encode('utf-8') + b'\n')
+        return len(text)
+
+    def flush(self):
+        self.wfile.flush()
+
+    def isatty(self):
+        return False
+
+
+def _peer_uid(sock):
+    """uid of the process on the other end (Linux SO_PEERCRED), or None where unsupported"""
+    if not hasattr(socket, 'SO_PEERCRED'):
+        return None
+    _, uid, _ = struct.unpack('3i', sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize('3i')))
+    return uid
+
+
+def run_in_process(argv, cwd=None):
+    """Run a devops-cli command line in this process, from cwd; returns its exit code
+
+    Metrics, traces and command records are per run, so what earlier runs
+    collected is dropped first; otherwise every run would write the daemon's
+    running totals to the .prom file again.
+    """
+    import main as cli
+    metrics.reset()
+    tracing.reset()
+    process.reset_usage_records()
+    previous_cwd = os.getcwd()
+    try:
+        if cwd:
+            os.chdir(cwd)  # ./jenkins.war, ./prometheus-* and .tool-versions are looked up here
+        cli.main(argv)
+    except SystemExit as e:
+        return e.code if isinstance(e.code, int) else (0 if e.code is None else 1)
+    except Exception as e:
+        print(f"❌ {type(e).__name__}: {e}")
+        return 1
+    finally:
+        os.chdir(previous_cwd)
+    return 0
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def send(self, **message):
+        self.wfile.write(json.dumps(message).encode('utf-8') + b'\n')
+
+    def handle(self):
+        server = self.server
+        peer = _peer_uid(self.request)
+        if peer is not None and peer != os.getuid():
+            return
+        try:
+            message = json.loads(self.rfile.readline() or b'{}')
+        except ValueError:
+            return
+
+        if message.get('op') == 'status':
+            self.send(pid=os.getpid(), uptime=time.time() - server.started, served=server.served)
+            return
+        if message.get('op') == 'stop':
+            self.send(stopping=os.getpid())
+            threading.Thread(target=server.shutdown).start()
+            return
+
+        argv = message.get('argv') or []
+        if not argv or argv[0] not in FORWARDED_COMMANDS:
+            self.send(fallback='command is not served by the daemon')
+            return
+        if message.get('env') != environment():
+            # Different PATH, prefix or settings than the daemon started with
+            self.send(fallback='environment differs from the daemon')
+            return
+        cwd = message.get('cwd')
+        if not cwd or not os.path.isdir(cwd):
+            self.send(fallback='working directory is not accessible to the daemon')
+            return
+
+        # Commands print through the process-wide sys.stdout and run in the
+        # client's directory, so they run one at a time; each takes
+        # milliseconds once the caches are warm
+        with server.command_lock:
+            with redirect_stdout(_Framed(self.wfile, 'out')), redirect_stderr(_Framed(self.wfile, 'err')):
+                code = run_in_process(argv, cwd)
+            server.served += 1
+        self.send(exit=code)
+
+
+class DaemonServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    daemon_threads = True
+
+    def __init__(self, path):
+        super().__init__(path, _Handler)
+        self.started = time.time()
+        self.served = 0
+        self.command_lock = threading.Lock()
+
+
+def warm_up():
+    """Pay the one-off costs now: heavy imports, host detection, the HTTP session"""
+    import main  # pulls in requests, bs4 and every tool module
+    if get_os() == 'Linux':
+        get_linux_distro()
+    get_http_session()
+
+
+def daemon_status():
+    """Reply to a status request, or None when no daemon is listening"""
+    for message in request({'op': 'status'}):
+        return message
+    return None
+
+
+def serve(path=None):
+    """'devops-cli daemon': listen on the socket until stopped; returns True on a clean exit"""
+    path = path or get_socket_path()
+    running = daemon_status()
+    if running:
+        print(f"⚠️  A devops-cli daemon is already running (pid {running['pid']}) on {path}")
+        return False
+    if os.path.exists(path):
+        os.remove(path)  # left by a daemon that did not shut down cleanly
+
+    start = time.time()
+    warm_up()
+    old_umask = os.umask(0o177)  # socket usable by this user only
+    try:
+        server = DaemonServer(path)
+    finally:
+        os.umask(old_umask)
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+    print(f"🚀 devops-cli daemon (pid {os.getpid()}) listening on {path}, warmed up in {time.time() - start:.2f}s")
+    print(f"   Serving: {', '.join(FORWARDED_COMMANDS)}; stop with 'devops-cli daemon --stop'")
+    sys.stdout.flush()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if os.path.exists(path):
+            os.remove(path)
+    print(f"👋 devops-cli daemon stopped after serving {server.served} command(s)")
+    return True
+
+
+def stop():
+    for message in request({'op': 'stop'}):
+        print(f"✅ Stopped the devops-cli daemon (pid {message['stopping']})")
+        return True
+    print("No devops-cli daemon is running")
+    return True
+
+
+def show_status():
+    status = daemon_status()
+    if status is None:
+        print(f"No devops-cli daemon is listening on {get_socket_path()}")
+        return False
+    print(f"✅ devops-cli daemon pid {status['pid']} on {get_socket_path()}: "
+          f"up {status['uptime']:.0f}s, {status['served']} command(s) served")
+    return True
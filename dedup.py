@@ -0,0 +1,162 @@
+"""
+File Deduplication for DevOps CLI
+Finds files in the versioned store whose content is identical to a file from
+another stored version and shares the data: a reflink (copy-on-write clone)
+where the filesystem supports it, else a hardlink
+"""
+
+import filecmp
+import hashlib
+import os
+import stat
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+AUTO = 'auto'
+REFLINK = 'reflink'
+HARDLINK = 'hardlink'
+OFF = 'off'
+MODES = (AUTO, REFLINK, HARDLINK, OFF)
+
+MIN_SIZE = 4096  # smaller files cost less than the hashing
+HASH_CHUNK = 1024 * 1024
+FICLONE = 0x40049409  # _IOW(0x94, 9, int) from linux/fs.h
+
+
+class DedupStats:
+    """What one deduplication pass did"""
+
+    def __init__(self):
+        self.files_scanned = 0
+        self.files_linked = 0
+        self.bytes_saved = 0
+        self.method = None
+
+    def add(self, other):
+        self.files_scanned += other.files_scanned
+        self.files_linked += other.files_linked
+        self.bytes_saved += other.bytes_saved
+        self.method = self.method or other.method
+
+
+def get_mode():
+    mode = os.environ.get('DEVOPS_CLI_DEDUP', AUTO).lower()
+    return mode if mode in MODES else AUTO
+
+
+def format_bytes(count):
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if count < 1024 or unit == 'GB':
+            return f"{count:.0f} {unit}" if unit == 'B' else f"{count:.1f} {unit}"
+        count /= 1024.0
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def index_files(root, skip=()):
+    """{relative path: [size, sha256]} for the regular files under root"""
+    index = {}
+    for directory, _, names in os.walk(root):
+        for name in names:
+            path = os.path.join(directory, name)
+            info = os.lstat(path)
+            if not stat.S_ISREG(info.st_mode) or info.st_size < MIN_SIZE:
+                continue
+            relpath = os.path.relpath(path, root)
+            if relpath in skip:
+                continue
+            index[relpath] = [info.st_size, file_digest(path)]
+    return index
+
+
+def identical(source, target):
+    """Whether target can share source's data: same size, mode and owner, and byte-for-byte equal
+
+    Recorded digests only say what a file held when it was indexed; a
+    hardlink also makes the target take on the source's permissions.
+    """
+    try:
+        a, b = os.stat(source), os.stat(target)
+    except OSError:
+        return False
+    if (a.st_size, a.st_mode, a.st_uid, a.st_gid) != (b.st_size, b.st_mode, b.st_uid, b.st_gid):
+        return False
+    return filecmp.cmp(source, target, shallow=False)
+
+
+def reflink(source, target):
+    """Clone source's data into a new file at target; False if the filesystem cannot"""
+    if fcntl is None:
+        return False
+    try:
+        with open(source, 'rb') as src, open(target, 'wb') as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+    except OSError:
+        if os.path.exists(target):
+            os.remove(target)
+        return False
+    return True
+
+
+def share(source, target, mode=None):
+    """Replace target with a reflink or hardlink of identical source; returns the method used or None"""
+    mode = mode or get_mode()
+    if mode == OFF:
+        return None
+    temporary = f"{target}.{os.getpid()}.dedup"
+    info = os.stat(target)
+    if mode in (AUTO, REFLINK) and reflink(source, temporary):
+        method = REFLINK
+    elif mode in (AUTO, HARDLINK):
+        try:
+            os.link(source, temporary)
+        except OSError:  # other filesystem, or links not supported
+            return None
+        method = HARDLINK
+    else:
+        return None
+    if method == REFLINK:
+        os.chmod(temporary, stat.S_IMODE(info.st_mode))
+    os.replace(temporary, target)
+    return method
+
+
+def dedup_tree(root, index, candidates, mode=None, dry_run=False):
+    """Share files under root (described by index) with identical files in candidates
+
+    candidates maps (size, sha256) to a path outside root; files of root
+    that are not shared are added to it, so trees can be chained.
+    """
+    stats = DedupStats()
+    for relpath, (size, digest) in sorted(index.items()):
+        stats.files_scanned += 1
+        path = os.path.join(root, relpath)
+        source = candidates.get((size, digest))
+        if source is None or not os.path.isfile(source):
+            candidates[(size, digest)] = path
+            continue
+        if os.path.samefile(source, path):
+            continue  # already hardlinked
+        if not identical(source, path):
+            continue  # changed since it was indexed, or different permissions
+        if not dry_run:
+            try:
+                method = share(source, path, mode)
+            except OSError:
+                method = None
+            if method is None:
+                candidates[(size, digest)] = path
+                continue
+            stats.method = stats.method or method
+        stats.files_linked += 1
+        stats.bytes_saved += size
+    return stats
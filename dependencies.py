@@ -7,6 +7,9 @@ import os
 import subprocess
 import platform
 from utils import get_os, get_linux_distro
+import process
+from tracing import traced
+import metrics
 
 class DependencyManager:
     """Manages dependencies for DevOps tools"""
@@ -52,11 +55,11 @@ class DependencyManager:
             },
             'awscli': {
                 'Linux': {
-                    'ubuntu': ['unzip'],
-                    'debian': ['unzip'],
-                    'centos': ['unzip'],
-                    'rhel': ['unzip'],
-                    'fedora': ['unzip']
+                    'ubuntu': [],
+                    'debian': [],
+                    'centos': [],
+                    'rhel': [],
+                    'fedora': []
                 },
                 'Darwin': [],
                 'Windows': []
@@ -107,11 +110,11 @@ class DependencyManager:
             },
             'terraform': {
                 'Linux': {
-                    'ubuntu': ['curl', 'unzip'],
-                    'debian': ['curl', 'unzip'],
-                    'centos': ['curl', 'unzip'],
-                    'rhel': ['curl', 'unzip'],
-                    'fedora': ['curl', 'unzip']
+                    'ubuntu': ['curl'],
+                    'debian': ['curl'],
+                    'centos': ['curl'],
+                    'rhel': ['curl'],
+                    'fedora': ['curl']
                 },
                 'Darwin': [],
                 'Windows': []
@@ -144,15 +147,15 @@ class DependencyManager:
         try:
             if self.os_type == 'Linux':
                 if self.distro and 'ubuntu' in self.distro.lower() or 'debian' in self.distro.lower():
-                    result = subprocess.run(['dpkg', '-l', package_name], 
+                    result = process.run(['dpkg', '-l', package_name], 
                                           capture_output=True, text=True, timeout=10)
                     return result.returncode == 0 and 'ii' in result.stdout
                 elif self.distro and ('centos' in self.distro.lower() or 'rhel' in self.distro.lower() or 'fedora' in self.distro.lower()):
-                    result = subprocess.run(['rpm', '-q', package_name], 
+                    result = process.run(['rpm', '-q', package_name], 
                                           capture_output=True, text=True, timeout=10)
                     return result.returncode == 0
             elif self.os_type == 'Darwin':
-                result = subprocess.run(['brew', 'list', package_name], 
+                result = process.run(['brew', 'list', package_name], 
                                       capture_output=True, text=True, timeout=10)
                 return result.returncode == 0
             elif self.os_type == 'Windows':
@@ -169,21 +172,21 @@ class DependencyManager:
         try:
             if self.os_type == 'Linux':
                 if self.distro and ('ubuntu' in self.distro.lower() or 'debian' in self.distro.lower()):
-                    subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
-                    subprocess.run(['sudo', 'apt', 'install', '-y', package_name], check=True, timeout=300)
+                    process.run(['sudo', 'apt', 'update'], check=True, timeout=60)
+                    process.run(['sudo', 'apt', 'install', '-y', package_name], check=True, timeout=300)
                 elif self.distro and ('centos' in self.distro.lower() or 'rhel' in self.distro.lower()):
-                    subprocess.run(['sudo', 'yum', 'install', '-y', package_name], check=True, timeout=300)
+                    process.run(['sudo', 'yum', 'install', '-y', package_name], check=True, timeout=300)
                 elif self.distro and 'fedora' in self.distro.lower():
-                    subprocess.run(['sudo', 'dnf', 'install', '-y', package_name], check=True, timeout=300)
+                    process.run(['sudo', 'dnf', 'install', '-y', package_name], check=True, timeout=300)
             elif self.os_type == 'Darwin':
-                subprocess.run(['brew', 'install', package_name], check=True, timeout=300)
+                process.run(['brew', 'install', package_name], check=True, timeout=300)
             elif self.os_type == 'Windows':
                 # For Windows, we'll use chocolatey or winget
                 try:
-                    subprocess.run(['choco', 'install', package_name, '-y'], check=True, timeout=300)
+                    process.run(['choco', 'install', package_name, '-y'], check=True, timeout=300)
                 except (subprocess.CalledProcessError, FileNotFoundError):
                     try:
-                        subprocess.run(['winget', 'install', package_name], check=True, timeout=300)
+                        process.run(['winget', 'install', package_name], check=True, timeout=300)
                     except (subprocess.CalledProcessError, FileNotFoundError):
                         print(f"Warning: Could not install {package_name} on Windows. Please install manually.")
                         return False
@@ -201,6 +204,9 @@ class DependencyManager:
             print(f"❌ Error installing {package_name}: {e}")
             return False
     
+    @traced('dependencies', lambda self, tool_name: f"{tool_name} dependencies")
+    @process.accounted(lambda self, tool_name: f"{tool_name} dependencies")
+    @metrics.phase('dependencies')
     def install_dependencies(self, tool_name):
         """Install all dependencies for a tool"""
         dependencies = self.get_dependencies(tool_name)
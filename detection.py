@@ -0,0 +1,333 @@
+"""
+Installed Tool Detection for DevOps CLI
+Finds which tools are installed, where, and which version each one reports
+"""
+
+import glob
+import json
+import os
+import re
+import shutil
+import signal
+import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from packaging.version import Version, InvalidVersion
+
+from utils import get_cache_dir, get_managed_bin_dir
+from inspection import read_static_version
+from tracing import span
+import metrics
+
+ALL_TOOLS = ['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform']
+
+# Executable looked up on PATH for each tool
+EXECUTABLES = {
+    'docker': 'docker',
+    'kubectl': 'kubectl',
+    'awscli': 'aws',
+    'gcloud': 'gcloud',
+    'az': 'az',
+    'jenkins': 'jenkins',
+    'helm': 'helm',
+    'prometheus': 'prometheus',
+    'terraform': 'terraform',
+}
+
+# Arguments that make each executable print its version
+VERSION_ARGS = {
+    'docker': ['--version'],
+    'kubectl': ['version', '--client'],
+    'awscli': ['--version'],
+    'gcloud': ['version'],
+    'az': ['--version'],
+    'jenkins': ['--version'],
+    'helm': ['version', '--short'],
+    'prometheus': ['--version'],
+    'terraform': ['version'],
+}
+
+# Places the installers put tools that are not always on PATH (globs allowed)
+WELL_KNOWN_LOCATIONS = {
+    'gcloud': ['~/google-cloud-sdk/bin/gcloud', '/usr/lib/google-cloud-sdk/bin/gcloud'],
+    'awscli': ['/usr/local/aws-cli/v2/current/bin/aws', '/usr/local/bin/aws'],
+    'jenkins': [
+        '/usr/share/java/jenkins.war',
+        '/usr/share/jenkins/jenkins.war',
+        '/usr/lib/jenkins/jenkins.war',
+        '/opt/homebrew/opt/jenkins-lts/libexec/jenkins.war',
+        '/usr/local/opt/jenkins-lts/libexec/jenkins.war',
+        './jenkins.war',
+    ],
+    'terraform': ['/usr/local/bin/terraform', '/snap/bin/terraform'],
+    'kubectl': ['/usr/local/bin/kubectl', '/snap/bin/kubectl'],
+    'helm': ['/usr/local/bin/helm'],
+    'prometheus': ['./prometheus-*/prometheus', '/usr/local/bin/prometheus'],
+    'docker': ['/usr/bin/docker', '/usr/local/bin/docker'],
+    'az': ['/usr/bin/az', '/opt/az/bin/az'],
+}
+
+DEFAULT_PROBE_TIMEOUT = 10
+DEFAULT_DEADLINE = 30
+
+# Every tool prints its own version before any dependency versions
+VERSION_PATTERN = re.compile(r'(\d+\.\d+(?:\.\d+)?)')
+
+_probe_cache = None
+_probe_cache_lock = threading.Lock()
+
+
+class ToolStatus:
+    """Detection result for one tool"""
+
+    def __init__(self, tool, path=None, version=None, error=None, probe_time=0.0, cached=False):
+        self.tool = tool
+        self.path = path
+        self.version = version
+        self.error = error
+        self.probe_time = probe_time
+        self.cached = cached
+        self.latest = None
+
+    @property
+    def installed(self):
+        return self.path is not None
+
+    def to_dict(self):
+        return {
+            'tool': self.tool,
+            'installed': self.installed,
+            'path': self.path,
+            'version': self.version,
+            'latest': self.latest,
+            'error': self.error,
+            'probe_time': round(self.probe_time, 3),
+            'cached': self.cached,
+        }
+
+
+def parse_version_output(output):
+    """Extract the first dotted version number from a tool's version output"""
+    match = VERSION_PATTERN.search(output or '')
+    return match.group(1) if match else None
+
+
+def _resolve_shim(tool_name, executable, found):
+    """The store binary a devops-cli shim found on PATH would run here, else the next match on PATH
+
+    A shim is a tiny sh script whose target depends on the working directory,
+    so it must never be probed (or cached) itself.
+    """
+    import pins  # pins -> strategies -> detection
+    shims_dir = pins.get_shims_dir()
+    if os.path.dirname(os.path.abspath(found)) != shims_dir:
+        return found
+    resolved = pins.resolve(tool_name, executable)
+    if resolved:
+        return resolved
+    rest = [entry for entry in os.environ.get('PATH', '').split(os.pathsep)
+            if entry and os.path.abspath(os.path.expanduser(entry)) != shims_dir]
+    return shutil.which(executable, path=os.pathsep.join(rest))
+
+
+def _release_key(path):
+    versions = []
+    for text in VERSION_PATTERN.findall(path):
+        try:
+            versions.append(Version(text))
+        except InvalidVersion:
+            pass
+    return versions, path
+
+
+def newest_first(paths):
+    """Sort paths by the release versions in their names, newest first (prometheus-2.50.0 before 2.9.0)"""
+    return sorted(paths, key=_release_key, reverse=True)
+
+
+def find_tool_binary(tool_name):
+    """Locate a tool via PATH (seeing through devops-cli shims), then the well-known install locations"""
+    executable = EXECUTABLES.get(tool_name, tool_name)
+    found = shutil.which(executable)
+    if found:
+        found = _resolve_shim(tool_name, executable, found)
+    if found:
+        return found
+    # Release binaries installed by devops-cli itself, even when the prefix is not on PATH
+    managed = os.path.join(get_managed_bin_dir(), executable)
+    if os.path.isfile(managed) and os.access(managed, os.X_OK):
+        return managed
+    for pattern in WELL_KNOWN_LOCATIONS.get(tool_name, []):
+        for candidate in newest_first(glob.glob(os.path.expanduser(pattern))):
+            if candidate.endswith('.war') and os.path.isfile(candidate):
+                return os.path.abspath(candidate)
+            if os.path.isfile(candidate) and os.access(candidate, os.X_OK):
+                return os.path.abspath(candidate)
+    return None
+
+
+def version_command(tool_name, path):
+    """Build the command that prints a tool's version"""
+    if path.endswith('.war'):
+        return ['java', '-jar', path, '--version']
+    return [path] + VERSION_ARGS.get(tool_name, ['--version'])
+
+
+def _kill_process_tree(process):
+    """Kill a probe and everything it spawned (gcloud and az start their own interpreters)"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        process.kill()
+    process.communicate()
+
+
+def run_probe(command, timeout):
+    """Run a version command in its own process group; returns (returncode, output)
+
+    Raises subprocess.TimeoutExpired after killing the whole process group, so
+    no straggler outlives the probe.
+    """
+    with span(' '.join(command), 'probe'):
+        process = subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE,
+                                   stderr=subprocess.STDOUT, text=True, errors='replace',
+                                   start_new_session=(os.name == 'posix'))
+        try:
+            output, _ = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            _kill_process_tree(process)
+            raise
+    return process.returncode, output
+
+
+def _probe_cache_file():
+    return os.path.join(get_cache_dir(), 'probes.json')
+
+
+def _binary_identity(path):
+    """(real path, inode, size, mtime) of a binary; any upgrade in place changes it"""
+    real_path = os.path.realpath(path)
+    stat = os.stat(real_path)
+    return real_path, [stat.st_ino, stat.st_size, stat.st_mtime_ns]
+
+
+def _load_probe_cache():
+    global _probe_cache
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            try:
+                with open(_probe_cache_file(), 'r', encoding='utf-8') as f:
+                    _probe_cache = json.load(f)
+            except (OSError, ValueError):
+                _probe_cache = {}
+        return _probe_cache
+
+
+def _cached_version(tool_name, path):
+    """Return the cached version for a binary if the file is unchanged since it was probed"""
+    try:
+        real_path, identity = _binary_identity(path)
+    except OSError:
+        return None
+    entry = _load_probe_cache().get(real_path)
+    if entry and entry.get('tool') == tool_name and entry.get('identity') == identity:
+        return entry.get('version')
+    return None
+
+
+def _remember_version(tool_name, path, version):
+    try:
+        real_path, identity = _binary_identity(path)
+    except OSError:
+        return
+    cache = _load_probe_cache()
+    with _probe_cache_lock:
+        cache[real_path] = {'tool': tool_name, 'identity': identity, 'version': version}
+
+
+def save_probe_cache():
+    """Write the probe cache to disk (atomically) so later runs skip unchanged binaries"""
+    with _probe_cache_lock:
+        if _probe_cache is None:
+            return
+        snapshot = dict(_probe_cache)
+    try:
+        partial = f"{_probe_cache_file()}.{os.getpid()}.part"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(snapshot, f)
+        os.replace(partial, _probe_cache_file())
+    except OSError:
+        pass
+
+
+def probe_tool(tool_name, timeout=DEFAULT_PROBE_TIMEOUT, use_cache=True):
+    """Find a tool and ask it for its version
+
+    Versions are cached per binary, keyed by its resolved path plus inode,
+    size and mtime, so an unchanged binary is never executed twice. Where
+    the version can be read from the binary or its install tree the tool is
+    not executed at all.
+    """
+    start = time.time()
+    path = find_tool_binary(tool_name)
+    if not path:
+        return ToolStatus(tool_name, probe_time=time.time() - start)
+    if use_cache:
+        version = _cached_version(tool_name, path)
+        metrics.inc('devops_cli_cache_requests_total', cache='probes', result='hit' if version else 'miss')
+        if version:
+            return ToolStatus(tool_name, path, version, probe_time=time.time() - start, cached=True)
+    version = read_static_version(tool_name, path)
+    if version:
+        _remember_version(tool_name, path, version)
+        return ToolStatus(tool_name, path, version, probe_time=time.time() - start)
+    if timeout <= 0:
+        return ToolStatus(tool_name, path, error="deadline exceeded before probe started")
+    try:
+        returncode, output = run_probe(version_command(tool_name, path), timeout)
+        if returncode == 0:
+            version = parse_version_output(output)
+            if version:
+                _remember_version(tool_name, path, version)
+            return ToolStatus(tool_name, path, version, probe_time=time.time() - start)
+        error = f"exited with status {returncode}"
+    except subprocess.TimeoutExpired:
+        error = f"timed out after {timeout:.0f}s"
+    except OSError as e:
+        error = str(e)
+    return ToolStatus(tool_name, path, error=error, probe_time=time.time() - start)
+
+
+def probe_tools(tool_names=None, max_workers=None, timeout=DEFAULT_PROBE_TIMEOUT, deadline=None,
+                use_cache=True):
+    """Probe several tools concurrently; returns ToolStatus objects in input order
+
+    timeout bounds each probe; deadline (seconds) bounds the whole run, so
+    probes still queued or running when it passes are cut short.
+    """
+    tool_names = list(tool_names or ALL_TOOLS)
+    end = time.time() + deadline if deadline else None
+
+    def probe(tool_name):
+        budget = timeout if end is None else min(timeout, end - time.time())
+        return probe_tool(tool_name, budget, use_cache)
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(tool_names) or 1) as pool:
+        statuses = list(pool.map(probe, tool_names))
+    if not all(status.cached or not status.installed for status in statuses):
+        save_probe_cache()
+    return statuses
+
+
+def detect_installed_version(tool_name, timeout=DEFAULT_PROBE_TIMEOUT):
+    """Return the installed version of a tool, or None if it is not installed"""
+    status = probe_tool(tool_name, timeout)
+    if not status.cached:
+        save_probe_cache()
+    return status.version
+
+
+def detect_installed_versions(tool_names=None, max_workers=None):
+    """Detect several tools concurrently; returns {tool: version or None}"""
+    return {status.tool: status.version for status in probe_tools(tool_names, max_workers)}
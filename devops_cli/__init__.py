@@ -0,0 +1,20 @@
+"""
+DevOps CLI as a Python library
+
+    import devops_cli
+
+    for result in devops_cli.install(['terraform@1.5.7', 'kubectl'], jobs=2):
+        print(result.tool, result.ok, result.version, f"{result.duration:.1f}s", result.error)
+
+Every call returns result objects (see devops_cli.api) with timings and
+errors instead of printing, so many operations can be batched in one process.
+"""
+
+from main import __version__
+from devops_cli.api import (
+    DevOpsCliError, ToolResult, VersionsResult, DependencyResult, ToolStatus,
+    install, update, uninstall, versions, latest_version, status, dependencies,
+)
+
+__all__ = ['__version__', 'DevOpsCliError', 'ToolResult', 'VersionsResult', 'DependencyResult', 'ToolStatus',
+           'install', 'update', 'uninstall', 'versions', 'latest_version', 'status', 'dependencies']
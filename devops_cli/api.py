@@ -0,0 +1,304 @@
+"""
+Library API for DevOps CLI
+Runs the same installers, lookups and probes as the command line, in the
+caller's process, and returns result objects instead of printing. What the
+installers print, and what the commands they run write, is captured per tool.
+"""
+
+import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager, redirect_stdout
+
+from bundle import parse_tool_spec
+from dependencies import dependency_manager
+from detection import ALL_TOOLS, ToolStatus, probe_tool, probe_tools
+from utils import get_os, get_linux_distro
+from versioning import get_version_candidates, resolve_version, get_cached_latest_version
+import process
+import strategies
+from tools import docker, kubectl, awscli, gcloud, az, jenkins, helm, prometheus, terraform
+
+TOOL_MODULES = {
+    'docker': docker, 'kubectl': kubectl, 'awscli': awscli, 'gcloud': gcloud, 'az': az,
+    'jenkins': jenkins, 'helm': helm, 'prometheus': prometheus, 'terraform': terraform,
+}
+OUTPUT_LINES = 500  # most recent output lines kept per tool
+
+# Output capture swaps the process-wide sys.stdout, so API calls run one at a time
+_call_lock = threading.RLock()
+
+
+class DevOpsCliError(ValueError):
+    """Raised for arguments the API cannot act on, such as an unknown tool"""
+
+
+class ToolResult:
+    """Outcome of installing, updating or uninstalling one tool
+
+    ok is False when the installer reported failure or raised, or when the
+    tool is missing afterwards (present afterwards, for uninstall).
+    """
+
+    def __init__(self, tool, action, requested_version=None):
+        self.tool = tool
+        self.action = action
+        self.requested_version = requested_version
+        self.ok = False
+        self.version_before = None
+        self.version = None  # detected once the action finished
+        self.path = None
+        self.duration = 0.0
+        self.commands = 0
+        self.failed_commands = 0
+        self.error = None
+        self.output = []
+
+    @property
+    def changed(self):
+        return self.version != self.version_before
+
+    def to_dict(self):
+        return {
+            'tool': self.tool,
+            'action': self.action,
+            'requested_version': self.requested_version,
+            'ok': self.ok,
+            'changed': self.changed,
+            'version_before': self.version_before,
+            'version': self.version,
+            'path': self.path,
+            'duration': round(self.duration, 3),
+            'commands': self.commands,
+            'failed_commands': self.failed_commands,
+            'error': self.error,
+            'output': list(self.output),
+        }
+
+
+class VersionsResult:
+    """Versions available for one tool, newest first"""
+
+    def __init__(self, tool, versions=None, duration=0.0, error=None):
+        self.tool = tool
+        self.versions = versions or []
+        self.duration = duration
+        self.error = error
+
+    @property
+    def ok(self):
+        return self.error is None
+
+    @property
+    def latest(self):
+        return next((v for v in self.versions if v != 'latest'), None)
+
+    def to_dict(self):
+        return {'tool': self.tool, 'versions': list(self.versions), 'latest': self.latest,
+                'duration': round(self.duration, 3), 'error': self.error}
+
+
+class DependencyResult:
+    """System packages a tool needs on this host, and which of them are missing"""
+
+    def __init__(self, tool, required=None, missing=None, installed=False, duration=0.0, error=None):
+        self.tool = tool
+        self.required = required or []
+        self.missing = missing or []
+        self.installed = installed  # whether missing packages were installed by this call
+        self.duration = duration
+        self.error = error
+
+    @property
+    def ok(self):
+        return not self.missing and self.error is None
+
+    def to_dict(self):
+        return {'tool': self.tool, 'required': list(self.required), 'missing': list(self.missing),
+                'installed': self.installed, 'ok': self.ok, 'duration': round(self.duration, 3),
+                'error': self.error}
+
+
+class _CapturedStdout(process.LabelledStdout):
+    """Collects each labelled thread's output lines, and its commands' output, per label"""
+
+    def __init__(self, stream, keep=OUTPUT_LINES):
+        super().__init__(stream)
+        self.keep = keep
+        self.lines = {}
+
+    def write(self, text):
+        label = process.output_label()
+        if label is None:
+            return self.stream.write(text)
+        key = threading.get_ident()
+        lines = (self._partial.pop(key, '') + text).split('\n')
+        if lines[-1]:
+            self._partial[key] = lines[-1]
+        buffer = self.lines.setdefault(label, deque(maxlen=self.keep))
+        buffer.extend(lines[:-1])
+        return len(text)
+
+    def relay_line(self, label, line, kind='out'):
+        self.lines.setdefault(label, deque(maxlen=self.keep)).append(line)
+
+
+def _tool_names(tools):
+    """Accept 'terraform', 'terraform@1.5.7' or a list of either; returns [(tool, version)]"""
+    if tools is None:
+        tools = list(ALL_TOOLS)
+    elif isinstance(tools, str):
+        tools = [tools]
+    specs = [parse_tool_spec(spec) for spec in tools]
+    unknown = [tool for tool, _ in specs if tool not in TOOL_MODULES]
+    if unknown:
+        raise DevOpsCliError(f"Unknown tool(s): {', '.join(unknown)} (known: {', '.join(TOOL_MODULES)})")
+    return specs
+
+
+@contextmanager
+def _api_call(capture, strategy=None):
+    if strategy is not None and strategy not in strategies.STRATEGIES:
+        raise DevOpsCliError(f"Unknown strategy {strategy!r} (choose from {', '.join(strategies.STRATEGIES)})")
+    with _call_lock:
+        previous_strategy = strategies.set_strategy(strategy) if strategy is not None else None
+        try:
+            if capture:
+                stream = _CapturedStdout(sys.stdout)
+                with redirect_stdout(stream):
+                    yield stream
+            else:
+                yield None
+        finally:
+            if strategy is not None:
+                strategies.set_strategy(previous_strategy)
+
+
+def _run_action(action, tool, version, stream):
+    result = ToolResult(tool, action, None if version == 'latest' else version)
+    before = probe_tool(tool, use_cache=True)
+    result.version_before = before.version
+    function = getattr(TOOL_MODULES[tool], action)
+    start = time.time()
+    returned = None
+    with process.labelled_output(tool), process.accounting_scope(f"{action} {tool}") as scope:
+        try:
+            returned = function() if action == 'uninstall' else function(version=result.requested_version)
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.time() - start
+    result.commands = len(scope.records)
+    result.failed_commands = sum(1 for record in scope.records if record.returncode)
+
+    after = probe_tool(tool, use_cache=False)
+    result.version = after.version
+    result.path = after.path
+    present = after.installed and not after.error
+    if result.error is None and returned is False:
+        result.error = f"{tool} {action} reported failure"
+    if result.error is None and present == (action == 'uninstall'):
+        result.error = f"{tool} is {'still' if present else 'not'} installed after {action}"
+    result.ok = result.error is None
+    if stream is not None:
+        result.output = list(stream.lines.get(tool, ()))
+    return result
+
+
+def _run_actions(action, tools, jobs, capture, strategy):
+    specs = _tool_names(tools)
+    with _api_call(capture, strategy) as stream:
+        contexts = process.thread_context()
+
+        def run(spec):
+            with process.inherited_context(contexts):
+                return _run_action(action, spec[0], spec[1], stream)
+
+        if jobs and jobs > 1 and len(specs) > 1:
+            with ThreadPoolExecutor(max_workers=jobs, thread_name_prefix=action) as pool:
+                return list(pool.map(run, specs))
+        return [run(spec) for spec in specs]
+
+
+def install(tools, jobs=1, strategy=None, capture=True):
+    """Install tools ('terraform', 'terraform@1.5.7' or a list); returns a ToolResult per tool
+
+    jobs > 1 installs that many tools at once; package-manager commands
+    still take turns. strategy overrides the install strategy ('binary',
+    'package' or 'auto') for this call. With capture=False installer output
+    goes to stdout as on the command line.
+    """
+    return _run_actions('install', tools, jobs, capture, strategy)
+
+
+def update(tools=None, jobs=None, strategy=None, capture=True):
+    """Update tools (default: every installed tool, all at once); returns a ToolResult per tool"""
+    if tools is None:
+        tools = [status.tool for status in probe_tools(ALL_TOOLS) if status.installed]
+        jobs = jobs or len(tools)
+    return _run_actions('update', tools, jobs, capture, strategy)
+
+
+def uninstall(tools, capture=True):
+    """Uninstall tools; returns a ToolResult per tool"""
+    return _run_actions('uninstall', tools, 1, capture, None)
+
+
+def versions(tool):
+    """Versions of a tool available for this host, newest first"""
+    tool_name, _ = _tool_names(tool)[0]
+    os_type = get_os()
+    start = time.time()
+    try:
+        found = get_version_candidates(tool_name, os_type, get_linux_distro() if os_type == 'Linux' else None)
+        return VersionsResult(tool_name, list(found), time.time() - start)
+    except Exception as e:
+        return VersionsResult(tool_name, duration=time.time() - start, error=f"{type(e).__name__}: {e}")
+
+
+def latest_version(tool):
+    """Newest released version of a tool, or None if it cannot be looked up"""
+    tool_name, _ = _tool_names(tool)[0]
+    os_type = get_os()
+    return resolve_version(tool_name, 'latest', os_type, get_linux_distro() if os_type == 'Linux' else None)
+
+
+def status(tools=None, refresh=False, use_cache=True):
+    """Installed state of tools as detection.ToolStatus objects
+
+    latest comes from the local version cache unless refresh looks it up online.
+    """
+    names = [tool for tool, _ in _tool_names(tools)]
+    statuses = probe_tools(names, use_cache=use_cache)
+    if refresh:
+        with ThreadPoolExecutor(max_workers=len(statuses) or 1) as pool:
+            latest = list(pool.map(lambda s: latest_version(s.tool), statuses))
+    else:
+        latest = [get_cached_latest_version(s.tool) for s in statuses]
+    for tool_status, latest_known in zip(statuses, latest):
+        tool_status.latest = latest_known
+    return statuses
+
+
+def dependencies(tool, install_missing=False, capture=True):
+    """System packages a tool needs and which are missing; install_missing installs them"""
+    tool_name, _ = _tool_names(tool)[0]
+    start = time.time()
+    result = DependencyResult(tool_name, dependency_manager.get_dependencies(tool_name))
+    with _api_call(capture):
+        with process.labelled_output(tool_name):
+            try:
+                result.missing = [dep for dep in result.required if not dependency_manager.check_dependency_installed(dep)]
+                if result.missing and install_missing:
+                    result.installed = bool(dependency_manager.install_dependencies(tool_name))
+                    result.missing = [dep for dep in result.missing
+                                      if not dependency_manager.check_dependency_installed(dep)]
+            except Exception as e:
+                result.error = f"{type(e).__name__}: {e}"
+    result.duration = time.time() - start
+    return result
+
+
+__all__ = ['DevOpsCliError', 'ToolResult', 'VersionsResult', 'DependencyResult', 'ToolStatus',
+           'install', 'update', 'uninstall', 'versions', 'latest_version', 'status', 'dependencies']
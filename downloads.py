@@ -0,0 +1,251 @@
+"""
+Download and Extraction Helpers for DevOps CLI
+Streams release archives straight into the extractor instead of writing
+the archive to disk and shelling out to unzip/tar
+"""
+
+import os
+import shutil
+import stat
+import tarfile
+import tempfile
+import zipfile
+from integrity import DigestReader, verify_digest
+from mirror import get_active_mirror
+from tracing import traced
+import metrics
+import process
+from utils import get_http_session, rewrite_url
+
+CHUNK_SIZE = 64 * 1024
+
+# Zip archives keep their index at the end, so they cannot be read as a pure
+# stream. Archives smaller than this stay in memory, larger ones spill to disk.
+ZIP_SPOOL_LIMIT = 64 * 1024 * 1024
+
+
+class _MirrorResponse:
+    """Minimal stand-in for a streaming requests.Response backed by a bundle file"""
+
+    def __init__(self, raw):
+        self.raw = raw
+
+    def iter_content(self, chunk_size=CHUNK_SIZE):
+        return iter(lambda: self.raw.read(chunk_size), b'')
+
+    def close(self):
+        self.raw.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def open_stream(url, timeout=30):
+    """Open a streaming response for url, served from the offline mirror if one is active"""
+    mirror = get_active_mirror()
+    if mirror is not None:
+        return _MirrorResponse(mirror.open(url))
+
+    response = get_http_session().get(rewrite_url(url), stream=True, timeout=timeout)
+    response.raise_for_status()
+    response.raw.decode_content = True
+    return response
+
+
+def _count_download(url, size):
+    source = 'mirror' if get_active_mirror() is not None else metrics.source_of(url)
+    metrics.inc('devops_cli_download_bytes_total', size, tool=metrics.current_tool(), source=source)
+
+
+def _download_span_name(url, *args, **kwargs):
+    return f"download {url.rsplit('/', 1)[-1]}"
+
+
+def _safe_relpath(name, strip_components=0):
+    """Normalise an archive member name, rejecting paths that escape dest_dir"""
+    parts = [part for part in name.replace('\\', '/').split('/') if part not in ('', '.')]
+    if name.startswith('/') or '..' in parts:
+        raise ValueError(f"Refusing to extract unsafe archive member: {name}")
+    parts = parts[strip_components:]
+    return '/'.join(parts) if parts else None
+
+
+def _is_wanted(relpath, members):
+    """Check whether relpath is one of the requested members (or inside one)"""
+    if members is None:
+        return True
+    for member in members:
+        member = member.rstrip('/')
+        if relpath == member or relpath.startswith(member + '/'):
+            return True
+    return False
+
+
+class _StagedExtraction:
+    """Members written as .part files, renamed into place only once verified"""
+
+    def __init__(self):
+        self.files = []
+        self.symlinks = []
+
+    def add_file(self, source, target, mode):
+        os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+        partial = target + '.part'
+        with open(partial, 'wb') as out:
+            shutil.copyfileobj(source, out, CHUNK_SIZE)
+        os.chmod(partial, mode or 0o644)
+        self.files.append((partial, target))
+
+    def add_symlink(self, link_target, target):
+        if link_target.startswith('/') or '..' in link_target.replace('\\', '/').split('/'):
+            raise ValueError(f"Refusing to extract unsafe symlink: {target} -> {link_target}")
+        self.symlinks.append((link_target, target))
+
+    def commit(self):
+        for partial, target in self.files:
+            os.replace(partial, target)
+        for link_target, target in self.symlinks:
+            os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+            if os.path.lexists(target):
+                os.remove(target)
+            os.symlink(link_target, target)
+        return [target for _, target in self.files] + [target for _, target in self.symlinks]
+
+    def discard(self):
+        for partial, _ in self.files:
+            if os.path.exists(partial):
+                os.remove(partial)
+
+
+@traced('network', _download_span_name)
+@metrics.phase('download')
+def extract_tar_stream(url, dest_dir, members=None, strip_components=0, timeout=30, sha256=None):
+    """Download a tar archive and extract it in a single streaming pass
+
+    Only members listed in ``members`` (names relative to the archive root after
+    ``strip_components`` leading directories are removed) are written. When
+    ``sha256`` is given the digest is computed as the stream is read and no
+    file is moved into place unless it matches. Returns the extracted paths.
+    """
+    staged = _StagedExtraction()
+    try:
+        with open_stream(url, timeout) as response:
+            reader = DigestReader(response.raw)
+            with tarfile.open(fileobj=reader, mode='r|*') as archive:
+                for info in archive:
+                    relpath = _safe_relpath(info.name, strip_components)
+                    if not relpath or not _is_wanted(relpath, members):
+                        continue
+                    target = os.path.join(dest_dir, relpath)
+                    if info.isdir():
+                        os.makedirs(target, exist_ok=True)
+                    elif info.issym():
+                        staged.add_symlink(info.linkname, target)
+                    elif info.isfile():
+                        staged.add_file(archive.extractfile(info), target, stat.S_IMODE(info.mode))
+            # tarfile stops at the end-of-archive marker; hash the padding too
+            reader.drain()
+            _count_download(url, reader.bytes_read)
+        if sha256:
+            verify_digest(reader.hexdigest(), sha256, url)
+    except BaseException:
+        staged.discard()
+        raise
+    return staged.commit()
+
+
+@traced('network', _download_span_name)
+@metrics.phase('download')
+def extract_zip_stream(url, dest_dir, members=None, strip_components=0, timeout=30, sha256=None):
+    """Download a zip archive into a spooled buffer and extract the wanted members
+
+    The digest is computed while spooling, so a bad archive is rejected before
+    anything is extracted. Unix permission bits stored in the archive are
+    preserved, unlike ``ZipFile.extractall``. Returns the extracted paths.
+    """
+    staged = _StagedExtraction()
+    with open_stream(url, timeout) as response, \
+            tempfile.SpooledTemporaryFile(max_size=ZIP_SPOOL_LIMIT) as spool:
+        digest = DigestReader(None)
+        for chunk in response.iter_content(CHUNK_SIZE):
+            digest.update(chunk)
+            spool.write(chunk)
+        _count_download(url, digest.bytes_read)
+        if sha256:
+            verify_digest(digest.hexdigest(), sha256, url)
+        spool.seek(0)
+
+        try:
+            with zipfile.ZipFile(spool) as archive:
+                for info in archive.infolist():
+                    relpath = _safe_relpath(info.filename, strip_components)
+                    if not relpath or not _is_wanted(relpath, members):
+                        continue
+                    target = os.path.join(dest_dir, relpath)
+                    mode = info.external_attr >> 16
+                    if info.is_dir():
+                        os.makedirs(target, exist_ok=True)
+                    elif stat.S_ISLNK(mode):
+                        staged.add_symlink(archive.read(info).decode('utf-8'), target)
+                    else:
+                        with archive.open(info) as source:
+                            staged.add_file(source, target, stat.S_IMODE(mode))
+        except BaseException:
+            staged.discard()
+            raise
+    return staged.commit()
+
+
+@traced('network', _download_span_name)
+@metrics.phase('download')
+def download_file(url, dest_path, timeout=30, sha256=None):
+    """Stream url to dest_path, verifying the digest before it is moved into place"""
+    os.makedirs(os.path.dirname(dest_path) or '.', exist_ok=True)
+    partial = dest_path + '.part'
+    try:
+        with open_stream(url, timeout) as response, open(partial, 'wb') as out:
+            digest = DigestReader(None)
+            for chunk in response.iter_content(CHUNK_SIZE):
+                digest.update(chunk)
+                out.write(chunk)
+        _count_download(url, digest.bytes_read)
+        if sha256:
+            verify_digest(digest.hexdigest(), sha256, url)
+    except BaseException:
+        if os.path.exists(partial):
+            os.remove(partial)
+        raise
+    os.replace(partial, dest_path)
+    return dest_path
+
+
+def install_executable_from_archive(url, member, dest_dir, archive_type='zip', strip_components=0, sha256=None):
+    """Extract a single executable from a remote archive into dest_dir
+
+    The member is extracted straight into dest_dir when it is writable. For
+    system directories like /usr/local/bin only the extracted binary is staged
+    and then moved into place with sudo.
+    """
+    extract = extract_zip_stream if archive_type == 'zip' else extract_tar_stream
+    name = os.path.basename(member)
+
+    if os.access(dest_dir, os.W_OK):
+        extract(url, dest_dir, members=[member], strip_components=strip_components, sha256=sha256)
+        target = os.path.join(dest_dir, member)
+        if target != os.path.join(dest_dir, name):
+            os.replace(target, os.path.join(dest_dir, name))
+        os.chmod(os.path.join(dest_dir, name), 0o755)
+        return os.path.join(dest_dir, name)
+
+    staging = tempfile.mkdtemp(prefix='devops-cli-')
+    try:
+        extract(url, staging, members=[member], strip_components=strip_components, sha256=sha256)
+        process.run([
+            'sudo', 'install', '-m', '0755', os.path.join(staging, member), os.path.join(dest_dir, name)
+        ], check=True, timeout=60)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    return os.path.join(dest_dir, name)
@@ -13,6 +13,7 @@ import time
 import platform
 from typing import List, Optional, Dict, Any
 import logging
+from utils import rewrite_url
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
@@ -47,7 +48,7 @@ class VersionManager:
         """Fetch URL with retry logic"""
         for attempt in range(max_retries):
             try:
-                response = self.session.get(url, timeout=timeout)
+                response = self.session.get(rewrite_url(url), timeout=timeout)
                 response.raise_for_status()
                 return response
             except requests.exceptions.RequestException as e:
@@ -0,0 +1,181 @@
+"""
+Fleet Provisioning for DevOps CLI
+Runs the same devops-cli command on many hosts over SSH with bounded
+parallelism, multiplexed live output (see output.py) and an aggregated summary
+"""
+
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from output import LiveOutput
+from process import relay_output
+
+DEFAULT_CONCURRENCY = 10
+DEFAULT_HOST_TIMEOUT = 1800  # 30 minutes per host
+
+
+class FleetHost:
+    """One inventory entry: [user@]host[:port]"""
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.user = None
+        self.port = None
+        target = spec
+        if '@' in target:
+            self.user, target = target.split('@', 1)
+        if target.count(':') == 1:
+            target, port = target.split(':')
+            self.port = int(port)
+        self.hostname = target
+
+    @property
+    def label(self):
+        return self.spec
+
+    def ssh_command(self, remote_command, ssh_options=None):
+        command = ['ssh', '-o', 'BatchMode=yes', '-o', 'ConnectTimeout=15']
+        for option in ssh_options or []:
+            command += ['-o', option]
+        if self.port:
+            command += ['-p', str(self.port)]
+        destination = f"{self.user}@{self.hostname}" if self.user else self.hostname
+        return command + [destination, remote_command]
+
+
+class HostResult:
+    """Outcome of running the fleet command on one host"""
+
+    def __init__(self, host):
+        self.host = host
+        self.returncode = None
+        self.status = 'pending'
+        self.duration = 0.0
+        self.last_line = ''
+
+
+def load_inventory(path):
+    """Read an inventory file: one [user@]host[:port] per line, '#' comments allowed"""
+    hosts = []
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.split('#', 1)[0].strip()
+            if line:
+                hosts.append(FleetHost(line))
+    return hosts
+
+
+def _kill(process):
+    """Kill the ssh client and anything it spawned locally"""
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError, AttributeError):
+        process.kill()
+
+
+def run_on_host(host, remote_command, timeout, ssh_options, live):
+    """Run remote_command on host, streaming its output to live (an output.LiveOutput) as it arrives"""
+    result = HostResult(host)
+    live.start_job(host.label)
+    start = time.time()
+    try:
+        process = subprocess.Popen(
+            host.ssh_command(remote_command, ssh_options),
+            stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+            start_new_session=(os.name == 'posix')
+        )
+    except FileNotFoundError:
+        result.status = 'error'
+        result.last_line = 'ssh client not found'
+        live.finish_job(host.label, False, result.last_line)
+        return result
+
+    timed_out = threading.Event()
+
+    def on_timeout():
+        timed_out.set()
+        _kill(process)
+
+    timer = threading.Timer(timeout, on_timeout)
+    timer.daemon = True
+    timer.start()
+    reader = relay_output(process, host.label, live)
+    try:
+        result.returncode = process.wait()
+        reader(timeout=5)  # a backgrounded remote child may hold the pipes open
+    finally:
+        timer.cancel()
+        process.stdout.close()
+        process.stderr.close()
+
+    result.duration = time.time() - start
+    result.last_line = live.job(host.label).last_line
+    if timed_out.is_set():
+        result.status = 'timeout'
+        result.last_line = f"timed out after {timeout}s"
+    elif result.returncode == 0:
+        result.status = 'ok'
+    elif result.returncode == 255:
+        result.status = 'unreachable'
+    else:
+        result.status = 'failed'
+    live.finish_job(host.label, result.status == 'ok', None if result.status == 'ok' else result.status)
+    return result
+
+
+def print_summary(results, wall_time):
+    """Print the per-host timing table and overall totals"""
+    width = max([len(r.host.label) for r in results] + [4])
+    print()
+    print("Fleet Summary:")
+    print("=" * (width + 40))
+    print(f"{'HOST':<{width}}  {'STATUS':<12} {'EXIT':>4}  {'TIME':>8}")
+    for result in sorted(results, key=lambda r: r.duration, reverse=True):
+        exit_code = '-' if result.returncode is None else str(result.returncode)
+        print(f"{result.host.label:<{width}}  {result.status:<12} {exit_code:>4}  {result.duration:>7.1f}s")
+
+    counts = {}
+    for result in results:
+        counts[result.status] = counts.get(result.status, 0) + 1
+    durations = sorted(r.duration for r in results)
+    print("-" * (width + 40))
+    print("Totals: " + ", ".join(f"{status}={count}" for status, count in sorted(counts.items())))
+    if durations:
+        print(f"Wall time: {wall_time:.1f}s  (slowest host {durations[-1]:.1f}s, "
+              f"median {durations[len(durations) // 2]:.1f}s, serial sum {sum(durations):.1f}s)")
+
+    failed = [r for r in results if r.status != 'ok']
+    for result in failed:
+        print(f"❌ {result.host.label}: {result.status} - {result.last_line}")
+
+
+def run_fleet(inventory_path, command_args, concurrency=DEFAULT_CONCURRENCY,
+              timeout=DEFAULT_HOST_TIMEOUT, ssh_options=None, remote_cli='devops-cli'):
+    """Run 'devops-cli <command_args>' on every inventory host; returns True if all succeeded"""
+    try:
+        hosts = load_inventory(inventory_path)
+    except (OSError, ValueError) as e:
+        print(f"❌ Could not read inventory {inventory_path}: {e}")
+        return False
+    if not hosts:
+        print(f"❌ No hosts found in {inventory_path}")
+        return False
+
+    remote_command = ' '.join([remote_cli] + [shlex.quote(arg) for arg in command_args])
+    print(f"🚀 Running '{remote_command}' on {len(hosts)} host(s), {concurrency} at a time...")
+
+    start = time.time()
+    with LiveOutput(sys.stdout, [h.label for h in hosts]) as live, \
+            ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        results = list(pool.map(
+            lambda host: run_on_host(host, remote_command, timeout, ssh_options, live), hosts
+        ))
+
+    print_summary(results, time.time() - start)
+    return all(r.status == 'ok' for r in results)
@@ -0,0 +1,308 @@
+"""
+Garbage Collection for DevOps CLI
+Reclaims space from the versioned store, the metadata caches, the download
+directory and installer leftovers within size and age budgets, never touching
+active, previous (rollback) or pinned versions
+"""
+
+import fnmatch
+import os
+import re
+import shutil
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from utils import get_cache_dir, get_data_dir
+from dedup import format_bytes
+from detection import newest_first
+import pins
+import store
+
+STALE_AFTER = 3600  # seconds before an unfinished staging or trash directory counts as abandoned
+LOCK_FILE_NAME = 'gc.lock'
+
+# What older releases and the package-manager routes leave in the working directory
+CWD_LEFTOVERS = ('awscliv2.zip', 'get_helm.sh', 'prometheus-*.tar.gz', 'prometheus.zip')
+# Extracted Prometheus releases: working installs (detection runs the newest),
+# so they only go when the age or size budget says so
+CWD_PROMETHEUS_DIRS = 'prometheus-*'
+
+VERSION = 'version'
+PARTIAL = 'partial'
+CACHE = 'cache'
+DOWNLOAD = 'download'
+LEFTOVER = 'leftover'
+EXTRACTED = 'extracted'
+
+_SIZE_UNITS = {'': 1, 'k': 1024, 'm': 1024 ** 2, 'g': 1024 ** 3, 't': 1024 ** 4}
+_AGE_UNITS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400, 'w': 7 * 86400, '': 86400}
+
+
+class Item:
+    """One deletable unit: a stored version, a cache file, a leftover download..."""
+
+    def __init__(self, kind, path, last_used, tool=None, version=None):
+        self.kind = kind
+        self.path = path
+        self.last_used = last_used
+        self.tool = tool
+        self.version = version
+        self.size = 0
+        self.inodes = []  # (inode key, size, link count) of every file inside
+        self.protected = None  # why it must be kept
+        self.reason = None  # why it was selected
+
+    @property
+    def label(self):
+        if self.kind == VERSION:
+            return f"{self.tool} {self.version}"
+        home = os.path.expanduser('~')
+        path = '~' + self.path[len(home):] if self.path.startswith(home + os.sep) else self.path
+        return path if len(path) <= 48 else '...' + path[-45:]
+
+
+def parse_size(text):
+    """'500M', '2G', '1.5GB' or plain bytes -> bytes"""
+    match = re.fullmatch(r'\s*([\d.]+)\s*([kmgt]?)i?b?\s*', str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid size: {text!r} (use e.g. 500M or 2G)")
+    return int(float(match.group(1)) * _SIZE_UNITS[match.group(2)])
+
+
+def parse_age(text):
+    """'30d', '12h', '2w' or a plain number of days -> seconds"""
+    match = re.fullmatch(r'\s*([\d.]+)\s*([smhdw]?)\s*', str(text).lower())
+    if not match:
+        raise ValueError(f"Invalid age: {text!r} (use e.g. 30d or 12h)")
+    return float(match.group(1)) * _AGE_UNITS[match.group(2)]
+
+
+def _format_age(seconds):
+    if seconds >= 86400:
+        return f"{seconds / 86400:.0f}d"
+    if seconds >= 3600:
+        return f"{seconds / 3600:.0f}h"
+    if seconds >= 60:
+        return f"{seconds / 60:.0f}m"
+    return f"{seconds:.0f}s"
+
+
+def _measure(item, entry):
+    """Add a directory entry (recursively) to item's size and inode list, one scandir per directory"""
+    info = entry.stat(follow_symlinks=False)
+    if entry.is_dir(follow_symlinks=False):
+        try:
+            with os.scandir(entry.path) as children:
+                for child in children:
+                    _measure(item, child)
+        except OSError:
+            pass
+        return
+    item.size += info.st_size
+    item.inodes.append(((info.st_dev, info.st_ino), info.st_size, info.st_nlink))
+
+
+def _scan_dir(path):
+    try:
+        with os.scandir(path) as entries:
+            return list(entries)
+    except OSError:
+        return []
+
+
+def _entry_item(kind, entry, **details):
+    item = Item(kind, entry.path, entry.stat(follow_symlinks=False).st_mtime, **details)
+    _measure(item, entry)
+    return item
+
+
+def scan(directory=None, include_cwd=False, now=None):
+    """Everything gc could delete, with sizes, last use and protection, in one pass"""
+    now = now or time.time()
+    items = []
+    pinned = pins.pinned_versions(directory)
+
+    for tool_entry in _scan_dir(store.get_store_dir()):
+        if tool_entry.name.startswith('.') or not tool_entry.is_dir(follow_symlinks=False):
+            continue
+        tool_name = tool_entry.name
+        active = store.active_version(tool_name)
+        previous = store.previous_version(tool_name)
+        for entry in _scan_dir(tool_entry.path):
+            if entry.is_symlink() and entry.name.endswith('.tmp') or \
+                    entry.is_dir(follow_symlinks=False) and entry.name.startswith((store.STAGING_PREFIX, store.TRASH_PREFIX)):
+                # An unfinished install, removal or symlink swap
+                item = _entry_item(PARTIAL, entry)
+                if now - item.last_used < STALE_AFTER:
+                    item.protected = 'in progress'
+            elif not entry.is_symlink() and os.path.isfile(os.path.join(entry.path, store.ENTRY_FILE)):
+                item = _entry_item(VERSION, entry, tool=tool_name, version=entry.name)
+                if entry.name == active:
+                    item.protected = 'active'
+                elif entry.name in pinned.get(tool_name, ()):
+                    item.protected = 'pinned'
+                elif entry.name == previous:
+                    item.protected = 'previous'
+            else:
+                continue
+            items.append(item)
+
+    def add_files(kind, path):
+        for entry in _scan_dir(path):
+            if entry.is_dir(follow_symlinks=False):
+                add_files(kind, entry.path)
+            elif entry.is_file(follow_symlinks=False) and not entry.name.endswith('.lock'):
+                items.append(_entry_item(kind, entry))
+
+    add_files(CACHE, get_cache_dir())
+    add_files(DOWNLOAD, get_data_dir('downloads'))
+    if include_cwd:
+        extracted = {}
+        for entry in _scan_dir(directory or os.getcwd()):
+            if entry.is_dir(follow_symlinks=False) and fnmatch.fnmatch(entry.name, CWD_PROMETHEUS_DIRS):
+                extracted[entry.path] = _entry_item(EXTRACTED, entry)
+            elif any(fnmatch.fnmatch(entry.name, pattern) for pattern in CWD_LEFTOVERS):
+                items.append(_entry_item(LEFTOVER, entry))
+        # The one detection picks (newest release that runs) is in use
+        for path in newest_first(extracted):
+            if os.access(os.path.join(path, 'prometheus'), os.X_OK):
+                extracted[path].protected = 'active'
+                break
+        items.extend(extracted.values())
+    return items
+
+
+class Usage:
+    """Bytes on disk for a set of items, counting hardlinked files once"""
+
+    def __init__(self, items=()):
+        self.links = {}  # inode key -> links to it among the items
+        self.sizes = {}
+        self.nlinks = {}
+        self.bytes = 0
+        for item in items:
+            self.add(item)
+
+    def add(self, item):
+        for key, size, nlink in item.inodes:
+            if not self.links.get(key):
+                self.bytes += size
+            self.links[key] = self.links.get(key, 0) + 1
+            self.sizes[key] = size
+            self.nlinks[key] = nlink
+
+    def remove(self, item):
+        for key, size, _ in item.inodes:
+            self.links[key] -= 1
+            if not self.links[key]:
+                self.bytes -= size
+
+    def freed(self):
+        """Bytes released if every item added here were deleted (a file still linked elsewhere is not)"""
+        return sum(self.sizes[key] for key, count in self.links.items() if count >= self.nlinks[key])
+
+
+def select(items, max_size=None, max_age=None, now=None):
+    """Pick what to delete: abandoned partial work and downloads always, then whatever the budgets need"""
+    now = now or time.time()
+    selected = []
+    for item in items:
+        if item.protected:
+            continue
+        if item.kind in (PARTIAL, LEFTOVER) or (item.kind == DOWNLOAD and now - item.last_used >= STALE_AFTER):
+            item.reason = 'installer leftover' if item.kind == LEFTOVER else 'abandoned'
+        elif max_age is not None and now - item.last_used > max_age:
+            item.reason = f"unused {_format_age(now - item.last_used)}"
+        else:
+            continue
+        selected.append(item)
+
+    if max_size is not None:
+        # Least recently used first until what is left fits the budget
+        chosen = set(map(id, selected))
+        remaining = [item for item in items if id(item) not in chosen]
+        usage = Usage(remaining)
+        for item in sorted((i for i in remaining if not i.protected), key=lambda i: i.last_used):
+            if usage.bytes <= max_size:
+                break
+            usage.remove(item)
+            item.reason = f"over {format_bytes(max_size)} budget"
+            selected.append(item)
+    return selected
+
+
+def _take_lock():
+    """Only one gc at a time; returns the held fd, or None if another gc is running"""
+    path = get_data_dir(LOCK_FILE_NAME)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+    if fcntl is not None:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return None
+    return fd
+
+
+def delete(item):
+    """Delete one item; stored versions go through the store so activation races are caught"""
+    if item.kind == VERSION:
+        store.remove_version(item.tool, item.version)
+    elif os.path.isdir(item.path) and not os.path.islink(item.path):
+        trash = os.path.join(os.path.dirname(item.path), f"{store.TRASH_PREFIX}gc-{os.getpid()}-{os.path.basename(item.path)}")
+        os.rename(item.path, trash)
+        shutil.rmtree(trash, ignore_errors=True)
+    else:
+        os.remove(item.path)
+
+
+def print_report(items, selected, now):
+    print(f"{'KIND':<9} {'ITEM':<48} {'SIZE':>9} {'IDLE':>5}  REASON")
+    for item in sorted(selected, key=lambda i: (i.kind, i.label)):
+        print(f"{item.kind:<9} {item.label:<48} {format_bytes(item.size):>9} "
+              f"{_format_age(now - item.last_used):>5}  {item.reason}")
+    kept = [item for item in items if item.protected and item.kind in (VERSION, EXTRACTED)]
+    for item in kept:
+        print(f"{'kept':<9} {item.label:<48} {format_bytes(item.size):>9} "
+              f"{_format_age(now - item.last_used):>5}  {item.protected}")
+
+
+def collect(max_size=None, max_age=None, dry_run=False, include_cwd=False, directory=None):
+    """'devops-cli gc': report, and unless dry_run delete, what the budgets allow; returns True on success"""
+    now = time.time()
+    fd = None
+    if not dry_run:
+        fd = _take_lock()
+        if fd is None:
+            print("⏳ Another devops-cli gc is running; skipping")
+            return True
+    try:
+        items = scan(directory, include_cwd, now)
+        selected = select(items, max_size, max_age, now)
+        total = Usage(items).bytes
+        print_report(items, selected, now)
+        if dry_run:
+            print(f"🧹 {len(selected)} item(s), {format_bytes(Usage(selected).freed())} reclaimable "
+                  f"of {format_bytes(total)} managed (dry run, nothing deleted)")
+            return True
+
+        removed = Usage()
+        failed = 0
+        for item in selected:
+            try:
+                delete(item)
+                removed.add(item)
+            except (OSError, store.StoreError) as e:
+                failed += 1
+                print(f"⚠️  Kept {item.label}: {e}")
+        print(f"🧹 Removed {len(selected) - failed} item(s), freed {format_bytes(removed.freed())} "
+              f"of {format_bytes(total)} managed")
+        return failed == 0
+    finally:
+        if fd is not None:
+            os.close(fd)
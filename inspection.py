@@ -0,0 +1,195 @@
+"""
+Static Version Inspection for DevOps CLI
+Reads tool versions from binaries and install trees without executing them
+"""
+
+import mmap
+import os
+import re
+import struct
+import zipfile
+
+GO_BUILDINFO_MAGIC = b'\xff Go buildinf:'
+GO_BUILDINFO_SECTION = b'.go.buildinfo'
+
+# Jenkins WARs that package-manager installs put next to their wrapper scripts
+JENKINS_WARS = [
+    '/usr/share/java/jenkins.war',
+    '/usr/share/jenkins/jenkins.war',
+    '/usr/lib/jenkins/jenkins.war',
+]
+
+# Go tools: main package path prefix that identifies the binary, and the
+# -X linker variables their release builds stamp the version into
+GO_TOOLS = {
+    'kubectl': {
+        'path': ('k8s.io/kubernetes/cmd/kubectl', 'k8s.io/kubectl'),
+        'ldflags': ('k8s.io/client-go/pkg/version.gitVersion', 'k8s.io/component-base/version.gitVersion'),
+    },
+    'helm': {
+        'path': ('helm.sh/helm/',),
+        'ldflags': ('helm.sh/helm/v3/internal/version.version',),
+    },
+    'terraform': {
+        'path': ('github.com/hashicorp/terraform',),
+        'ldflags': ('github.com/hashicorp/terraform/version.Version',),
+    },
+    'prometheus': {
+        'path': ('github.com/prometheus/prometheus/cmd/prometheus',),
+        'ldflags': ('github.com/prometheus/common/version.Version',),
+    },
+}
+
+VERSION_PATTERN = re.compile(r'^v?(\d+\.\d+(?:\.\d+)?)')
+LDFLAG_PATTERN = re.compile(r"-X[= ]'?\"?([\w./-]+)=([^\s'\"]+)")
+
+
+def _clean_version(value):
+    match = VERSION_PATTERN.match(value or '')
+    return match.group(1) if match else None
+
+
+def read_war_version(war_path):
+    """Read Jenkins-Version from a WAR's META-INF/MANIFEST.MF"""
+    try:
+        with zipfile.ZipFile(war_path) as war:
+            manifest = war.read('META-INF/MANIFEST.MF').decode('utf-8', 'replace')
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+    for line in manifest.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip() == 'Jenkins-Version':
+            return _clean_version(value.strip())
+    return None
+
+
+def _elf_section_offset(data, name):
+    """Return the file offset of a named section in an ELF image, or None"""
+    if data[:4] != b'\x7fELF':
+        return None
+    is_64 = data[4] == 2
+    endian = '<' if data[5] == 1 else '>'
+    if is_64:
+        shoff, = struct.unpack_from(endian + 'Q', data, 0x28)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + 'HHH', data, 0x3A)
+        section_format, offset_index = endian + 'IIQQQQIIQQ', 4
+    else:
+        shoff, = struct.unpack_from(endian + 'I', data, 0x20)
+        shentsize, shnum, shstrndx = struct.unpack_from(endian + 'HHH', data, 0x2E)
+        section_format, offset_index = endian + 'IIIIIIIIII', 4
+    if not shoff or shstrndx >= shnum:
+        return None
+
+    sections = [struct.unpack_from(section_format, data, shoff + i * shentsize) for i in range(shnum)]
+    names_offset = sections[shstrndx][offset_index]
+    for section in sections:
+        start = names_offset + section[0]
+        if data[start:start + len(name) + 1] == name + b'\x00':
+            return section[offset_index]
+    return None
+
+
+def _read_uvarint(data, offset):
+    value = shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_go_buildinfo(binary_path):
+    """Return (go_version, modinfo) embedded in a Go binary, or None
+
+    Uses the ELF .go.buildinfo section when present and otherwise scans for
+    the buildinfo header (Mach-O/PE). Only the inline format written by Go
+    1.18+ is understood; older binaries return None.
+    """
+    try:
+        with open(binary_path, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                offset = _elf_section_offset(data, GO_BUILDINFO_SECTION)
+                if offset is None or data[offset:offset + 14] != GO_BUILDINFO_MAGIC:
+                    offset = data.find(GO_BUILDINFO_MAGIC)
+                if offset < 0 or not data[offset + 15] & 0x2:
+                    return None
+                strings, position = [], offset + 32
+                for _ in range(2):
+                    length, position = _read_uvarint(data, position)
+                    strings.append(data[position:position + length].decode('utf-8', 'replace'))
+                    position += length
+    except (OSError, ValueError, IndexError, struct.error):
+        return None
+
+    go_version, modinfo = strings
+    # modinfo is wrapped in 16-byte sentinels
+    if len(modinfo) >= 33 and modinfo[-17] == '\n':
+        modinfo = modinfo[16:-16]
+    return go_version, modinfo
+
+
+def read_go_tool_version(tool_name, binary_path):
+    """Version of a Go tool from its buildinfo, if the binary really is that tool"""
+    spec = GO_TOOLS.get(tool_name)
+    buildinfo = read_go_buildinfo(binary_path) if spec else None
+    if not buildinfo:
+        return None
+
+    main_path = main_version = None
+    ldflags = ''
+    for line in buildinfo[1].splitlines():
+        fields = line.split('\t')
+        if fields[0] == 'path' and len(fields) > 1:
+            main_path = fields[1]
+        elif fields[0] == 'mod' and len(fields) > 2:
+            main_version = fields[2]
+        elif fields[0] == 'build' and len(fields) > 1 and fields[1].startswith('-ldflags='):
+            ldflags = fields[1]
+    # Wrappers such as /snap/bin/* resolve to other Go programs
+    if not main_path or not main_path.startswith(spec['path']):
+        return None
+
+    stamped = dict(LDFLAG_PATTERN.findall(ldflags))
+    for variable in spec['ldflags']:
+        if _clean_version(stamped.get(variable)):
+            return _clean_version(stamped[variable])
+    return _clean_version(main_version)
+
+
+def read_awscli_version(binary_path):
+    """AWS CLI v2 installs into /usr/local/aws-cli/v2/<version>/"""
+    parts = os.path.realpath(binary_path).split(os.sep)
+    for index, part in enumerate(parts[:-1]):
+        if part == 'v2' and index > 0 and parts[index - 1] == 'aws-cli':
+            return _clean_version(parts[index + 1])
+    return None
+
+
+def read_gcloud_version(binary_path):
+    """The Cloud SDK keeps its release number in google-cloud-sdk/VERSION"""
+    sdk_root = os.path.dirname(os.path.dirname(os.path.realpath(binary_path)))
+    try:
+        with open(os.path.join(sdk_root, 'VERSION'), 'r', encoding='utf-8') as f:
+            return _clean_version(f.read().strip())
+    except OSError:
+        return None
+
+
+def read_static_version(tool_name, binary_path):
+    """Read a tool's version without executing it; None means the tool must be run"""
+    if tool_name == 'jenkins':
+        if binary_path.endswith('.war'):
+            return read_war_version(binary_path)
+        for war_path in JENKINS_WARS:
+            if os.path.isfile(war_path):
+                return read_war_version(war_path)
+        return None
+    if tool_name == 'awscli':
+        return read_awscli_version(binary_path)
+    if tool_name == 'gcloud':
+        return read_gcloud_version(binary_path)
+    if tool_name in GO_TOOLS:
+        return read_go_tool_version(tool_name, os.path.realpath(binary_path))
+    return None
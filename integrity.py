@@ -0,0 +1,160 @@
+"""
+Integrity Verification for DevOps CLI
+Fetches upstream checksum manifests and verifies downloads while they stream
+"""
+
+import hashlib
+import os
+import threading
+import requests
+from utils import get_cache_dir, get_http_session, rewrite_url
+from mirror import get_active_mirror, MirrorMiss
+from tracing import span
+import metrics
+
+# Upstream checksum manifests. '{artifact_url}' manifests sit next to the
+# artifact; the others list every artifact of a release.
+CHECKSUM_MANIFESTS = {
+    'terraform': 'https://releases.hashicorp.com/terraform/{version}/terraform_{version}_SHA256SUMS',
+    'prometheus': 'https://github.com/prometheus/prometheus/releases/download/v{version}/sha256sums.txt',
+    'helm': '{artifact_url}.sha256sum',
+    'kubectl': '{artifact_url}.sha256',
+}
+
+_manifest_cache = {}
+_manifest_lock = threading.Lock()
+
+
+class IntegrityError(Exception):
+    """Raised when a download cannot be verified against its upstream checksum"""
+
+
+class DigestReader:
+    """File-like wrapper that hashes everything read through it"""
+
+    def __init__(self, raw, algorithm='sha256'):
+        self._raw = raw
+        self._digest = hashlib.new(algorithm)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        data = self._raw.read(size)
+        self._digest.update(data)
+        self.bytes_read += len(data)
+        return data
+
+    def update(self, data):
+        """Hash bytes that were consumed from the stream by other means"""
+        self._digest.update(data)
+        self.bytes_read += len(data)
+
+    def drain(self, chunk_size=64 * 1024):
+        """Consume (and hash) whatever is left of the stream"""
+        while self.read(chunk_size):
+            pass
+
+    def hexdigest(self):
+        return self._digest.hexdigest()
+
+
+def verify_digest(actual, expected, name):
+    """Fail closed unless actual matches the expected hex digest"""
+    if actual.lower() != expected.lower():
+        metrics.record_failure('checksum_mismatch')
+        raise IntegrityError(f"Checksum mismatch for {name}: expected {expected}, got {actual}")
+
+
+def parse_manifest(text):
+    """Parse a sha256sum-style manifest into {filename: digest}
+
+    Single-digest files (like dl.k8s.io's kubectl.sha256) are stored under
+    the empty filename.
+    """
+    entries = {}
+    for line in text.splitlines():
+        fields = line.strip().split()
+        if not fields:
+            continue
+        digest = fields[0].lower()
+        filename = fields[1].lstrip('*') if len(fields) > 1 else ''
+        entries[os.path.basename(filename)] = digest
+    return entries
+
+
+def _manifest_cache_path(manifest_url):
+    key = hashlib.sha256(manifest_url.encode('utf-8')).hexdigest()[:16]
+    return os.path.join(get_cache_dir('checksums'), f"{key}-{manifest_url.rsplit('/', 1)[-1]}")
+
+
+def load_manifest_text(manifest_url, timeout=30):
+    """Return the raw text of a checksum manifest, caching it on disk
+
+    Release manifests never change once published, so a cached copy is
+    reused without revalidation. With an offline mirror active the bundled
+    copy is used and the network is never touched.
+    """
+    mirror = get_active_mirror()
+    if mirror is not None:
+        try:
+            return mirror.read_text(manifest_url)
+        except MirrorMiss as e:
+            raise IntegrityError(str(e))
+
+    cache_path = _manifest_cache_path(manifest_url)
+    if os.path.exists(cache_path):
+        metrics.inc('devops_cli_cache_requests_total', cache='checksums', result='hit')
+        with open(cache_path, 'r', encoding='utf-8') as f:
+            return f.read()
+    metrics.inc('devops_cli_cache_requests_total', cache='checksums', result='miss')
+
+    try:
+        with span(f"GET {manifest_url.rsplit('/', 1)[-1]}", 'network', url=manifest_url), \
+                metrics.timer('devops_cli_metadata_fetch_duration_seconds', source=metrics.source_of(manifest_url)):
+            response = get_http_session().get(rewrite_url(manifest_url), timeout=timeout)
+            response.raise_for_status()
+    except requests.exceptions.RequestException as e:
+        metrics.record_failure('checksum_manifest_unavailable')
+        raise IntegrityError(f"Could not fetch checksum manifest {manifest_url}: {e}")
+    partial = f"{cache_path}.{os.getpid()}.part"
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write(response.text)
+    os.replace(partial, cache_path)
+    return response.text
+
+
+def load_manifest(manifest_url, timeout=30):
+    """Fetch and parse a checksum manifest, memoising the parsed entries"""
+    with _manifest_lock:
+        if manifest_url in _manifest_cache:
+            return _manifest_cache[manifest_url]
+
+    entries = parse_manifest(load_manifest_text(manifest_url, timeout))
+    with _manifest_lock:
+        _manifest_cache[manifest_url] = entries
+    return entries
+
+
+def get_manifest_url(tool_name, version, artifact_url):
+    """Return the checksum manifest URL for an artifact, or None if upstream has none"""
+    template = CHECKSUM_MANIFESTS.get(tool_name)
+    if not template:
+        return None
+    return template.format(version=version, artifact_url=artifact_url)
+
+
+def get_expected_sha256(tool_name, version, artifact_url):
+    """Return the published SHA-256 for an artifact, or None if the tool has no manifest
+
+    Raises IntegrityError when a manifest exists but cannot be fetched or does
+    not list the artifact, so callers never fall back to an unverified install.
+    """
+    manifest_url = get_manifest_url(tool_name, version, artifact_url)
+    if not manifest_url:
+        return None
+
+    entries = load_manifest(manifest_url)
+    filename = artifact_url.rsplit('/', 1)[-1]
+    digest = entries.get(filename) or entries.get('')
+    if not digest:
+        raise IntegrityError(f"No checksum for {filename} in {manifest_url}")
+    return digest
@@ -0,0 +1,214 @@
+"""
+Package Manager Locking for DevOps CLI
+Serialises package-manager transactions across threads and across concurrent
+devops-cli processes, and waits (for a bounded time) while apt, dpkg, yum or
+rpm started elsewhere, e.g. by unattended-upgrades, still hold their locks
+"""
+
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_LOCK_TIMEOUT = 600  # seconds
+POLL_INTERVAL = 0.5
+LOCK_FILE_NAME = 'devops-cli-package-manager.lock'
+
+# Locks taken by dpkg/apt and rpm themselves (fcntl record locks)
+FOREIGN_LOCK_FILES = (
+    '/var/lib/dpkg/lock-frontend',
+    '/var/lib/dpkg/lock',
+    '/var/lib/apt/lists/lock',
+    '/var/cache/apt/archives/lock',
+    '/var/lib/rpm/.rpm.lock',
+)
+# yum only leaves a pid file behind while it runs
+FOREIGN_PID_FILES = ('/var/run/yum.pid',)
+
+_timeout = None
+
+
+class PackageManagerBusy(subprocess.SubprocessError):
+    """Raised when the package manager stayed locked by someone else for the whole timeout"""
+
+    def __init__(self, message, holder=None):
+        super().__init__(message)
+        self.holder = holder
+
+
+def set_timeout(seconds):
+    """Override how long to wait for the package manager (default: DEVOPS_CLI_LOCK_TIMEOUT or 600s)"""
+    global _timeout
+    _timeout = seconds
+
+
+def get_timeout():
+    if _timeout is not None:
+        return _timeout
+    try:
+        return float(os.environ.get('DEVOPS_CLI_LOCK_TIMEOUT', DEFAULT_LOCK_TIMEOUT))
+    except ValueError:
+        return DEFAULT_LOCK_TIMEOUT
+
+
+def get_lock_path():
+    """Lock file shared by every devops-cli process on the host, whichever user runs it"""
+    return os.path.join(os.environ.get('DEVOPS_CLI_LOCK_DIR') or tempfile.gettempdir(), LOCK_FILE_NAME)
+
+
+def lock_holders(path):
+    """Pids of other processes holding a lock on path, from /proc/locks (Linux only)"""
+    try:
+        info = os.stat(path)
+        with open('/proc/locks', 'r') as f:
+            lines = f.readlines()
+    except OSError:
+        return []
+    target = f"{os.major(info.st_dev):02x}:{os.minor(info.st_dev):02x}:{info.st_ino}"
+    holders = []
+    for line in lines:
+        fields = line.split()
+        # "1: POSIX  ADVISORY  WRITE 1234 08:01:1312 0 EOF"; blocked waiters are marked "->"
+        if '->' in fields or len(fields) < 6 or fields[5] != target:
+            continue
+        try:
+            pid = int(fields[4])
+        except ValueError:
+            continue
+        if pid > 0 and pid != os.getpid() and pid not in holders:
+            holders.append(pid)
+    return holders
+
+
+def process_name(pid):
+    try:
+        with open(f'/proc/{pid}/comm', 'r') as f:
+            return f.read().strip()
+    except OSError:
+        return 'unknown'
+
+
+def _pid_file_holder(path):
+    try:
+        with open(path, 'r') as f:
+            pid = int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+    try:
+        os.kill(pid, 0)
+    except PermissionError:
+        pass  # alive, owned by root
+    except OSError:
+        return None  # stale pid file
+    return pid
+
+
+def foreign_holder():
+    """(lock path, pid) of a package manager run by someone else, or None"""
+    for path in FOREIGN_LOCK_FILES:
+        if os.path.exists(path):
+            for pid in lock_holders(path):
+                return path, pid
+    for path in FOREIGN_PID_FILES:
+        pid = _pid_file_holder(path)
+        if pid is not None and pid != os.getpid():
+            return path, pid
+    return None
+
+
+def _wait(check, describe, timeout):
+    """Poll check() until it returns None; print once while waiting and raise on timeout"""
+    deadline = time.time() + timeout
+    announced = False
+    while True:
+        holder = check()
+        if holder is None:
+            return
+        if time.time() >= deadline:
+            raise PackageManagerBusy(f"Package manager still busy after {timeout:.0f}s: {describe(holder)}", holder)
+        if not announced:
+            print(f"⏳ Waiting for {describe(holder)}...")
+            announced = True
+        time.sleep(POLL_INTERVAL)
+
+
+def wait_for_foreign_locks(timeout=None):
+    """Block while apt/dpkg/yum/rpm processes outside devops-cli hold their locks"""
+    _wait(foreign_holder,
+          lambda holder: f"{process_name(holder[1])} (pid {holder[1]}) to release {holder[0]}",
+          get_timeout() if timeout is None else timeout)
+
+
+class PackageManagerLock:
+    """Reentrant lock for package-manager work, shared with other devops-cli processes
+
+    Threads queue on an RLock; the first acquisition in the process also
+    takes an exclusive flock on a host-wide lock file, released when the
+    outermost holder releases.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._fd = None
+
+    def acquire(self, timeout=None):
+        self._lock.acquire()
+        if self._depth == 0 and fcntl is not None:
+            try:
+                self._fd = self._flock(get_timeout() if timeout is None else timeout)
+            except BaseException:
+                self._lock.release()
+                raise
+        self._depth += 1
+        return True
+
+    def release(self):
+        self._depth -= 1
+        if self._depth == 0 and self._fd is not None:
+            os.close(self._fd)  # drops the flock
+            self._fd = None
+        self._lock.release()
+
+    def __enter__(self):
+        return self.acquire()
+
+    def __exit__(self, *exc_info):
+        self.release()
+
+    def _flock(self, timeout):
+        path = get_lock_path()
+        try:
+            fd = os.open(path, os.O_RDONLY | os.O_CREAT, 0o666)
+        except OSError:
+            return None  # unwritable lock directory: only threads are serialised
+        try:
+            os.fchmod(fd, 0o666)  # let other users' runs open it too
+        except OSError:
+            pass
+
+        def check():
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                return None
+            except BlockingIOError:
+                holders = lock_holders(path)
+                return path, holders[0] if holders else None
+
+        try:
+            _wait(check, lambda holder: f"another devops-cli run (pid {holder[1] or '?'}) to finish "
+                                        f"with the package manager", timeout)
+        except BaseException:
+            os.close(fd)
+            raise
+        return fd
+
+
+# The one lock every package-manager command and step in this process goes through
+package_manager_lock = PackageManagerLock()
@@ -1,16 +1,37 @@
 import argparse
+import json
 import os
 import platform
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from versioning import (
     get_docker_versions, get_kubectl_versions, get_awscli_versions,
     get_gcloud_versions, get_az_versions, get_jenkins_versions,
-    get_helm_versions, get_prometheus_versions, get_terraform_versions
+    get_helm_versions, get_prometheus_versions, get_terraform_versions,
+    resolve_version, get_cached_latest_version
 )
+from utils import get_os, get_linux_distro
+from detection import ALL_TOOLS, DEFAULT_PROBE_TIMEOUT, DEFAULT_DEADLINE, probe_tools
 
 from tools import docker, kubectl, awscli, gcloud, az, jenkins, helm, prometheus, terraform
 from dependencies import dependency_manager
+from bundle import create_bundle, BUNDLE_TOOLS
+from manifest import DEFAULT_MANIFEST, ManifestError, write_lockfile, build_plan, print_plan, apply_plan
+from fleet import run_fleet, DEFAULT_CONCURRENCY, DEFAULT_HOST_TIMEOUT
+from updates import update_tools
 import interactive
+import locks
+import strategies
+import metrics
+import mirror
+import pins
+import store
+import daemon
+import dedup
+import garbage
+import process
+import tracing
 
 # Application version
 __version__ = "1.0.0"
@@ -39,11 +60,27 @@ COMMANDS:
     install <tool>          Install a specific tool with automatic dependency management
     uninstall <tool>        Uninstall a tool
     update <tool>           Update a tool to latest version
+    use <tool> [version]    Switch a binary-installed tool to another stored version (--previous to roll back)
+    pin [<tool> <version>]  Pin a tool version for this directory in .tool-versions (--install, --shims)
+    dedup                   Share identical files between stored tool versions (--dry-run)
+    gc                      Reclaim space from old tool versions, caches and downloads (--dry-run)
+    daemon                  Keep caches warm so list/versions/status/verify answer in milliseconds
     list                    List all available tools
     versions <tool>         Show available versions for a tool
-    status                  Check installation status of all tools
-    verify                  Verify tool installations and provide troubleshooting steps
+    status [--json]         Show installed and latest versions of all tools
+    verify [--json]         Verify tool installations and provide troubleshooting steps
     deps <tool>             Check and install dependencies for a tool
+    lock                    Resolve devops-cli.json into a lockfile of versions, URLs and hashes
+    plan                    Show what 'apply' would change on this host
+    apply                   Install only the tools that do not match the manifest
+    bundle <tool[@ver]>...  Download tools into an offline bundle for air-gapped installs
+    fleet [opts] <inventory> <cmd>
+                            Run a devops-cli command on many hosts over SSH in parallel
+    --trace <file>          Record a Chrome trace of the run (put before the command)
+    --usage                 Summarise CPU, peak RSS and disk I/O per step (Linux)
+    --usage-json <file>     Export per-command resource usage as JSON
+    --metrics-file <file>   Update a Prometheus textfile-collector .prom file
+    --lock-timeout <secs>   How long to wait for a package manager busy elsewhere
     --version, -v           Show application version
     --help, -h              Show this help message
 
@@ -68,6 +105,18 @@ EXAMPLES:
     devops-cli install kubectl
     devops-cli install awscli --version 2.13.0
 
+    # Declarative setup from devops-cli.json
+    devops-cli lock
+    devops-cli plan
+    devops-cli apply
+
+    # Air-gapped installs
+    devops-cli bundle terraform@1.5.7 kubectl prometheus --platform linux-amd64 -o tools.tar
+    devops-cli install terraform --from-bundle tools.tar
+
+    # Provision many hosts over SSH, 20 at a time
+    devops-cli fleet --concurrency 20 hosts.txt install terraform --version 1.5.7
+
     # Check and install dependencies
     devops-cli deps jenkins
     devops-cli deps docker
@@ -78,8 +127,12 @@ EXAMPLES:
 
     # Check status
     devops-cli status
+    devops-cli status --json --refresh
     devops-cli versions docker
 
+    # Find the slow step of an install (open trace.json in Perfetto)
+    devops-cli --trace trace.json install docker
+
     # Uninstall tools
     devops-cli uninstall docker
 
@@ -124,6 +177,14 @@ def list_tools():
     print("\nUse 'devops-cli install <tool>' to install a tool")
     print("Use 'devops-cli versions <tool>' to see available versions")
 
+def deduplicate_store(dry_run=False):
+    """Share identical files between stored tool versions and report the bytes saved"""
+    stats = store.dedup_store(dry_run)
+    verb = "would save" if dry_run else "saved"
+    print(f"♻️  Scanned {stats.files_scanned} file(s) in {store.get_store_dir()}: "
+          f"{stats.files_linked} identical to another version, {verb} {dedup.format_bytes(stats.bytes_saved)}"
+          f"{f' ({stats.method})' if stats.method else ''}")
+
 def show_tool_versions(tool):
     """Show available versions for a specific tool"""
     os_type = platform.system()
@@ -151,9 +212,7 @@ def show_tool_versions(tool):
     try:
         if tool == 'docker' and os_type == 'Linux':
             # For Linux, we need to get the distro
-            import distro
-            distro_name = distro.name()
-            versions = version_functions[tool](os_type, distro_name)
+            versions = version_functions[tool](os_type, get_linux_distro())
         else:
             versions = version_functions[tool](os_type)
         
@@ -166,60 +225,73 @@ def show_tool_versions(tool):
     except Exception as e:
         print(f"Error fetching versions: {e}")
 
-def check_status():
+def check_status(as_json=False, refresh=False):
     """Check installation status of all tools"""
+    statuses = probe_tools(ALL_TOOLS)
+
+    if refresh:
+        os_type = get_os()
+        distro = get_linux_distro() if os_type == 'Linux' else None
+        with ThreadPoolExecutor(max_workers=len(statuses)) as pool:
+            latest = list(pool.map(lambda s: resolve_version(s.tool, 'latest', os_type, distro), statuses))
+        for status, latest_version in zip(statuses, latest):
+            status.latest = latest_version
+    else:
+        for status in statuses:
+            status.latest = get_cached_latest_version(status.tool)
+
+    if as_json:
+        print(json.dumps([status.to_dict() for status in statuses], indent=2))
+        return
+
     print("DevOps CLI Installation Status:")
     print("=" * 50)
-    
-    tools = ['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform']
-    
-    for tool in tools:
-        # This would check if the tool is installed
-        # For now, we'll show a placeholder
-        print(f"🔍 {tool}: Checking...")
-    
-    print("\nNote: Status checking will be implemented in future versions")
-
-def verify_installations():
+    for status in statuses:
+        if not status.installed:
+            print(f"⚪ {status.tool}: not installed")
+            continue
+        if status.error:
+            print(f"⚠️  {status.tool}: found at {status.path} but {status.error}")
+            continue
+        line = f"✅ {status.tool}: {status.version or 'unknown version'} ({status.path})"
+        if status.latest and status.version and status.latest != status.version:
+            line += f" - {status.latest} available"
+        print(line)
+
+    installed = sum(1 for status in statuses if status.installed)
+    print(f"\n{installed}/{len(statuses)} tools installed")
+    if not refresh:
+        print("Latest versions come from the local cache; use --refresh to check online")
+
+def verify_installations(as_json=False, concurrency=None, timeout=DEFAULT_PROBE_TIMEOUT, deadline=DEFAULT_DEADLINE,
+                         use_cache=True):
     """Verify tool installations and provide troubleshooting steps"""
-    import subprocess
-    
+    start = time.time()
+    statuses = probe_tools(ALL_TOOLS, max_workers=concurrency, timeout=timeout, deadline=deadline,
+                           use_cache=use_cache)
+    issues_found = [status.tool for status in statuses if not status.installed or status.error]
+
+    if as_json:
+        print(json.dumps({
+            'ok': not issues_found,
+            'elapsed': round(time.time() - start, 3),
+            'tools': [status.to_dict() for status in statuses],
+        }, indent=2))
+        return not issues_found
+
     print("DevOps CLI Installation Verification")
     print("=" * 50)
-    
-    tools = {
-        'docker': 'docker --version',
-        'kubectl': 'kubectl version --client',
-        'awscli': 'aws --version',
-        'gcloud': 'gcloud --version',
-        'az': 'az --version',
-        'jenkins': 'java -jar jenkins.war --version',
-        'helm': 'helm version',
-        'prometheus': 'prometheus --version',
-        'terraform': 'terraform --version'
-    }
-    
-    issues_found = []
-    
-    for tool, command in tools.items():
-        print(f"\nChecking {tool}...")
-        try:
-            result = subprocess.run(command.split(), capture_output=True, text=True, timeout=10)
-            if result.returncode == 0:
-                print(f"{tool}: {result.stdout.strip().split(chr(10))[0]}")
-            else:
-                print(f"{tool}: Command failed")
-                issues_found.append(tool)
-        except subprocess.TimeoutExpired:
-            print(f"{tool}: Command timed out")
-            issues_found.append(tool)
-        except FileNotFoundError:
-            print(f"{tool}: Not found in PATH")
-            issues_found.append(tool)
-        except Exception as e:
-            print(f"{tool}: Error - {e}")
-            issues_found.append(tool)
-    
+
+    for status in statuses:
+        if not status.installed:
+            print(f"{status.tool}: Not found in PATH")
+        elif status.error:
+            print(f"{status.tool}: {status.error} ({status.path})")
+        else:
+            source = 'cached' if status.cached else f"{status.probe_time:.1f}s"
+            print(f"{status.tool}: {status.version or 'version unknown'} ({source})")
+    print(f"\nChecked {len(statuses)} tools in {time.time() - start:.1f}s")
+
     if issues_found:
         print(f"\nIssues found with: {', '.join(issues_found)}")
         print("\nTroubleshooting steps:")
@@ -230,18 +302,22 @@ def verify_installations():
         print("5. Reinstall problematic tools: devops-cli install <tool>")
     else:
         print("\nAll tools are working correctly!")
+    return not issues_found
 
-def main():
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
     # Handle version and help flags first
-    if len(sys.argv) == 1:
+    if not argv:
         show_help()
         return
     
-    if '--version' in sys.argv or '-v' in sys.argv:
+    # Only treat these as global flags in first position, so that
+    # 'install <tool> --version X' and forwarded fleet commands still work
+    if argv[0] in ('--version', '-v'):
         show_version()
         return
     
-    if '--help' in sys.argv or '-h' in sys.argv:
+    if argv[0] in ('--help', '-h'):
         show_help()
         return
     
@@ -249,6 +325,11 @@ def main():
         description='DevOps CLI Installer & Updater',
         add_help=False  # We'll handle help manually
     )
+    parser.add_argument('--trace', metavar='FILE', help='Write a Chrome trace of every command and download to FILE')
+    parser.add_argument('--metrics-file', metavar='FILE', help='Merge run metrics into a node_exporter textfile-collector .prom file')
+    parser.add_argument('--usage', action='store_true', help='Print CPU, peak RSS and disk I/O of the commands that ran')
+    parser.add_argument('--usage-json', metavar='FILE', help='Write per-command resource usage to FILE as JSON')
+    parser.add_argument('--lock-timeout', type=float, metavar='SECONDS', help=f'How long to wait for a busy package manager (default: {locks.DEFAULT_LOCK_TIMEOUT})')
     subparsers = parser.add_subparsers(dest='command')
 
     # Init command
@@ -258,6 +339,9 @@ def main():
     install_parser = subparsers.add_parser('install', help='Install a tool')
     install_parser.add_argument('tool', choices=['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform'], help='Tool to install')
     install_parser.add_argument('--version', help='Specify the version to install')
+    install_parser.add_argument('--from-bundle', metavar='PATH', help='Install from an offline bundle created by "devops-cli bundle"')
+    install_parser.add_argument('--mirror', metavar='URL', help='Install from an extracted bundle directory (file:// URL or path)')
+    install_parser.add_argument('--strategy', choices=strategies.STRATEGIES, help='binary: release binary into the managed prefix; package: system package manager (default: auto)')
 
     # Uninstall command
     uninstall_parser = subparsers.add_parser('uninstall', help='Uninstall a tool')
@@ -266,6 +350,37 @@ def main():
     # Update command
     update_parser = subparsers.add_parser('update', help='Update a tool')
     update_parser.add_argument('tool', choices=['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform', 'all'], help='Tool to update')
+    update_parser.add_argument('--strategy', choices=strategies.STRATEGIES, help='binary: release binary into the managed prefix; package: system package manager (default: auto)')
+    update_parser.add_argument('-j', '--jobs', type=int, default=None, help='With "all": tools to update at once (default: all of them)')
+
+    # Use command
+    use_parser = subparsers.add_parser('use', help='Switch a binary-installed tool to another version')
+    use_parser.add_argument('tool', choices=sorted(strategies.BINARY_ARTIFACTS), help='Tool to switch')
+    use_parser.add_argument('version', nargs='?', help='Version to activate (installed into the store if missing); omit to list stored versions')
+    use_parser.add_argument('--previous', action='store_true', help='Roll back to the version that was active before')
+
+    # Pin command
+    pin_parser = subparsers.add_parser('pin', help='Pin tool versions per directory in .tool-versions')
+    pin_parser.add_argument('tool', nargs='?', choices=sorted(strategies.BINARY_ARTIFACTS), help='Tool to pin; omit to show what this directory resolves to')
+    pin_parser.add_argument('version', nargs='?', help='Version to pin (installed into the store if missing)')
+    pin_parser.add_argument('--install', action='store_true', help='Install every version pinned for this directory')
+    pin_parser.add_argument('--shims', action='store_true', help='Rewrite the shims for every stored tool')
+
+    # Dedup command
+    dedup_parser = subparsers.add_parser('dedup', help='Share identical files between stored tool versions')
+    dedup_parser.add_argument('--dry-run', action='store_true', help='Only report how many bytes would be saved')
+
+    # GC command
+    gc_parser = subparsers.add_parser('gc', help='Reclaim space from old tool versions, caches and downloads')
+    gc_parser.add_argument('--dry-run', action='store_true', help='Only report what would be deleted and the bytes reclaimed')
+    gc_parser.add_argument('--max-size', default=os.environ.get('DEVOPS_CLI_GC_MAX_SIZE'), help='Size budget for everything devops-cli keeps, e.g. 2G (least recently used goes first)')
+    gc_parser.add_argument('--max-age', default=os.environ.get('DEVOPS_CLI_GC_MAX_AGE'), help='Delete versions and cache entries unused for longer, e.g. 30d')
+    gc_parser.add_argument('--cwd', action='store_true', help='Also remove installer leftovers (awscliv2.zip, get_helm.sh, ...) from the current directory')
+
+    # Daemon command
+    daemon_parser = subparsers.add_parser('daemon', help='Serve query commands from a warm resident process')
+    daemon_parser.add_argument('--stop', action='store_true', help='Stop the running daemon')
+    daemon_parser.add_argument('--status', action='store_true', help='Show whether a daemon is running')
 
     # List command
     list_parser = subparsers.add_parser('list', help='List all available tools')
@@ -276,26 +391,144 @@ def main():
 
     # Status command
     status_parser = subparsers.add_parser('status', help='Check installation status of all tools')
+    status_parser.add_argument('--json', action='store_true', help='Print machine-readable JSON')
+    status_parser.add_argument('--refresh', action='store_true', help='Look up latest versions online instead of using the cache')
     
     # Verify command
     verify_parser = subparsers.add_parser('verify', help='Verify tool installations and provide troubleshooting steps')
+    verify_parser.add_argument('--json', action='store_true', help='Print machine-readable JSON')
+    verify_parser.add_argument('-j', '--concurrency', type=int, default=None, help='Maximum probes to run at once (default: all)')
+    verify_parser.add_argument('--timeout', type=float, default=DEFAULT_PROBE_TIMEOUT, help=f'Seconds allowed per probe (default: {DEFAULT_PROBE_TIMEOUT})')
+    verify_parser.add_argument('--no-cache', action='store_true', help='Run every tool even if its binary is unchanged since the last probe')
+    verify_parser.add_argument('--deadline', type=float, default=DEFAULT_DEADLINE, help=f'Seconds allowed for the whole run (default: {DEFAULT_DEADLINE})')
     
     # Dependencies command
     deps_parser = subparsers.add_parser('deps', help='Check and install dependencies for a tool')
     deps_parser.add_argument('tool', choices=['docker', 'kubectl', 'awscli', 'gcloud', 'az', 'jenkins', 'helm', 'prometheus', 'terraform'], help='Tool to check dependencies for')
 
-    args = parser.parse_args()
-
+    # Manifest commands
+    for manifest_command, manifest_help in (
+        ('lock', 'Resolve the manifest into a lockfile'),
+        ('plan', 'Show changes needed to match the manifest'),
+        ('apply', 'Install tools that do not match the manifest'),
+    ):
+        manifest_parser = subparsers.add_parser(manifest_command, help=manifest_help)
+        manifest_parser.add_argument('-f', '--file', default=DEFAULT_MANIFEST, help='Manifest file (default: devops-cli.json)')
+
+    # Bundle command
+    bundle_parser = subparsers.add_parser('bundle', help='Download tools into an offline bundle')
+    bundle_parser.add_argument('tools', nargs='+', metavar='tool[@version]', help=f'Tools to bundle ({", ".join(BUNDLE_TOOLS)})')
+    bundle_parser.add_argument('--platform', action='append', dest='platforms', metavar='OS-ARCH', help='Target platform such as linux-amd64 (repeatable, default: this host)')
+    bundle_parser.add_argument('-o', '--output', default='devops-cli-bundle.tar', help='Bundle file to write')
+    bundle_parser.add_argument('-j', '--jobs', type=int, default=8, help='Parallel downloads')
+
+    # Fleet command
+    fleet_parser = subparsers.add_parser('fleet', help='Run a devops-cli command on many hosts over SSH')
+    fleet_parser.add_argument('inventory', help='File with one [user@]host[:port] per line')
+    fleet_parser.add_argument('-j', '--concurrency', type=int, default=DEFAULT_CONCURRENCY, help='Maximum hosts to run at once')
+    fleet_parser.add_argument('--timeout', type=int, default=DEFAULT_HOST_TIMEOUT, help='Per-host timeout in seconds')
+    fleet_parser.add_argument('--ssh-option', action='append', dest='ssh_options', metavar='OPTION', help='Extra ssh -o option (repeatable)')
+    fleet_parser.add_argument('--remote-cli', default='devops-cli', help='devops-cli executable on the remote hosts')
+    fleet_parser.add_argument('fleet_command', nargs=argparse.REMAINDER, help='devops-cli command to run on each host (fleet options go before the inventory)')
+
+    args = parser.parse_args(argv)
+
+    if args.trace:
+        tracing.enable()
+    if args.lock_timeout is not None:
+        locks.set_timeout(args.lock_timeout)
+    metrics_file = args.metrics_file or os.environ.get('DEVOPS_CLI_METRICS_FILE')
+    if metrics_file:
+        metrics.enable()
+    tool_label = getattr(args, 'tool', None) or ''
+    metrics.set_default_labels(tool=tool_label)
+    command_name = ' '.join(part for part in [args.command, tool_label] if part)
+    succeeded = False
+    try:
+        with tracing.span(command_name or 'help', 'command'), process.accounting_scope(command_name or 'help'), \
+                metrics.timer('devops_cli_phase_duration_seconds', tool=tool_label, phase=f"{args.command}_total"):
+            run_command(args)
+        succeeded = True
+    except SystemExit as e:
+        succeeded = not e.code
+        raise
+    except Exception as e:
+        metrics.record_failure(type(e).__name__)
+        raise
+    finally:
+        if metrics_file:
+            succeeded = succeeded and not metrics.failures_recorded()
+            metrics.inc('devops_cli_runs_total', command=args.command or 'help', tool=tool_label,
+                        result='success' if succeeded else 'failure')
+            metrics.set_gauge('devops_cli_last_run_timestamp_seconds', round(time.time()), command=args.command or 'help')
+            metrics.set_gauge('devops_cli_last_run_success', int(succeeded), command=args.command or 'help')
+            try:
+                metrics.write_textfile(metrics_file)
+            except OSError as e:
+                print(f"⚠️  Could not write metrics to {metrics_file}: {e}")
+        if args.trace:
+            tracing.write_trace(args.trace)
+            print(f"📈 Trace written to {args.trace} (open it in https://ui.perfetto.dev)")
+        if args.usage:
+            process.print_usage_summary()
+        if args.usage_json:
+            process.write_usage_json(args.usage_json)
+            print(f"📊 Resource usage written to {args.usage_json}")
+
+def run_command(args):
+    """Run the subcommand selected on the command line"""
+    if getattr(args, 'strategy', None):
+        strategies.set_strategy(args.strategy)
     if args.command == 'init':
         interactive.start_interactive_session()
+    elif args.command == 'use':
+        if not strategies.use_version(args.tool, args.version, args.previous):
+            sys.exit(1)
+    elif args.command == 'pin':
+        if args.tool and not args.version:
+            print("❌ Give a version to pin, e.g. devops-cli pin terraform 1.5.7")
+            sys.exit(1)
+        if args.tool:
+            ok = pins.pin_tool(args.tool, args.version)
+        elif args.install:
+            ok = pins.install_pins()
+        elif args.shims:
+            ok = pins.refresh_shims()
+        else:
+            ok = pins.show_pins()
+        if not ok:
+            sys.exit(1)
+    elif args.command == 'dedup':
+        deduplicate_store(args.dry_run)
+    elif args.command == 'gc':
+        try:
+            max_size = garbage.parse_size(args.max_size) if args.max_size else None
+            max_age = garbage.parse_age(args.max_age) if args.max_age else None
+        except ValueError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+        if not garbage.collect(max_size, max_age, args.dry_run, args.cwd):
+            sys.exit(1)
+    elif args.command == 'daemon':
+        if args.stop:
+            ok = daemon.stop()
+        elif args.status:
+            ok = daemon.show_status()
+        else:
+            ok = daemon.serve()
+        if not ok:
+            sys.exit(1)
     elif args.command == 'list':
         list_tools()
     elif args.command == 'versions':
         show_tool_versions(args.tool)
     elif args.command == 'status':
-        check_status()
+        check_status(as_json=args.json, refresh=args.refresh)
     elif args.command == 'verify':
-        verify_installations()
+        if not verify_installations(as_json=args.json, concurrency=args.concurrency,
+                                    timeout=args.timeout, deadline=args.deadline,
+                                    use_cache=not args.no_cache):
+            sys.exit(1)
     elif args.command == 'deps':
         print(f"🔍 Checking dependencies for {args.tool}...")
         if dependency_manager.validate_dependencies(args.tool):
@@ -306,7 +539,39 @@ def main():
                 print(f"✅ Dependencies for {args.tool} installed successfully")
             else:
                 print(f"❌ Failed to install dependencies for {args.tool}")
+    elif args.command in ('lock', 'plan', 'apply'):
+        try:
+            if args.command == 'lock':
+                path, data = write_lockfile(args.file)
+                print(f"🔒 Wrote {path}")
+                for tool_name, entry in sorted(data['tools'].items()):
+                    print(f"   {tool_name} {entry['version']}")
+            else:
+                plan = build_plan(args.file)
+                print_plan(plan)
+                if args.command == 'apply' and not apply_plan(plan):
+                    sys.exit(1)
+        except ManifestError as e:
+            print(f"❌ {e}")
+            sys.exit(1)
+    elif args.command == 'bundle':
+        if not create_bundle(args.tools, args.platforms, args.output, args.jobs):
+            sys.exit(1)
+    elif args.command == 'fleet':
+        if not args.fleet_command:
+            print("❌ No command given, e.g. devops-cli fleet hosts.txt install terraform")
+            sys.exit(2)
+        if not run_fleet(args.inventory, args.fleet_command, args.concurrency,
+                         args.timeout, args.ssh_options, args.remote_cli):
+            sys.exit(1)
     elif args.command == 'install':
+        if args.from_bundle or args.mirror:
+            try:
+                offline_mirror = mirror.activate(args.from_bundle or args.mirror)
+            except Exception as e:
+                print(f"❌ Could not open offline bundle: {e}")
+                sys.exit(1)
+            print(f"📦 Installing from offline bundle {offline_mirror.location}")
         if args.tool == 'docker':
             docker.install(version=args.version)
         elif args.tool == 'kubectl':
@@ -347,12 +612,13 @@ def main():
     elif args.command == 'update':
         if args.tool == 'all':
             print("Updating all installed tools...")
-            tools = [docker, kubectl, awscli, gcloud, az, jenkins, helm, prometheus, terraform]
-            for tool in tools:
-                try:
-                    tool.update()
-                except Exception as e:
-                    print(f"Error updating {tool.__name__}: {e}")
+            modules = {'docker': docker, 'kubectl': kubectl, 'awscli': awscli, 'gcloud': gcloud, 'az': az,
+                       'jenkins': jenkins, 'helm': helm, 'prometheus': prometheus, 'terraform': terraform}
+            installed = {status.tool: modules[status.tool] for status in probe_tools(ALL_TOOLS) if status.installed}
+            if not installed:
+                print("No installed tools found.")
+            elif not update_tools(installed, max_workers=args.jobs):
+                sys.exit(1)
         elif args.tool == 'docker':
             docker.update()
         elif args.tool == 'kubectl':
@@ -0,0 +1,267 @@
+"""
+Declarative Tool Manifest for DevOps CLI
+Reads a manifest of tools and version constraints, pins them in a lockfile
+and plans/applies only the changes a host actually needs
+"""
+
+import importlib
+import json
+import os
+import time
+from packaging.specifiers import SpecifierSet, InvalidSpecifier
+from packaging.version import Version, InvalidVersion
+
+from utils import get_os, get_linux_distro, get_platform_tag
+from versioning import resolve_version, get_artifact_url, get_version_candidates
+from integrity import IntegrityError, get_expected_sha256
+from detection import ALL_TOOLS, detect_installed_versions
+from strategies import BINARY_ARTIFACTS, install_binary
+
+DEFAULT_MANIFEST = 'devops-cli.json'
+LOCKFILE_FORMAT = 1
+
+# Plan actions
+SATISFIED = 'satisfied'
+INSTALL = 'install'
+CHANGE = 'change'
+
+
+class ManifestError(Exception):
+    """Raised for unreadable manifests or unsatisfiable constraints"""
+
+
+def lockfile_path(manifest_path):
+    """The lockfile lives next to the manifest: devops-cli.json -> devops-cli.lock"""
+    root, _ = os.path.splitext(manifest_path)
+    return root + '.lock'
+
+
+def _parse_constraint(constraint):
+    """Turn 'latest', '1.5.7' or '>=1.5,<1.7' into a SpecifierSet (None means any)"""
+    constraint = (constraint or 'latest').strip()
+    if constraint in ('latest', '*', ''):
+        return None
+    try:
+        Version(constraint)
+        return SpecifierSet(f"=={constraint}")
+    except InvalidVersion:
+        pass
+    try:
+        return SpecifierSet(constraint)
+    except InvalidSpecifier:
+        raise ManifestError(f"Invalid version constraint: {constraint}")
+
+
+def _pinned_version(constraint):
+    """Return the exact version a constraint pins, if it pins one"""
+    spec = _parse_constraint(constraint)
+    if spec is None:
+        return None
+    pinned = [s.version for s in spec if s.operator in ('==', '===') and '*' not in s.version]
+    return pinned[0] if pinned else None
+
+
+def _satisfies(installed, constraint):
+    if not installed:
+        return False
+    spec = _parse_constraint(constraint)
+    if spec is None:
+        return True
+    try:
+        return Version(installed) in spec
+    except InvalidVersion:
+        return False
+
+
+def load_manifest(path=DEFAULT_MANIFEST):
+    """Load {tool: constraint} from a manifest file"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Could not read manifest {path}: {e}")
+
+    tools = data.get('tools', {})
+    unknown = [tool for tool in tools if tool not in ALL_TOOLS]
+    if unknown:
+        raise ManifestError(f"Unknown tools in {path}: {', '.join(unknown)}")
+    for constraint in tools.values():
+        _parse_constraint(constraint)
+    return tools
+
+
+def load_lockfile(path):
+    """Load a lockfile, or None when there is none"""
+    if not os.path.exists(path):
+        return None
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ManifestError(f"Could not read lockfile {path}: {e}")
+    if data.get('format') != LOCKFILE_FORMAT:
+        raise ManifestError(f"Unsupported lockfile format in {path}")
+    return data
+
+
+def resolve_constraint(tool_name, constraint, os_type, distro):
+    """Pick the newest published version that satisfies a constraint"""
+    spec = _parse_constraint(constraint)
+    if spec is None:
+        return resolve_version(tool_name, 'latest', os_type, distro)
+    pinned = _pinned_version(constraint)
+    if pinned:
+        return pinned
+
+    candidates = [v for v in get_version_candidates(tool_name, os_type, distro) if v != 'latest']
+    matching = []
+    for candidate in candidates:
+        try:
+            if Version(candidate) in spec:
+                matching.append(candidate)
+        except InvalidVersion:
+            continue
+    if not matching:
+        raise ManifestError(f"No published {tool_name} version satisfies '{constraint}'")
+    return max(matching, key=Version)
+
+
+def write_lockfile(manifest_path=DEFAULT_MANIFEST):
+    """Resolve every manifest entry and write versions, URLs and hashes to the lockfile"""
+    tools = load_manifest(manifest_path)
+    os_type = get_os()
+    distro = get_linux_distro() if os_type == 'Linux' else None
+    platform_tag = get_platform_tag()
+
+    locked = {}
+    for tool_name, constraint in sorted(tools.items()):
+        tool_version = resolve_constraint(tool_name, constraint, os_type, distro)
+        if not tool_version:
+            raise ManifestError(f"Could not resolve a version for {tool_name}")
+        url = get_artifact_url(tool_name, tool_version, platform_tag)
+        try:
+            sha256 = get_expected_sha256(tool_name, tool_version, url) if url else None
+        except IntegrityError as e:
+            raise ManifestError(f"Could not lock {tool_name} {tool_version}: {e}")
+        locked[tool_name] = {
+            'constraint': constraint,
+            'version': tool_version,
+            'platform': platform_tag,
+            'url': url,
+            'sha256': sha256,
+        }
+
+    data = {
+        'format': LOCKFILE_FORMAT,
+        'generated': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+        'tools': locked,
+    }
+    path = lockfile_path(manifest_path)
+    partial = path + '.part'
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(data, f, indent=2, sort_keys=True)
+        f.write('\n')
+    os.replace(partial, path)
+    return path, data
+
+
+def build_plan(manifest_path=DEFAULT_MANIFEST):
+    """Diff desired state (lockfile, else manifest constraints) against installed tools
+
+    Returns a list of {tool, constraint, desired, installed, action}. Tools that
+    already satisfy the lockfile or constraint need no network access at all.
+    """
+    tools = load_manifest(manifest_path)
+    lock = load_lockfile(lockfile_path(manifest_path))
+    locked = lock['tools'] if lock else {}
+    installed = detect_installed_versions(list(tools))
+
+    plan = []
+    for tool_name, constraint in sorted(tools.items()):
+        entry = locked.get(tool_name)
+        if entry and entry.get('constraint') == constraint:
+            desired = entry['version']
+            satisfied = installed[tool_name] == desired
+        else:
+            entry = None
+            desired = _pinned_version(constraint)
+            satisfied = _satisfies(installed[tool_name], constraint)
+
+        if satisfied:
+            action = SATISFIED
+        elif installed[tool_name]:
+            action = CHANGE
+        else:
+            action = INSTALL
+        plan.append({
+            'tool': tool_name,
+            'constraint': constraint,
+            'desired': (desired or installed[tool_name]) if satisfied else desired,
+            'installed': installed[tool_name],
+            'action': action,
+            'locked': entry,
+        })
+    return plan
+
+
+def print_plan(plan):
+    """Show the plan in a terraform-like summary"""
+    symbols = {SATISFIED: '=', INSTALL: '+', CHANGE: '~'}
+    for step in plan:
+        desired = step['desired'] or f"'{step['constraint']}'"
+        if step['action'] == SATISFIED:
+            print(f"  {symbols[SATISFIED]} {step['tool']} {step['installed']} (up to date)")
+        elif step['action'] == CHANGE:
+            print(f"  {symbols[CHANGE]} {step['tool']} {step['installed']} -> {desired}")
+        else:
+            print(f"  {symbols[INSTALL]} {step['tool']} {desired}")
+    changes = [s for s in plan if s['action'] != SATISFIED]
+    print(f"\nPlan: {sum(1 for s in changes if s['action'] == INSTALL)} to install, "
+          f"{sum(1 for s in changes if s['action'] == CHANGE)} to change, "
+          f"{len(plan) - len(changes)} unchanged.")
+
+
+def _install_locked(tool_name, entry):
+    """Install exactly the artifact a lockfile entry records, verified against its sha256"""
+    if entry.get('platform') != get_platform_tag():
+        print(f"❌ {tool_name} is locked for {entry.get('platform')}, this host is {get_platform_tag()}; "
+              f"re-run 'devops-cli lock' here")
+        return False
+    return install_binary(tool_name, entry['version'], url=entry['url'], sha256=entry['sha256'])
+
+
+def apply_plan(plan):
+    """Install only the tools whose plan action is not 'satisfied'
+
+    Tools locked with a sha256 are installed from the locked URL into the
+    store, and fail unless the artifact matches the locked hash.
+    """
+    changes = [step for step in plan if step['action'] != SATISFIED]
+    if not changes:
+        print("✅ All tools already match the manifest. Nothing to do.")
+        return True
+
+    os_type = get_os()
+    distro = get_linux_distro() if os_type == 'Linux' else None
+    failed = []
+    for step in changes:
+        tool_version = step['desired'] or resolve_constraint(step['tool'], step['constraint'], os_type, distro)
+        print(f"\n📦 {step['tool']}: installing {tool_version}...")
+        locked = step.get('locked')
+        tool_module = importlib.import_module(f"tools.{step['tool']}")
+        try:
+            if locked and locked.get('sha256') and step['tool'] in BINARY_ARTIFACTS:
+                installed = _install_locked(step['tool'], locked)
+            else:
+                installed = tool_module.install(version=tool_version) is not False
+            if not installed:
+                failed.append(step['tool'])
+        except Exception as e:
+            print(f"❌ Error installing {step['tool']}: {e}")
+            failed.append(step['tool'])
+
+    if failed:
+        print(f"\n❌ Apply failed for: {', '.join(failed)}")
+        return False
+    print(f"\n✅ Applied {len(changes)} change(s)")
+    return True
@@ -0,0 +1,266 @@
+"""
+Prometheus Metrics for DevOps CLI
+Collects counters and histograms during a run and merges them into a
+node_exporter textfile-collector .prom file
+"""
+
+import functools
+import os
+import re
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+DEFAULT_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+
+# name: (type, help)
+METRICS = {
+    'devops_cli_runs_total': ('counter', 'devops-cli invocations by command, tool and result'),
+    'devops_cli_last_run_timestamp_seconds': ('gauge', 'Unix time the last devops-cli run finished'),
+    'devops_cli_last_run_success': ('gauge', 'Whether the last devops-cli run succeeded (1) or failed (0)'),
+    'devops_cli_phase_duration_seconds': ('histogram', 'Duration of install/update phases by tool and phase'),
+    'devops_cli_download_bytes_total': ('counter', 'Bytes downloaded by tool and source host'),
+    'devops_cli_cache_requests_total': ('counter', 'Cache lookups by cache and result (hit/miss)'),
+    'devops_cli_metadata_fetch_duration_seconds': ('histogram', 'Latency of version/checksum metadata fetches by source'),
+    'devops_cli_failures_total': ('counter', 'Failures by tool and reason'),
+}
+
+LINE_PATTERN = re.compile(r'^([a-zA-Z_:][a-zA-Z0-9_:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL_PATTERN = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+
+_lock = threading.Lock()
+_counters = {}
+_gauges = {}
+_histograms = {}
+_failures = 0
+_enabled = False
+_default_labels = {}
+_local = threading.local()
+
+
+def enable():
+    """Start collecting metrics (they are not written unless enabled)"""
+    global _enabled
+    _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Forget everything collected so far and stop collecting (one process serving many runs)"""
+    global _failures, _enabled
+    with _lock:
+        _counters.clear()
+        _gauges.clear()
+        _histograms.clear()
+        _failures = 0
+    _enabled = False
+    _default_labels.clear()
+
+
+def set_default_labels(**labels):
+    """Labels such as the tool being installed, used when a thread has no context of its own"""
+    _default_labels.update(labels)
+
+
+@contextmanager
+def labels_context(**labels):
+    """Override default labels for metrics recorded on this thread"""
+    previous = getattr(_local, 'labels', None)
+    _local.labels = dict(previous or _default_labels, **labels)
+    try:
+        yield
+    finally:
+        _local.labels = previous
+
+
+def current_labels():
+    """This thread's labels, to carry over to worker threads"""
+    return dict(getattr(_local, 'labels', None) or _default_labels)
+
+
+def current_tool():
+    labels = getattr(_local, 'labels', None) or _default_labels
+    return labels.get('tool', '')
+
+
+def _key(name, labels):
+    return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+
+def inc(name, value=1, **labels):
+    """Add to a counter"""
+    global _failures
+    if not _enabled:
+        return
+    with _lock:
+        key = _key(name, labels)
+        _counters[key] = _counters.get(key, 0) + value
+        if name == 'devops_cli_failures_total':
+            _failures += value
+
+
+def set_gauge(name, value, **labels):
+    if not _enabled:
+        return
+    with _lock:
+        _gauges[_key(name, labels)] = value
+
+
+def observe(name, value, **labels):
+    """Record one observation in a histogram"""
+    if not _enabled:
+        return
+    with _lock:
+        key = _key(name, labels)
+        buckets, total, count = _histograms.get(key, ([0] * len(DEFAULT_BUCKETS), 0.0, 0))
+        buckets = [n + (1 if value <= bound else 0) for n, bound in zip(buckets, DEFAULT_BUCKETS)]
+        _histograms[key] = (buckets, total + value, count + 1)
+
+
+@contextmanager
+def timer(name, **labels):
+    """Observe the duration of the enclosed block, even when it raises"""
+    start = time.time()
+    try:
+        yield
+    finally:
+        observe(name, time.time() - start, **labels)
+
+
+def phase(name):
+    """Decorator timing every call as an install phase of the current tool"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with timer('devops_cli_phase_duration_seconds', tool=current_tool(), phase=name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def source_of(url):
+    """Label value for where a URL is served from"""
+    return urlparse(url).hostname or 'local'
+
+
+def record_failure(reason, tool=None):
+    inc('devops_cli_failures_total', tool=current_tool() if tool is None else tool, reason=reason)
+
+
+def failures_recorded():
+    return _failures
+
+
+def _format_labels(labels):
+    if not labels:
+        return ''
+    escaped = [(k, v.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')) for k, v in labels]
+    return '{' + ','.join(f'{k}="{v}"' for k, v in escaped) + '}'
+
+
+def _parse_textfile(path):
+    """Read samples previously written by devops-cli: {(name, labels): value}"""
+    samples = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                match = LINE_PATTERN.match(line.strip())
+                if not match or line.startswith('#'):
+                    continue
+                name, raw_labels, value = match.groups()
+                labels = tuple(sorted((k, v.replace('\\"', '"').replace('\\n', '\n').replace('\\\\', '\\'))
+                                      for k, v in LABEL_PATTERN.findall(raw_labels or '')))
+                try:
+                    samples[(name, labels)] = float(value)
+                except ValueError:
+                    continue
+    except OSError:
+        pass
+    return samples
+
+
+def _current_samples():
+    samples = {}
+    with _lock:
+        for (name, labels), value in _counters.items():
+            samples[(name, labels)] = value
+        for (name, labels), value in _gauges.items():
+            samples[(name, labels)] = value
+        for (name, labels), (buckets, total, count) in _histograms.items():
+            for bound, n in zip(DEFAULT_BUCKETS, buckets):
+                samples[(f'{name}_bucket', tuple(sorted(labels + (('le', str(float(bound))),))))] = n
+            samples[(f'{name}_bucket', tuple(sorted(labels + (('le', '+Inf'),))))] = count
+            samples[(f'{name}_sum', labels)] = total
+            samples[(f'{name}_count', labels)] = count
+    return samples
+
+
+def _base_name(sample_name):
+    for suffix in ('_bucket', '_sum', '_count'):
+        if sample_name.endswith(suffix) and sample_name[:-len(suffix)] in METRICS:
+            return sample_name[:-len(suffix)]
+    return sample_name
+
+
+def _series_order(key):
+    """Group each label set's buckets (in numeric le order), then _sum and _count"""
+    name, labels = key
+    plain = tuple(label for label in labels if label[0] != 'le')
+    le = dict(labels).get('le')
+    bound = float('inf') if le == '+Inf' else float(le) if le is not None else 0.0
+    return plain, name.endswith('_count'), name.endswith('_sum'), bound, name
+
+
+def write_textfile(path):
+    """Merge this run's metrics into a .prom file for the textfile collector
+
+    Counters and histograms accumulate across runs so they stay monotonic;
+    gauges are replaced. The file is swapped in atomically, as node_exporter
+    requires; a lock file serialises concurrent runs so no increment is lost.
+    """
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    with open(f"{path}.lock", 'a') as lock:
+        if fcntl is not None:
+            fcntl.flock(lock, fcntl.LOCK_EX)
+        return _merge_into(path)
+
+
+def _merge_into(path):
+    merged = _parse_textfile(path)
+    for (name, labels), value in _current_samples().items():
+        metric_type = METRICS.get(_base_name(name), ('gauge', ''))[0]
+        if metric_type == 'gauge':
+            merged[(name, labels)] = value
+        else:
+            merged[(name, labels)] = merged.get((name, labels), 0) + value
+
+    lines = []
+    for metric_name in sorted(METRICS):
+        metric_type, help_text = METRICS[metric_name]
+        series = sorted((key for key in merged if _base_name(key[0]) == metric_name), key=_series_order)
+        if not series:
+            continue
+        lines.append(f'# HELP {metric_name} {help_text}')
+        lines.append(f'# TYPE {metric_name} {metric_type}')
+        for name, labels in series:
+            value = merged[(name, labels)]
+            text = str(int(value)) if float(value).is_integer() else repr(value)
+            lines.append(f'{name}{_format_labels(labels)} {text}')
+
+    partial = f"{path}.{os.getpid()}.tmp"
+    with open(partial, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    os.replace(partial, path)
+    return path
@@ -0,0 +1,109 @@
+"""
+Offline Mirror Support for DevOps CLI
+Serves artifacts and checksum manifests from a bundle created by
+'devops-cli bundle' so installs can run without network access
+"""
+
+import json
+import os
+import tarfile
+import threading
+from packaging import version as version_parser
+
+INDEX_NAME = 'index.json'
+BUNDLE_FORMAT = 1
+
+_active_mirror = None
+_env_checked = False
+
+
+class MirrorMiss(LookupError):
+    """Raised when an offline install needs a file the bundle does not contain"""
+
+
+class _BundleMember:
+    """One member of a bundle archive, read through its own archive handle"""
+
+    def __init__(self, location, member):
+        self._archive = tarfile.open(location, 'r:*')
+        self._file = self._archive.extractfile(member)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def close(self):
+        self._file.close()
+        self._archive.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+class Mirror:
+    """Read-only view of a bundle archive or an extracted bundle directory"""
+
+    def __init__(self, location):
+        if location.startswith('file://'):
+            location = location[len('file://'):]
+        self.location = os.path.abspath(os.path.expanduser(location))
+        self._tar = None
+        self._tar_lock = threading.Lock()
+
+        if os.path.isdir(self.location):
+            with open(os.path.join(self.location, INDEX_NAME), 'r', encoding='utf-8') as f:
+                self.index = json.load(f)
+        else:
+            self._tar = tarfile.open(self.location, 'r:*')
+            self.index = json.load(self._tar.extractfile(INDEX_NAME))
+
+        if self.index.get('format') != BUNDLE_FORMAT:
+            raise ValueError(f"Unsupported bundle format in {self.location}: {self.index.get('format')}")
+        self.files = self.index.get('files', {})
+
+    def has(self, url):
+        return url in self.files
+
+    def open(self, url):
+        """Open the bundled copy of url as a binary file object"""
+        entry = self.files.get(url)
+        if not entry:
+            raise MirrorMiss(f"{url} is not in the offline bundle {self.location}")
+        if self._tar is None:
+            return open(os.path.join(self.location, entry['path']), 'rb')
+        # Members read through one shared file object would race on its seek
+        # position, so each reader gets its own handle; the member's header
+        # (and data offset) comes from the shared, already scanned archive.
+        with self._tar_lock:
+            member = self._tar.getmember(entry['path'])
+        return _BundleMember(self.location, member)
+
+    def read_text(self, url):
+        with self.open(url) as f:
+            return f.read().decode('utf-8')
+
+    def versions(self, tool_name):
+        """Versions of a tool available in the bundle, newest first"""
+        found = {artifact['version'] for artifact in self.index.get('artifacts', [])
+                 if artifact['tool'] == tool_name}
+        return sorted(found, key=version_parser.parse, reverse=True)
+
+
+def activate(location):
+    """Route all artifact, manifest and version lookups through a bundle"""
+    global _active_mirror
+    _active_mirror = Mirror(location)
+    return _active_mirror
+
+
+def get_active_mirror():
+    """Return the active mirror, honouring DEVOPS_CLI_MIRROR on first use"""
+    global _env_checked
+    if _active_mirror is None and not _env_checked:
+        _env_checked = True
+        location = os.environ.get('DEVOPS_CLI_MIRROR')
+        if location:
+            activate(location)
+    return _active_mirror
@@ -0,0 +1,207 @@
+"""
+Live Output for DevOps CLI
+Renders the output of concurrent jobs (tools being updated, fleet hosts):
+coloured [label] prefixes line by line, or on a terminal a compact live view
+with one status line per running job. Every job keeps a bounded ring buffer
+of its recent lines, shown when the job fails.
+"""
+
+import os
+import shutil
+import threading
+import time
+from collections import deque
+
+import process
+
+RING_LINES = 200  # recent lines kept per job
+FAILURE_LINES = 30  # of those, shown when a job fails
+REFRESH_INTERVAL = 0.1  # seconds between redraws of the live view
+
+COLOURS = (36, 33, 35, 32, 34, 91, 96, 93, 95, 92, 94)  # ANSI foreground codes
+SPINNER = '⠋⠙⠹⠸⠼⠴⠦⠧⠇⠏'
+
+
+class Job:
+    """Output state of one job"""
+
+    def __init__(self, label, colour):
+        self.label = label
+        self.colour = colour
+        self.recent = deque(maxlen=RING_LINES)
+        self.lines = 0
+        self.started = None  # set by start_job; queued jobs are not shown as running
+        self.finished = None
+        self.ok = None
+
+    @property
+    def last_line(self):
+        return self.recent[-1] if self.recent else ''
+
+
+def _wants_live_view(stream):
+    setting = os.environ.get('DEVOPS_CLI_PROGRESS', 'auto').lower()
+    if setting in ('0', 'off', 'no', 'false'):
+        return False
+    interactive = hasattr(stream, 'isatty') and stream.isatty() and os.environ.get('TERM') != 'dumb'
+    return interactive or setting in ('1', 'on', 'yes', 'true')
+
+
+def _wants_colour(stream):
+    return 'NO_COLOR' not in os.environ and hasattr(stream, 'isatty') and stream.isatty()
+
+
+class LiveOutput(process.LabelledStdout):
+    """sys.stdout replacement multiplexing the output of labelled jobs
+
+    Lines printed by a labelled thread, and lines its commands write (relayed
+    by process.PipePump), go to that job. Without a terminal they are written
+    straight through with a [label] prefix. On a terminal only the live view
+    is drawn, and each job's recent lines are printed if it fails.
+    Unlabelled writes pass through above the live view.
+    """
+
+    def __init__(self, stream, labels=(), live=None, colour=None):
+        super().__init__(stream, max([len(label) for label in labels] + [0]))
+        self.live = _wants_live_view(stream) if live is None else live
+        self.colour = _wants_colour(stream) if colour is None else colour
+        self.jobs = {}
+        self._lock = threading.RLock()
+        self._drawn = 0  # lines of live view currently on screen
+        self._stop = threading.Event()
+        self._ticker = None
+        for label in labels:
+            self.job(label)
+
+    # Job bookkeeping
+
+    def job(self, label):
+        with self._lock:
+            if label not in self.jobs:
+                self.jobs[label] = Job(label, COLOURS[len(self.jobs) % len(COLOURS)])
+                self.width = max(self.width, len(label))
+            return self.jobs[label]
+
+    def start_job(self, label):
+        job = self.job(label)
+        job.started = time.time()
+        if self.live and self._ticker is None:
+            self._ticker = threading.Thread(target=self._tick, name='live-output', daemon=True)
+            self._ticker.start()
+        return job
+
+    def finish_job(self, label, ok, summary=None):
+        """Mark a job done; failures print the job's recent lines"""
+        job = self.job(label)
+        job.finished = time.time()
+        job.started = job.started or job.finished
+        job.ok = ok
+        if not self.live and ok:
+            return
+        with self._lock:
+            self._clear()
+            mark = '✅' if ok else '❌'
+            self._write_raw(f"{mark} {self._prefix(job)} {summary or ('done' if ok else 'failed')} "
+                            f"in {job.finished - job.started:.1f}s\n")
+            if not ok and job.recent:
+                shown = list(job.recent)[-FAILURE_LINES:]
+                self._write_raw(f"   last {len(shown)} of {job.lines} line(s) from {label}:\n")
+                for line in shown:
+                    self._write_raw(f"   {self._paint(job, '│')} {line}\n")
+            self._draw()
+
+    def close(self):
+        """Stop redrawing and remove the live view"""
+        self._stop.set()
+        if self._ticker is not None:
+            self._ticker.join(timeout=1)
+        with self._lock:
+            self._clear()
+            self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    # Output entry points
+
+    def write(self, text):
+        label = process.output_label()
+        if label is None:
+            with self._lock:
+                self._clear()
+                self.stream.write(text)
+                if text.endswith('\n'):
+                    self._draw()
+            return len(text)
+        key = threading.get_ident()
+        lines = (self._partial.pop(key, '') + text).split('\n')
+        if lines[-1]:
+            self._partial[key] = lines[-1]
+        for line in lines[:-1]:
+            self.relay_line(label, line)
+        return len(text)
+
+    def relay_line(self, label, line, kind='out'):
+        job = self.job(label)
+        with self._lock:
+            job.recent.append(line)
+            job.lines += 1
+            if self.live:
+                return  # shown by the next redraw
+            text = f"{self._prefix(job)} {line}\n"
+            self._write_raw(text if kind == 'out' or not self.colour else f"{self._prefix(job)} \x1b[2m{line}\x1b[0m\n")
+            self.stream.flush()
+
+    def flush(self):
+        with self._lock:
+            self.stream.flush()
+
+    # Rendering
+
+    def _paint(self, job, text):
+        return f"\x1b[{job.colour}m{text}\x1b[0m" if self.colour else text
+
+    def _prefix(self, job):
+        return self._paint(job, f"[{job.label:<{self.width}}]")
+
+    def _write_raw(self, text):
+        self.stream.write(text)
+
+    def _clear(self):
+        """Erase the live view (cursor up to its first line, clear to end of screen)"""
+        if self._drawn:
+            self.stream.write(f"\x1b[{self._drawn}F\x1b[J")
+            self._drawn = 0
+
+    def _draw(self):
+        if not self.live or self._stop.is_set():
+            return
+        running = [job for job in self.jobs.values() if job.finished is None and job.started is not None]
+        if not running:
+            return
+        columns, lines = shutil.get_terminal_size((100, 20))
+        spinner = SPINNER[int(time.time() / REFRESH_INTERVAL) % len(SPINNER)]
+        done = sum(1 for job in self.jobs.values() if job.finished is not None)
+        rows = [f"{spinner} {done}/{len(self.jobs)} done, {len(running)} running"]
+        # The whole view must fit on screen, or the cursor cannot return to its first row
+        room = max(1, lines - 1) - len(rows)
+        shown = running if len(running) <= room else running[:max(0, room - 1)]
+        for job in shown:
+            head = f"  {job.label:<{self.width}} {time.time() - job.started:>5.0f}s {job.lines:>6} lines  "
+            tail = job.last_line.replace('\t', ' ')[:max(0, columns - len(head) - 1)]
+            rows.append(self._paint(job, head) + tail)
+        if len(shown) < len(running) and room > 0:
+            rows.append(f"  +{len(running) - len(shown)} more")
+        self.stream.write('\n'.join(rows) + '\n')
+        self.stream.flush()
+        self._drawn = len(rows)
+
+    def _tick(self):
+        while not self._stop.wait(REFRESH_INTERVAL):
+            with self._lock:
+                self._clear()
+                self._draw()
+
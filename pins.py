@@ -0,0 +1,318 @@
+"""
+Per-Directory Version Pins for DevOps CLI
+Reads .tool-versions files ('<tool> <version>' per line, as asdf uses) from the
+working directory upwards and resolves each tool to a binary in the versioned
+store. Shell shims repeat the same lookup with shell builtins only, so running
+a pinned tool never starts Python.
+"""
+
+import json
+import os
+import time
+
+from utils import get_data_dir, get_managed_bin_dir
+import store
+import strategies
+
+PIN_FILE = '.tool-versions'
+SYSTEM = 'system'  # pin meaning "whatever version is active globally"
+WALK_CACHE_TTL = 2.0  # seconds a directory -> pin file lookup is trusted
+
+_walk_cache = {}  # directory -> (pin files found, time looked up)
+_pin_cache = {}  # pin file -> ((mtime_ns, size), {tool: version})
+
+SHIM_TEMPLATE = """#!/bin/sh
+# devops-cli shim for {executable} ({tool}): runs the version pinned in the nearest
+# {pin_file}, else the active one. Regenerate with 'devops-cli pin --shims'.
+tool={tool}
+version=${{{env_var}:-}}
+dir=$PWD
+while [ -z "$version" ]; do
+  if [ -f "$dir/{pin_file}" ]; then
+    while read -r name pinned rest || [ -n "$name" ]; do
+      if [ "$name" = "$tool" ]; then version=$pinned; break; fi
+    done < "$dir/{pin_file}"
+  fi
+  [ -z "$dir" ] && break
+  dir=${{dir%/*}}
+done
+case ${{version#v}} in
+  ''|{system}) target='{store}/{tool}/current/bin/{executable}' ;;
+  *) target="{store}/{tool}/${{version#v}}/bin/{executable}" ;;
+esac
+if [ ! -x "$target" ]; then
+  echo "devops-cli: {tool} ${{version:-(active)}} is not installed; run 'devops-cli pin --install'" >&2
+  exit 127
+fi
+exec "$target" "$@"
+"""
+
+
+def get_shims_dir():
+    """Where shims live (DEVOPS_CLI_SHIMS, else <data dir>/shims)"""
+    base = os.environ.get('DEVOPS_CLI_SHIMS') or get_data_dir('shims')
+    return os.path.abspath(os.path.expanduser(base))
+
+
+def _env_var(tool_name):
+    return f"DEVOPS_CLI_{tool_name.upper()}_VERSION"
+
+
+def _normalise(version):
+    version = version.strip()
+    return version[1:] if version.startswith('v') else version
+
+
+def clear_cache():
+    _walk_cache.clear()
+    _pin_cache.clear()
+
+
+def read_pin_file(path):
+    """{tool: version} from a pin file; parsed once per file content"""
+    try:
+        info = os.stat(path)
+    except OSError:
+        return {}
+    signature = (info.st_mtime_ns, info.st_size)
+    cached = _pin_cache.get(path)
+    if cached and cached[0] == signature:
+        return cached[1]
+
+    pins = {}
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                fields = line.split('#', 1)[0].split()
+                # asdf allows fallback versions after the first; only the first is used
+                if len(fields) >= 2 and fields[0] not in pins:
+                    pins[fields[0]] = _normalise(fields[1])
+    except (OSError, UnicodeDecodeError):
+        return {}
+    _pin_cache[path] = (signature, pins)
+    return pins
+
+
+def pin_files(directory=None):
+    """Pin files from directory up to /, nearest first (cached for WALK_CACHE_TTL)"""
+    directory = os.path.abspath(directory or os.getcwd())
+    now = time.time()
+    cached = _walk_cache.get(directory)
+    if cached and now - cached[1] < WALK_CACHE_TTL:
+        return cached[0]
+
+    found = []
+    current = directory
+    while True:
+        candidate = os.path.join(current, PIN_FILE)
+        if os.path.isfile(candidate):
+            found.append(candidate)
+        parent = os.path.dirname(current)
+        if parent == current:
+            break
+        current = parent
+    _walk_cache[directory] = (found, now)
+    return found
+
+
+def pinned_version(tool_name, directory=None):
+    """(version, source) for a tool: the env override, else the nearest pin file naming it"""
+    override = os.environ.get(_env_var(tool_name))
+    if override:
+        return _normalise(override), _env_var(tool_name)
+    for path in pin_files(directory):
+        version = read_pin_file(path).get(tool_name)
+        if version:
+            return version, path
+    return None, None
+
+
+def effective_pins(directory=None):
+    """{tool: (version, pin file)} for every tool pinned at directory, nearest file winning"""
+    pins = {}
+    for path in reversed(pin_files(directory)):
+        for tool_name, version in read_pin_file(path).items():
+            pins[tool_name] = (version, path)
+    return pins
+
+
+def resolve(tool_name, executable=None, directory=None):
+    """Path of the executable to run for tool_name in directory, or None if not installed
+
+    Follows the same rules as the shims, so 'devops-cli pin' shows exactly
+    what a shim would exec.
+    """
+    version, _ = pinned_version(tool_name, directory)
+    if not version or version == SYSTEM:
+        version = store.CURRENT
+    path = store.get_store_dir(tool_name, version, 'bin', executable or tool_name)
+    return path if os.access(path, os.X_OK) else None
+
+
+def write_pin(tool_name, version, directory=None):
+    """Pin tool_name to version in directory's pin file, replacing an existing pin"""
+    path = os.path.join(os.path.abspath(directory or os.getcwd()), PIN_FILE)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    except OSError:
+        lines = []
+    entry = f"{tool_name} {version}"
+    for index, line in enumerate(lines):
+        fields = line.split('#', 1)[0].split()
+        if fields and fields[0] == tool_name:
+            lines[index] = entry
+            break
+    else:
+        lines.append(entry)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    _pin_cache.pop(path, None)
+    _walk_cache.clear()
+    register_pin_file(path)
+    return path
+
+
+def get_registry_path():
+    return get_data_dir('pin-files.json')
+
+
+def registered_pin_files():
+    """Pin files devops-cli has written or installed from, which 'devops-cli gc' keeps versions for"""
+    try:
+        with open(get_registry_path(), 'r', encoding='utf-8') as f:
+            paths = json.load(f)
+    except (OSError, ValueError):
+        return []
+    return [path for path in paths if isinstance(path, str)]
+
+
+def register_pin_file(path):
+    paths = registered_pin_files()
+    if path in paths:
+        return
+    paths = [p for p in paths if os.path.isfile(p)] + [path]
+    os.makedirs(os.path.dirname(get_registry_path()), exist_ok=True)
+    temporary = f"{get_registry_path()}.{os.getpid()}.tmp"
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(paths, f, indent=2)
+    os.replace(temporary, get_registry_path())
+
+
+def pinned_versions(directory=None):
+    """{tool: {versions}} pinned by registered pin files, the directory's pin files and env overrides"""
+    pinned = {}
+    for path in set(registered_pin_files() + pin_files(directory)):
+        for tool_name, version in read_pin_file(path).items():
+            pinned.setdefault(tool_name, set()).add(version)
+    for tool_name in strategies.BINARY_ARTIFACTS:
+        override = os.environ.get(_env_var(tool_name))
+        if override:
+            pinned.setdefault(tool_name, set()).add(_normalise(override))
+    return pinned
+
+
+def write_shims(tool_name, executables):
+    """(Re)write the shims for a tool's executables; returns their paths"""
+    shims_dir = get_shims_dir()
+    os.makedirs(shims_dir, exist_ok=True)
+    written = []
+    for executable in executables:
+        path = os.path.join(shims_dir, executable)
+        content = SHIM_TEMPLATE.format(tool=tool_name, executable=executable, pin_file=PIN_FILE,
+                                       env_var=_env_var(tool_name), system=SYSTEM, store=store.get_store_dir())
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as f:
+            f.write(content)
+        os.chmod(temporary, 0o755)
+        os.replace(temporary, path)
+        written.append(path)
+    return written
+
+
+def shims_first_on_path():
+    """Whether the shims directory comes before the bin directory devops-cli links tools into"""
+    shims_dir = get_shims_dir()
+    for entry in os.environ.get('PATH', '').split(os.pathsep):
+        if os.path.abspath(entry or '.') == shims_dir:
+            return True
+        if os.path.abspath(entry or '.') == get_managed_bin_dir():
+            return False
+    return False
+
+
+def tool_executables(tool_name):
+    _, members = strategies.BINARY_ARTIFACTS[tool_name]
+    return [os.path.basename(member) for member in members]
+
+
+def _install(tool_name, version):
+    """Put a pinned version in the store without changing the globally active one"""
+    if store.has_version(tool_name, version):
+        return True
+    return strategies.install_binary(tool_name, version, activate=store.active_version(tool_name) is None)
+
+
+def _warn_path():
+    if not shims_first_on_path():
+        print(f"⚠️  Put the shims first on your PATH so pins take effect: export PATH=\"{get_shims_dir()}:$PATH\"")
+
+
+def pin_tool(tool_name, version):
+    """'devops-cli pin <tool> <version>': pin in ./.tool-versions, install into the store and write shims"""
+    version = _normalise(version)
+    if not _install(tool_name, version):
+        return False
+    path = write_pin(tool_name, version)
+    write_shims(tool_name, tool_executables(tool_name))
+    print(f"📌 {tool_name} pinned to {version} in {path}")
+    _warn_path()
+    return True
+
+
+def install_pins(directory=None):
+    """'devops-cli pin --install': install every version pinned for directory"""
+    ok = True
+    for path in pin_files(directory):
+        register_pin_file(path)
+    for tool_name, (version, path) in sorted(effective_pins(directory).items()):
+        if tool_name not in strategies.BINARY_ARTIFACTS:
+            print(f"⚠️  {tool_name} (pinned in {path}) has no release binary; skipping")
+            continue
+        if version == SYSTEM:
+            continue
+        if _install(tool_name, version):
+            write_shims(tool_name, tool_executables(tool_name))
+        else:
+            ok = False
+    _warn_path()
+    return ok
+
+
+def refresh_shims():
+    """'devops-cli pin --shims': rewrite shims for every tool in the store"""
+    written = []
+    for tool_name in sorted(strategies.BINARY_ARTIFACTS):
+        if store.list_versions(tool_name):
+            written.extend(write_shims(tool_name, tool_executables(tool_name)))
+    print(f"✅ Wrote {len(written)} shim(s) to {get_shims_dir()}")
+    _warn_path()
+    return True
+
+
+def show_pins(directory=None):
+    """'devops-cli pin': what each tool resolves to here, and why"""
+    directory = os.path.abspath(directory or os.getcwd())
+    print(f"Pinned tools for {directory}:")
+    shown = False
+    for tool_name in sorted(strategies.BINARY_ARTIFACTS):
+        version, source = pinned_version(tool_name, directory)
+        if not version and not store.active_version(tool_name):
+            continue
+        shown = True
+        target = resolve(tool_name, directory=directory)
+        label = f"{version} ({source})" if version else f"{store.active_version(tool_name)} (active)"
+        print(f"  {tool_name:<12} {label:<50} {'✅' if target else '❌ not installed'}")
+    if not shown:
+        print(f"  nothing pinned; add '<tool> <version>' lines to {PIN_FILE} or run 'devops-cli pin <tool> <version>'")
+    return True
@@ -0,0 +1,627 @@
+"""
+External Command Runner for DevOps CLI
+Drop-in replacements for subprocess.run and os.system that record a trace
+span and the resource usage of every command the installers start, serialise
+package-manager commands and prefix output when several tools run at once
+"""
+
+import functools
+import json
+import os
+import re
+import selectors
+import shlex
+import subprocess
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from tracing import span
+from locks import package_manager_lock, wait_for_foreign_locks, PackageManagerBusy
+import metrics
+
+SPAN_NAME_LIMIT = 80
+
+# wait4 gives per-child rusage; waitid(WNOWAIT) lets /proc/<pid>/io be read
+# before the zombie is reaped. Elsewhere commands run without accounting.
+ACCOUNTING_SUPPORTED = hasattr(os, 'wait4') and hasattr(os, 'waitid') and os.path.isdir('/proc')
+
+# Commands that take the dpkg/rpm/brew database lock; only one may run at a time
+PACKAGE_MANAGERS = {
+    'apt', 'apt-get', 'aptitude', 'add-apt-repository', 'dpkg',
+    'yum', 'dnf', 'rpm', 'yum-config-manager', 'zypper', 'snap', 'brew',
+}
+# Invocations that only read the package database and need no lock
+READ_ONLY_PREFIXES = {
+    'apt': ('list', 'show', 'search', 'policy'),
+    'dpkg': ('-l', '--list', '-s', '--status', '-L', '--listfiles', '-S', '--search', '--print-architecture'),
+    'rpm': ('-q', '--query', '--eval'),
+}
+# Wrappers whose first non-option argument is the real command
+COMMAND_WRAPPERS = ('sudo', 'env', 'nohup', 'nice')
+SHELL_SEPARATORS = re.compile(r'&&|\|\||;|\||\n')
+
+_records = []
+_records_lock = threading.Lock()
+_output_lock = threading.Lock()
+_local = threading.local()
+
+
+class ProcessUsage:
+    """Resources one child process (and the children it waited for) consumed"""
+
+    def __init__(self, command, scope):
+        self.command = command
+        self.scope = scope
+        self.wall = 0.0
+        self.returncode = None
+        self.user_cpu = None
+        self.system_cpu = None
+        self.max_rss_kb = None
+        self.read_bytes = None
+        self.write_bytes = None
+
+    def to_dict(self):
+        return {
+            'command': self.command,
+            'scope': self.scope,
+            'wall': round(self.wall, 3),
+            'returncode': self.returncode,
+            'user_cpu': self.user_cpu,
+            'system_cpu': self.system_cpu,
+            'max_rss_kb': self.max_rss_kb,
+            'read_bytes': self.read_bytes,
+            'write_bytes': self.write_bytes,
+        }
+
+
+class UsageScope:
+    """Commands run on one thread while the scope is active, e.g. one install step"""
+
+    def __init__(self, name):
+        self.name = name
+        self.records = []
+
+    def totals(self):
+        return summarise(self.records)
+
+
+def _read_proc_io(pid):
+    """Storage bytes read/written by a (zombie) process and the children it reaped"""
+    counters = {}
+    try:
+        with open(f'/proc/{pid}/io', 'r') as f:
+            for line in f:
+                key, _, value = line.partition(':')
+                counters[key.strip()] = int(value)
+    except (OSError, ValueError):
+        return None, None
+    return counters.get('read_bytes'), counters.get('write_bytes')
+
+
+class AccountedPopen(subprocess.Popen):
+    """Popen that reaps its child with wait4 and keeps the resource usage"""
+
+    usage = None
+
+    def _try_wait(self, wait_flags):
+        if not ACCOUNTING_SUPPORTED or self.usage is None:
+            return super()._try_wait(wait_flags)
+        try:
+            # Wait without reaping so /proc/<pid>/io is still readable
+            exited = os.waitid(os.P_PID, self.pid, os.WEXITED | os.WNOWAIT | wait_flags)
+            if exited is None:
+                return (0, 0)
+            self.usage.read_bytes, self.usage.write_bytes = _read_proc_io(self.pid)
+            pid, status, rusage = os.wait4(self.pid, wait_flags)
+        except ChildProcessError:
+            return (self.pid, 0)
+        if pid:
+            self.usage.user_cpu = round(rusage.ru_utime, 3)
+            self.usage.system_cpu = round(rusage.ru_stime, 3)
+            self.usage.max_rss_kb = rusage.ru_maxrss
+        return (pid, status)
+
+
+def _command_lines(command):
+    """Split a command list or shell string into the argument lists it runs"""
+    if isinstance(command, (list, tuple)):
+        return [[str(part) for part in command]]
+    lines = []
+    for segment in SHELL_SEPARATORS.split(str(command)):
+        try:
+            words = shlex.split(segment)
+        except ValueError:
+            words = segment.split()
+        if words:
+            lines.append(words)
+    return lines
+
+
+def _program(words):
+    """The program a command line really runs, skipping sudo/env and their options"""
+    index = 0
+    while index < len(words):
+        word = words[index]
+        name = os.path.basename(word)
+        if name in COMMAND_WRAPPERS or word.startswith('-') or ('=' in word and not word.startswith('=')):
+            index += 1
+            continue
+        return name, words[index + 1:]
+    return None, []
+
+
+def needs_package_manager_lock(command):
+    """Whether the command changes the system package database"""
+    for words in _command_lines(command):
+        name, arguments = _program(words)
+        if name not in PACKAGE_MANAGERS:
+            continue
+        read_only = READ_ONLY_PREFIXES.get(name, ())
+        if read_only and arguments and arguments[0].startswith(read_only):
+            continue
+        return True
+    return False
+
+
+@contextmanager
+def _package_manager_guard(command):
+    if not needs_package_manager_lock(command):
+        yield
+        return
+    # package_manager_lock is reentrant, so a step holding the package-manager
+    # resource can still run apt itself; it also queues other devops-cli processes.
+    with span('waiting for package manager', 'wait', command=describe(command)):
+        try:
+            package_manager_lock.acquire()
+        except PackageManagerBusy:
+            metrics.record_failure('package_manager_busy')
+            raise
+        try:
+            wait_for_foreign_locks()
+        except BaseException as e:
+            package_manager_lock.release()
+            if isinstance(e, PackageManagerBusy):
+                metrics.record_failure('package_manager_busy')
+            raise
+    try:
+        yield
+    finally:
+        package_manager_lock.release()
+
+
+class LabelledStdout:
+    """sys.stdout replacement that prefixes each line with the writing thread's output label"""
+
+    def __init__(self, stream, width=0):
+        self.stream = stream
+        self.width = width
+        self._partial = {}
+
+    def write(self, text):
+        label = getattr(_local, 'label', None)
+        if label is None:
+            with _output_lock:
+                return self.stream.write(text)
+        key = threading.get_ident()
+        lines = (self._partial.pop(key, '') + text).split('\n')
+        if lines[-1]:
+            self._partial[key] = lines[-1]
+        with _output_lock:
+            for line in lines[:-1]:
+                self.stream.write(f"[{label:<{self.width}}] {line}\n")
+            self.stream.flush()
+        return len(text)
+
+    def relay_line(self, label, line, kind='out'):
+        """One line a child wrote to its stdout or stderr (kind), under the label of the thread that started it"""
+        with _output_lock:
+            self.stream.write(f"[{label:<{self.width}}] {line}\n")
+            self.stream.flush()
+
+    def end_line(self):
+        """Write out whatever the current thread left without a newline"""
+        if threading.get_ident() in self._partial:
+            self.write('\n')
+
+    def flush(self):
+        with _output_lock:
+            self.stream.flush()
+
+    def __getattr__(self, name):
+        return getattr(self.stream, name)
+
+
+def output_label():
+    return getattr(_local, 'label', None)
+
+
+@contextmanager
+def labelled_output(label):
+    """Prefix what this thread prints, and the output of the commands it runs, with [label]
+
+    Only has a visible effect while sys.stdout is a LabelledStdout.
+    """
+    previous = getattr(_local, 'label', None)
+    _local.label = label
+    try:
+        yield
+    finally:
+        if isinstance(sys.stdout, LabelledStdout):
+            sys.stdout.end_line()
+        _local.label = previous
+
+
+def thread_context():
+    """This thread's output label and accounting scopes, to hand to worker threads"""
+    return {'label': output_label(), 'scopes': list(getattr(_local, 'scopes', None) or [])}
+
+
+@contextmanager
+def inherited_context(context):
+    """Run worker-thread code under the label and accounting scopes of the thread that queued it"""
+    previous = getattr(_local, 'scopes', None)
+    _local.scopes = list(context['scopes'])
+    try:
+        with labelled_output(context['label']):
+            yield
+    finally:
+        _local.scopes = previous
+
+
+class PipePump:
+    """One thread that reads every relayed child pipe without blocking and hands out whole lines
+
+    Pipes are switched to non-blocking mode and polled with a selector, so
+    any number of concurrent commands cost one thread, and a child that
+    writes a lot without newlines is passed on in MAX_LINE chunks rather than
+    buffered.
+    """
+
+    MAX_LINE = 64 * 1024
+    READ_SIZE = 64 * 1024
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._selector = None
+        self._wake_read = self._wake_write = None
+        self._thread = None
+
+    def _start(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        self._selector.register(self._wake_read, selectors.EVENT_READ, None)
+        self._thread = threading.Thread(target=self._loop, name='pipe-pump', daemon=True)
+        self._thread.start()
+
+    def watch(self, pipe, label, target, kind='out'):
+        """Relay pipe's lines to target.relay_line(label, line, kind); returns an Event set at EOF"""
+        done = threading.Event()
+        fd = pipe.fileno()
+        os.set_blocking(fd, False)
+        with self._lock:
+            if self._thread is None:
+                self._start()
+            self._selector.register(fd, selectors.EVENT_READ, {
+                'pipe': pipe, 'label': label, 'target': target, 'kind': kind, 'partial': b'', 'done': done,
+            })
+        os.write(self._wake_write, b'x')  # make the loop select() again with the new pipe
+        return done
+
+    def forget(self, pipe):
+        """Stop reading a pipe before its EOF, e.g. one a daemonised grandchild keeps open"""
+        with self._lock:
+            try:
+                key = self._selector.unregister(pipe.fileno())
+            except (KeyError, ValueError, OSError):
+                return
+        key.data['done'].set()
+
+    def _emit(self, state, data):
+        # '\r' ends a line too: progress bars redraw with it
+        for line in re.split(r'\r\n|\r|\n', data.decode('utf-8', errors='replace')):
+            if line:
+                state['target'].relay_line(state['label'], line, state['kind'])
+
+    def _loop(self):
+        while True:
+            for key, _ in self._selector.select():
+                if key.data is None:
+                    try:
+                        os.read(self._wake_read, 4096)
+                    except BlockingIOError:
+                        pass
+                    continue
+                state = key.data
+                try:
+                    chunk = os.read(key.fd, self.READ_SIZE)
+                except BlockingIOError:
+                    continue
+                except OSError:
+                    chunk = b''
+                if not chunk:
+                    with self._lock:
+                        self._selector.unregister(key.fd)
+                    if state['partial']:
+                        self._emit(state, state['partial'])
+                    state['pipe'].close()
+                    state['done'].set()
+                    continue
+                data = state['partial'] + chunk
+                cut = max(data.rfind(b'\n'), data.rfind(b'\r'))
+                if cut >= 0:
+                    self._emit(state, data[:cut])
+                    data = data[cut + 1:]
+                if len(data) >= self.MAX_LINE:
+                    self._emit(state, data)
+                    data = b''
+                state['partial'] = data
+
+
+_pump = PipePump()
+
+
+def relay_output(child, label, target=None):
+    """Relay a child's stdout and stderr pipes (whichever are pipes) line by line; returns a wait function"""
+    target = target or sys.stdout
+    watched = [(pipe, _pump.watch(pipe, label, target, kind))
+               for pipe, kind in ((child.stdout, 'out'), (child.stderr, 'err')) if pipe is not None]
+
+    def wait(timeout=None):
+        deadline = None if timeout is None else time.time() + timeout
+        for pipe, done in watched:
+            if not done.wait(None if deadline is None else max(0, deadline - time.time())):
+                _pump.forget(pipe)
+    return wait
+
+
+def describe(command):
+    """Short, readable span name for a command list or shell string"""
+    if isinstance(command, (list, tuple)):
+        text = ' '.join(shlex.quote(str(part)) for part in command)
+    else:
+        text = str(command)
+    return text if len(text) <= SPAN_NAME_LIMIT else text[:SPAN_NAME_LIMIT - 3] + '...'
+
+
+@contextmanager
+def accounting_scope(name):
+    """Attribute commands run on this thread to a named scope (a step or a tool)"""
+    scope = UsageScope(name)
+    stack = getattr(_local, 'scopes', None)
+    if stack is None:
+        stack = _local.scopes = []
+    stack.append(scope)
+    try:
+        yield scope
+    finally:
+        stack.pop()
+
+
+def accounted(name):
+    """Decorator running every call in an accounting scope; name(*args, **kwargs) builds its name"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            with accounting_scope(name(*args, **kwargs)):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def _start_usage(command):
+    stack = getattr(_local, 'scopes', None) or []
+    return ProcessUsage(describe(command), stack[-1].name if stack else None)
+
+
+def _finish_usage(usage, returncode, start, details):
+    usage.wall = time.time() - start
+    usage.returncode = returncode
+    for scope in getattr(_local, 'scopes', None) or []:
+        scope.records.append(usage)
+    with _records_lock:
+        _records.append(usage)
+    details.update({key: value for key, value in usage.to_dict().items()
+                    if key not in ('command', 'scope', 'wall') and value is not None})
+
+
+def _run_accounted(command, usage, input=None, capture_output=False, timeout=None, check=False, relay=None,
+                   **kwargs):
+    """subprocess.run, built on AccountedPopen; relay=label streams the output with that prefix"""
+    if input is not None:
+        if kwargs.get('stdin') is not None:
+            raise ValueError('stdin and input arguments may not both be used.')
+        kwargs['stdin'] = subprocess.PIPE
+    if capture_output:
+        if kwargs.get('stdout') is not None or kwargs.get('stderr') is not None:
+            raise ValueError('stdout and stderr arguments may not be used with capture_output.')
+        kwargs['stdout'] = subprocess.PIPE
+        kwargs['stderr'] = subprocess.PIPE
+    if relay is not None:
+        kwargs['stdout'] = subprocess.PIPE
+        kwargs['stderr'] = subprocess.PIPE
+
+    with AccountedPopen(command, **kwargs) as child:
+        child.usage = usage
+        reader = relay_output(child, relay) if relay is not None else None
+        try:
+            if reader is None:
+                stdout, stderr = child.communicate(input, timeout=timeout)
+            else:
+                stdout = stderr = None
+                child.wait(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            child.kill()
+            child.wait()
+            raise
+        except BaseException:
+            child.kill()
+            raise
+        finally:
+            if reader is not None:
+                reader(timeout=5)
+        returncode = child.poll()
+        if check and returncode:
+            raise subprocess.CalledProcessError(returncode, child.args, output=stdout, stderr=stderr)
+    return subprocess.CompletedProcess(child.args, returncode, stdout, stderr)
+
+
+def run(command, *args, **kwargs):
+    """subprocess.run with a trace span and resource accounting; same arguments, result and exceptions
+
+    Package-manager commands wait for package_manager_lock. Under a
+    labelled_output() label, output that is not redirected is relayed with the label.
+    """
+    with _package_manager_guard(command):
+        return _run(command, *args, **kwargs)
+
+
+def _wants_relay(kwargs):
+    return (output_label() is not None and isinstance(sys.stdout, LabelledStdout)
+            and not kwargs.get('capture_output') and kwargs.get('input') is None
+            and kwargs.get('stdout') is None and kwargs.get('stderr') is None)
+
+
+def _run(command, *args, **kwargs):
+    full = command if isinstance(command, str) else [str(part) for part in command]
+    usage = _start_usage(command)
+    start = time.time()
+    with span(describe(command), 'process', command=full) as details:
+        returncode = None
+        try:
+            if args or not ACCOUNTING_SUPPORTED:
+                result = subprocess.run(command, *args, **kwargs)
+            else:
+                relay = output_label() if _wants_relay(kwargs) else None
+                result = _run_accounted(command, usage, relay=relay, **kwargs)
+            returncode = result.returncode
+            return result
+        except subprocess.CalledProcessError as e:
+            returncode = e.returncode
+            metrics.record_failure('command_failed')
+            raise
+        except subprocess.TimeoutExpired:
+            metrics.record_failure('command_timeout')
+            raise
+        except FileNotFoundError:
+            metrics.record_failure('command_not_found')
+            raise
+        finally:
+            _finish_usage(usage, returncode, start, details)
+
+
+def system(command):
+    """os.system with a trace span and resource accounting; returns the same wait status
+
+    Serialised and relayed like run().
+    """
+    with _package_manager_guard(command):
+        return _system(command)
+
+
+def _system(command):
+    if not ACCOUNTING_SUPPORTED:
+        with span(describe(command), 'process', command=command) as details:
+            status = os.system(command)
+            details['status'] = status
+            return status
+
+    usage = _start_usage(command)
+    start = time.time()
+    with span(describe(command), 'process', command=command) as details:
+        returncode = None
+        try:
+            relay = output_label() if _wants_relay({}) else None
+            pipes = {'stdout': subprocess.PIPE, 'stderr': subprocess.PIPE} if relay is not None else {}
+            with AccountedPopen(command, shell=True, **pipes) as child:
+                child.usage = usage
+                reader = relay_output(child, relay) if relay is not None else None
+                returncode = child.wait()
+                if reader is not None:
+                    reader(timeout=5)
+        finally:
+            _finish_usage(usage, returncode, start, details)
+    # os.system reports a wait status, not an exit code
+    return -returncode if returncode < 0 else returncode << 8
+
+
+def summarise(records):
+    """Add up the usage of several commands; peak RSS is the largest single child"""
+    def total(key):
+        values = [getattr(record, key) for record in records if getattr(record, key) is not None]
+        return sum(values) if values else None
+
+    rss = [record.max_rss_kb for record in records if record.max_rss_kb is not None]
+    return {
+        'commands': len(records),
+        'wall': round(sum(record.wall for record in records), 3),
+        'user_cpu': total('user_cpu'),
+        'system_cpu': total('system_cpu'),
+        'max_rss_kb': max(rss) if rss else None,
+        'read_bytes': total('read_bytes'),
+        'write_bytes': total('write_bytes'),
+    }
+
+
+def reset_usage_records():
+    with _records_lock:
+        del _records[:]
+
+
+def get_usage_records():
+    with _records_lock:
+        return list(_records)
+
+
+def usage_report():
+    """Per-scope totals plus every command, ready for JSON export"""
+    records = get_usage_records()
+    scopes = {}
+    for record in records:
+        scopes.setdefault(record.scope or '-', []).append(record)
+    return {
+        'supported': ACCOUNTING_SUPPORTED,
+        'total': summarise(records),
+        'scopes': {name: summarise(scope_records) for name, scope_records in scopes.items()},
+        'commands': [record.to_dict() for record in records],
+    }
+
+
+def _format_bytes(value):
+    if value is None:
+        return '-'
+    for unit in ('B', 'KiB', 'MiB', 'GiB'):
+        if value < 1024 or unit == 'GiB':
+            return f"{value:.0f}{unit}" if unit == 'B' else f"{value:.1f}{unit}"
+        value /= 1024.0
+
+
+def print_usage_summary():
+    """Print CPU, peak RSS and disk I/O per scope for everything run so far"""
+    report = usage_report()
+    if not report['commands']:
+        return
+    if not report['supported']:
+        print("\nResource accounting is only available on Linux.")
+        return
+
+    rows = sorted(report['scopes'].items(), key=lambda item: (item[1]['user_cpu'] or 0) + (item[1]['system_cpu'] or 0),
+                  reverse=True)
+    width = max([len(name) for name, _ in rows] + [5])
+    print("\nResource usage:")
+    print(f"{'SCOPE':<{width}}  {'CMDS':>4} {'WALL':>8} {'CPU':>8} {'PEAK RSS':>10} {'READ':>10} {'WRITTEN':>10}")
+    for name, totals in rows + [('total', report['total'])]:
+        cpu = (totals['user_cpu'] or 0) + (totals['system_cpu'] or 0)
+        rss = _format_bytes(totals['max_rss_kb'] * 1024) if totals['max_rss_kb'] is not None else '-'
+        print(f"{name:<{width}}  {totals['commands']:>4} {totals['wall']:>7.1f}s {cpu:>7.1f}s {rss:>10} "
+              f"{_format_bytes(totals['read_bytes']):>10} {_format_bytes(totals['write_bytes']):>10}")
+
+
+def write_usage_json(path):
+    partial = f"{path}.part"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump(usage_report(), f, indent=2)
+    os.replace(partial, path)
+    return path
@@ -19,7 +19,7 @@ setup(
     author_email="tohidhanfi20@gmail.com",
     url="https://github.com/tohidhanfi20/devops-cli",
     packages=find_packages(),
-    py_modules=["main", "versioning", "utils", "interactive", "dependencies", "enhanced_versioning"],
+    py_modules=["main", "versioning", "utils", "interactive", "dependencies", "enhanced_versioning", "downloads", "integrity", "mirror", "bundle", "fleet", "detection", "inspection", "steps", "tracing", "process", "metrics", "manifest", "updates", "locks", "strategies", "store", "pins", "dedup", "garbage", "client", "daemon", "output"],
     install_requires=[
         "requests>=2.28.0",
         "beautifulsoup4>=4.11.0",
@@ -28,8 +28,8 @@ setup(
     ],
     entry_points={
         "console_scripts": [
-            "devops-cli=main:main",
-            "devops=main:main",  # Alternative shorter command
+            "devops-cli=client:main",
+            "devops=client:main",  # Alternative shorter command
         ],
     },
     classifiers=[
@@ -0,0 +1,178 @@
+"""
+Installation Step Graph for DevOps CLI
+Runs installer steps as a dependency graph: independent steps overlap while
+shared resources such as the package-manager lock are held by one step at a time
+"""
+
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from tracing import span
+from process import accounting_scope, inherited_context, thread_context
+from locks import package_manager_lock
+import metrics
+
+# Resource classes a step can declare
+NETWORK = 'network'
+PACKAGE_MANAGER = 'package-manager'
+CPU = 'cpu'
+
+# How many steps may hold each resource at once, across every running graph.
+# apt/dpkg, yum/rpm and brew all refuse to run twice, hence the mutex.
+RESOURCE_LIMITS = {
+    NETWORK: 4,
+    PACKAGE_MANAGER: 1,
+    CPU: os.cpu_count() or 1,
+}
+
+_resource_slots = {name: threading.BoundedSemaphore(limit) for name, limit in RESOURCE_LIMITS.items()}
+# Shared with the process layer, which takes it for every apt/dpkg/yum/rpm
+# command, and with other devops-cli processes through a lock file
+_resource_slots[PACKAGE_MANAGER] = package_manager_lock
+
+
+class StepGraphError(Exception):
+    """Raised for graphs with unknown dependencies or cycles"""
+
+
+class StepFailed(Exception):
+    """Raised when a step fails; the original exception is chained as __cause__"""
+
+    def __init__(self, step, error):
+        super().__init__(f"{step.name}: {error}")
+        self.step = step
+        self.error = error
+
+
+class Step:
+    """One unit of installer work"""
+
+    def __init__(self, name, action, after=(), resources=(), description=None):
+        self.name = name
+        self.action = action
+        self.after = list(after)
+        self.resources = sorted(set(resources))
+        self.description = description or name
+        self.duration = None
+        self.usage = None
+
+
+def acquire_resources(resources):
+    """Take resource slots in a fixed order so concurrent graphs cannot deadlock"""
+    taken = []
+    try:
+        for resource in sorted(resources):
+            _resource_slots[resource].acquire()
+            taken.append(resource)
+    except BaseException:
+        release_resources(taken)
+        raise
+
+
+def release_resources(resources):
+    for resource in sorted(resources, reverse=True):
+        _resource_slots[resource].release()
+
+
+class StepGraph:
+    """A set of steps with declared dependencies and resource classes"""
+
+    def __init__(self, name):
+        self.name = name
+        self.steps = {}
+
+    def add(self, name, action, after=(), resources=(), description=None):
+        """Add a step; 'after' names the steps that must finish first"""
+        if name in self.steps:
+            raise StepGraphError(f"Duplicate step '{name}' in {self.name}")
+        self.steps[name] = Step(name, action, after, resources, description)
+        return self.steps[name]
+
+    def validate(self):
+        """Reject unknown dependencies and cycles"""
+        for step in self.steps.values():
+            for dependency in step.after:
+                if dependency not in self.steps:
+                    raise StepGraphError(f"Step '{step.name}' depends on unknown step '{dependency}'")
+            unknown = set(step.resources) - set(RESOURCE_LIMITS)
+            if unknown:
+                raise StepGraphError(f"Step '{step.name}' uses unknown resources: {', '.join(sorted(unknown))}")
+
+        visiting, done = set(), set()
+
+        def visit(name, chain):
+            if name in done:
+                return
+            if name in visiting:
+                raise StepGraphError(f"Dependency cycle in {self.name}: {' -> '.join(chain + [name])}")
+            visiting.add(name)
+            for dependency in self.steps[name].after:
+                visit(dependency, chain + [name])
+            visiting.discard(name)
+            done.add(name)
+
+        for name in self.steps:
+            visit(name, [])
+
+    def _run_step(self, step, context, labels):
+        """Run one step on a worker thread, as if on the thread that started the graph"""
+        with inherited_context(context), metrics.labels_context(**labels):
+            if step.resources:
+                with span(f"{self.name}: waiting for {', '.join(step.resources)}", 'wait'):
+                    acquire_resources(step.resources)
+            try:
+                print(f"▶️  {step.description}...")
+                start = time.time()
+                with span(f"{self.name}: {step.name}", 'step', resources=step.resources), \
+                        accounting_scope(f"{self.name}: {step.name}") as scope, \
+                        metrics.timer('devops_cli_phase_duration_seconds', tool=metrics.current_tool(), phase=step.name):
+                    step.action()
+                step.duration = time.time() - start
+                step.usage = scope.totals()
+            finally:
+                release_resources(step.resources)
+        return step
+
+    def run(self, max_workers=4):
+        """Run every step once its dependencies have finished
+
+        Independent steps run concurrently. After the first failure no new
+        steps start; running ones are allowed to finish and StepFailed is raised.
+        """
+        self.validate()
+        pending = dict(self.steps)
+        finished = set()
+        running = {}
+        failure = None
+        context, labels = thread_context(), metrics.current_labels()
+        start = time.time()
+
+        with ThreadPoolExecutor(max_workers=max_workers) as pool:
+            while pending or running:
+                if failure is None:
+                    ready = [step for step in pending.values() if all(d in finished for d in step.after)]
+                    for step in ready:
+                        del pending[step.name]
+                        running[pool.submit(self._run_step, step, context, labels)] = step
+                if not running:
+                    break
+
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in completed:
+                    step = running.pop(future)
+                    try:
+                        future.result()
+                        finished.add(step.name)
+                    except Exception as e:
+                        if failure is None:
+                            failure = StepFailed(step, e)
+                            failure.__cause__ = e
+
+        if failure is not None:
+            raise failure
+        serial = sum(step.duration or 0 for step in self.steps.values())
+        print(f"⏱️  {self.name}: {len(self.steps)} steps in {time.time() - start:.1f}s "
+              f"({serial:.1f}s if run one after another)")
+        return True
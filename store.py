@@ -0,0 +1,220 @@
+"""
+Versioned Tool Store for DevOps CLI
+Keeps every installed version of a binary-distributed tool side by side under
+<prefix>/share/devops-cli/store/<tool>/<version>/ and activates one by
+atomically swapping a 'current' symlink, so switching and rolling back are instant
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+from packaging import version as version_parser
+
+from utils import get_data_dir, get_managed_bin_dir
+import dedup
+import process
+
+CURRENT = 'current'
+PREVIOUS = 'previous'
+ENTRY_FILE = 'entry.json'
+STAGING_PREFIX = '.staging-'
+TRASH_PREFIX = '.trash-'
+
+
+class StoreError(Exception):
+    """Raised for versions that are not in the store or links that cannot be made"""
+
+
+def get_store_dir(*parts):
+    """The store root (DEVOPS_CLI_STORE, else <data dir>/store)"""
+    base = os.environ.get('DEVOPS_CLI_STORE') or get_data_dir('store')
+    return os.path.join(os.path.abspath(os.path.expanduser(base)), *parts)
+
+
+def _version_key(name):
+    try:
+        return (1, version_parser.parse(name))
+    except version_parser.InvalidVersion:
+        return (0, name)
+
+
+def list_versions(tool_name):
+    """Complete versions of a tool in the store, newest first"""
+    tool_dir = get_store_dir(tool_name)
+    try:
+        names = os.listdir(tool_dir)
+    except OSError:
+        return []
+    found = [name for name in names
+             if not name.startswith('.') and name not in (CURRENT, PREVIOUS)
+             and os.path.isfile(os.path.join(tool_dir, name, ENTRY_FILE))]
+    return sorted(found, key=_version_key, reverse=True)
+
+
+def has_version(tool_name, tool_version):
+    return os.path.isfile(get_store_dir(tool_name, tool_version, ENTRY_FILE))
+
+
+def read_entry(tool_name, tool_version):
+    try:
+        with open(get_store_dir(tool_name, tool_version, ENTRY_FILE), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _linked_version(tool_name, name):
+    try:
+        return os.readlink(get_store_dir(tool_name, name))
+    except OSError:
+        return None
+
+
+def active_version(tool_name):
+    return _linked_version(tool_name, CURRENT)
+
+
+def previous_version(tool_name):
+    return _linked_version(tool_name, PREVIOUS)
+
+
+@contextmanager
+def stage(tool_name, tool_version, **details):
+    """Yield a bin directory to fill; on success it becomes <tool>/<version> in one rename"""
+    tool_dir = get_store_dir(tool_name)
+    os.makedirs(tool_dir, exist_ok=True)
+    staging = tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=tool_dir)
+    try:
+        os.makedirs(os.path.join(staging, 'bin'))
+        yield os.path.join(staging, 'bin')
+        files = dedup.index_files(staging)
+        stats = dedup.dedup_tree(staging, files, _stored_files())
+        if stats.files_linked:
+            print(f"♻️  {tool_name} {tool_version}: {stats.files_linked} file(s) identical to other stored "
+                  f"versions, {dedup.format_bytes(stats.bytes_saved)} saved ({stats.method})")
+        entry = dict(details, tool=tool_name, version=tool_version, installed_at=time.time(),
+                     executables=sorted(os.listdir(os.path.join(staging, 'bin'))), files=files)
+        with open(os.path.join(staging, ENTRY_FILE), 'w', encoding='utf-8') as f:
+            json.dump(entry, f, indent=2)
+        try:
+            os.rename(staging, os.path.join(tool_dir, tool_version))
+        except OSError:
+            # A concurrent run stored the same version first; keep theirs
+            if not has_version(tool_name, tool_version):
+                raise
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def list_tools():
+    try:
+        return sorted(name for name in os.listdir(get_store_dir()) if not name.startswith('.'))
+    except OSError:
+        return []
+
+
+def _stored_files():
+    """(size, sha256) -> path for the files of every stored version, from their entries"""
+    candidates = {}
+    for tool_name in list_tools():
+        for tool_version in list_versions(tool_name):
+            root = get_store_dir(tool_name, tool_version)
+            for relpath, (size, digest) in read_entry(tool_name, tool_version).get('files', {}).items():
+                candidates.setdefault((size, digest), os.path.join(root, relpath))
+    return candidates
+
+
+def dedup_store(dry_run=False):
+    """Share identical files between all stored versions, e.g. ones stored before dedup; returns DedupStats"""
+    total = dedup.DedupStats()
+    candidates = {}
+    for tool_name in list_tools():
+        for tool_version in reversed(list_versions(tool_name)):
+            entry = read_entry(tool_name, tool_version)
+            root = get_store_dir(tool_name, tool_version)
+            files = dedup.index_files(root, skip=(ENTRY_FILE,))
+            total.add(dedup.dedup_tree(root, files, candidates, dry_run=dry_run))
+            if not dry_run and files != entry.get('files'):
+                entry['files'] = files
+                with open(os.path.join(root, ENTRY_FILE), 'w', encoding='utf-8') as f:
+                    json.dump(entry, f, indent=2)
+    return total
+
+
+def _swap_symlink(target, link_path):
+    """Point link_path at target in one atomic rename"""
+    temporary = f"{link_path}.{os.getpid()}.tmp"
+    if os.path.lexists(temporary):
+        os.remove(temporary)
+    os.symlink(target, temporary)
+    os.replace(temporary, link_path)
+
+
+def _link_executable(target, link_path):
+    """Make <prefix>/bin/<name> a symlink into the store, with sudo for system prefixes"""
+    if os.path.islink(link_path) and os.readlink(link_path) == target:
+        return link_path
+    directory = os.path.dirname(link_path)
+    try:
+        os.makedirs(directory, exist_ok=True)
+    except OSError:
+        pass
+    if os.access(directory, os.W_OK):
+        _swap_symlink(target, link_path)
+    else:
+        process.run(['sudo', 'mkdir', '-p', directory], check=True, timeout=30)
+        process.run(['sudo', 'ln', '-sfn', target, link_path], check=True, timeout=30)
+    return link_path
+
+
+def activate(tool_name, tool_version):
+    """Make tool_version the one on PATH; returns the <prefix>/bin links
+
+    Links in <prefix>/bin point through <tool>/current, so switching
+    versions is a single symlink swap that running shells see at once.
+    The version that was active is remembered for rollback().
+    """
+    if not has_version(tool_name, tool_version):
+        raise StoreError(f"{tool_name} {tool_version} is not in the store ({get_store_dir(tool_name)})")
+    current = active_version(tool_name)
+    if current and current != tool_version and has_version(tool_name, current):
+        _swap_symlink(current, get_store_dir(tool_name, PREVIOUS))
+    _swap_symlink(tool_version, get_store_dir(tool_name, CURRENT))
+    try:
+        os.utime(get_store_dir(tool_name, tool_version))  # last used, for 'devops-cli gc'
+    except OSError:
+        pass
+
+    bin_dir = get_managed_bin_dir()
+    links = []
+    for name in read_entry(tool_name, tool_version).get('executables', []):
+        target = get_store_dir(tool_name, CURRENT, 'bin', name)
+        links.append(_link_executable(target, os.path.join(bin_dir, name)))
+    return links
+
+
+def rollback(tool_name):
+    """Switch back to the previously active version; returns (version, links)"""
+    previous = previous_version(tool_name)
+    if not previous or not has_version(tool_name, previous):
+        raise StoreError(f"No previous {tool_name} version to roll back to")
+    return previous, activate(tool_name, previous)
+
+
+def remove_version(tool_name, tool_version):
+    """Delete a stored version that is not active"""
+    if tool_version == active_version(tool_name):
+        raise StoreError(f"{tool_name} {tool_version} is active; switch to another version first")
+    if previous_version(tool_name) == tool_version:
+        os.remove(get_store_dir(tool_name, PREVIOUS))
+    # Rename first so the version disappears atomically for list_versions() and
+    # activate(); put it back if another process activated it meanwhile
+    trash = get_store_dir(tool_name, f"{TRASH_PREFIX}{tool_version}-{os.getpid()}")
+    os.rename(get_store_dir(tool_name, tool_version), trash)
+    if active_version(tool_name) == tool_version:
+        os.rename(trash, get_store_dir(tool_name, tool_version))
+        raise StoreError(f"{tool_name} {tool_version} was activated while being removed")
+    shutil.rmtree(trash, ignore_errors=True)
@@ -0,0 +1,225 @@
+"""
+Install Strategies for DevOps CLI
+Chooses, per tool and per host, between installing a tool's static release
+binary into the versioned store ('binary') and the system package manager ('package')
+"""
+
+import json
+import os
+import shutil
+import subprocess
+import time
+
+from utils import get_os, get_linux_distro, get_platform_tag, get_managed_bin_dir
+from versioning import resolve_version, get_artifact_url
+from integrity import get_expected_sha256
+from downloads import download_file, extract_tar_stream, extract_zip_stream
+from detection import VERSION_ARGS, parse_version_output
+import process
+import store
+
+AUTO = 'auto'
+BINARY = 'binary'
+PACKAGE = 'package'
+STRATEGIES = (AUTO, BINARY, PACKAGE)
+
+# Release artifacts that are (or contain) a ready-to-run executable:
+# tool -> (artifact type, executables inside it). '{os}', '{arch}' and
+# '{version}' are filled in from the platform tag and the resolved version.
+BINARY_ARTIFACTS = {
+    'kubectl': ('raw', ['kubectl']),
+    'helm': ('tar', ['{os}-{arch}/helm']),
+    'terraform': ('zip', ['terraform']),
+    'prometheus': ('tar', ['prometheus-{version}.{os}-{arch}/prometheus',
+                           'prometheus-{version}.{os}-{arch}/promtool']),
+}
+BINARY_PLATFORMS = ('linux-amd64', 'linux-arm64', 'darwin-amd64', 'darwin-arm64')
+
+_override = None
+
+
+def set_strategy(strategy):
+    """Force a strategy for every tool in this run (from --strategy); returns the previous override"""
+    global _override
+    previous, _override = _override, strategy
+    return previous
+
+
+def get_config_path():
+    base = os.environ.get('XDG_CONFIG_HOME') or os.path.expanduser('~/.config')
+    return os.path.join(base, 'devops-cli', 'strategies.json')
+
+
+def load_config():
+    """Host preferences: {"default": "binary", "tools": {"kubectl": "package"}}"""
+    try:
+        with open(get_config_path(), 'r', encoding='utf-8') as f:
+            config = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return config if isinstance(config, dict) else {}
+
+
+def supports_binary(tool_name, platform_tag=None):
+    return tool_name in BINARY_ARTIFACTS and (platform_tag or get_platform_tag()) in BINARY_PLATFORMS
+
+
+def configured_strategy(tool_name):
+    """The strategy asked for, most specific first: --strategy, env per tool, config per tool, env, config"""
+    config = load_config()
+    for candidate in (
+        _override,
+        os.environ.get(f"DEVOPS_CLI_STRATEGY_{tool_name.upper()}"),
+        (config.get('tools') or {}).get(tool_name),
+        os.environ.get('DEVOPS_CLI_STRATEGY'),
+        config.get('default'),
+    ):
+        if candidate in STRATEGIES:
+            return candidate
+    return AUTO
+
+
+def choose_strategy(tool_name):
+    """Resolve the configured strategy to 'binary' or 'package' for this host
+
+    'auto' uses the release binary on Linux, where the package route means
+    adding a vendor repository and refreshing the index, and the package
+    manager elsewhere.
+    """
+    strategy = configured_strategy(tool_name)
+    if strategy == PACKAGE or not supports_binary(tool_name):
+        if strategy == BINARY:
+            print(f"⚠️  No release binary of {tool_name} for {get_platform_tag()}; using the package manager")
+        return PACKAGE
+    if strategy == BINARY:
+        return BINARY
+    return BINARY if get_os() == 'Linux' else PACKAGE
+
+
+def use_binary(tool_name):
+    return choose_strategy(tool_name) == BINARY
+
+
+def fetch_binaries(tool_name, version, url, sha256, dest_dir, platform_tag=None):
+    """Download the release artifact, verify it and put its executables in dest_dir"""
+    os_name, _, arch = (platform_tag or get_platform_tag()).partition('-')
+    kind, members = BINARY_ARTIFACTS[tool_name]
+    members = [member.format(os=os_name, arch=arch, version=version) for member in members]
+
+    if kind == 'raw':
+        download_file(url, os.path.join(dest_dir, members[0]), sha256=sha256)
+    elif kind == 'zip':
+        extract_zip_stream(url, dest_dir, members=members, sha256=sha256)
+    else:
+        extract_tar_stream(url, dest_dir, members=members, sha256=sha256)
+
+    installed = []
+    for member in members:
+        target = os.path.join(dest_dir, os.path.basename(member))
+        if target != os.path.join(dest_dir, member):
+            os.replace(os.path.join(dest_dir, member), target)
+        os.chmod(target, 0o755)
+        installed.append(target)
+    # Drop the archive's directories once their executables are moved out
+    for name in os.listdir(dest_dir):
+        if os.path.isdir(os.path.join(dest_dir, name)):
+            shutil.rmtree(os.path.join(dest_dir, name))
+    return installed
+
+
+def _verify_active(tool_name, links):
+    """Run the newly linked executable and warn when PATH will not find it"""
+    result = process.run([links[0]] + VERSION_ARGS.get(tool_name, ['--version']),
+                         capture_output=True, text=True, timeout=30)
+    reported = parse_version_output(result.stdout + result.stderr)
+    if result.returncode != 0 or reported is None:
+        print(f"❌ {links[0]} does not run: {(result.stderr or result.stdout).strip()}")
+        return False
+    print(f"✅ {tool_name} {reported} is active at {links[0]}")
+
+    bin_dir = os.path.dirname(links[0])
+    on_path = shutil.which(os.path.basename(links[0]))
+    if on_path is None:
+        print(f"⚠️  {bin_dir} is not on your PATH. Add it with: export PATH=\"{bin_dir}:$PATH\"")
+    elif os.path.realpath(on_path) != os.path.realpath(links[0]):
+        print(f"⚠️  {on_path} comes before {links[0]} on your PATH")
+    return True
+
+
+def install_binary(tool_name, version=None, activate=True, url=None, sha256=None):
+    """Install a tool's release binary into the store and activate it; returns True on success
+
+    A version already in the store is only activated, without any download.
+    With activate=False the version is only stored (for pinned versions).
+    url and sha256 pin the artifact (from a lockfile) instead of looking it
+    up; a stored version recorded with a different digest is refused.
+    """
+    os_type = get_os()
+    tool_version = resolve_version(tool_name, version, os_type, get_linux_distro() if os_type == 'Linux' else None)
+    if not tool_version:
+        print(f"❌ Could not resolve a {tool_name} version to install")
+        return False
+
+    if store.has_version(tool_name, tool_version):
+        stored_sha256 = store.read_entry(tool_name, tool_version).get('sha256')
+        if sha256 and stored_sha256 != sha256:
+            print(f"❌ Stored {tool_name} {tool_version} has sha256 {stored_sha256 or 'unknown'}, "
+                  f"expected {sha256}; refusing to use it")
+            return False
+        print(f"⚡ {tool_name} {tool_version} is already in the store")
+    else:
+        url = url or get_artifact_url(tool_name, tool_version, get_platform_tag())
+        print(f"📥 Installing {tool_name} {tool_version} from the release binary into {store.get_store_dir(tool_name)}...")
+        try:
+            sha256 = sha256 or get_expected_sha256(tool_name, tool_version, url)
+            with store.stage(tool_name, tool_version, url=url, sha256=sha256) as staging:
+                fetch_binaries(tool_name, tool_version, url, sha256, staging)
+        except Exception as e:
+            print(f"❌ Failed to install {tool_name} {tool_version}: {e}")
+            return False
+
+    if not activate:
+        print(f"✅ {tool_name} {tool_version} is in the store")
+        return True
+    try:
+        links = store.activate(tool_name, tool_version)
+    except (store.StoreError, OSError, subprocess.CalledProcessError) as e:
+        print(f"❌ Could not activate {tool_name} {tool_version}: {e}")
+        return False
+    return _verify_active(tool_name, links)
+
+
+def use_version(tool_name, tool_version=None, previous=False):
+    """'devops-cli use': switch versions from the store, installing first when needed"""
+    active = store.active_version(tool_name)
+    if previous or tool_version is None:
+        if not previous:
+            stored = store.list_versions(tool_name)
+            if not stored:
+                print(f"No {tool_name} versions in the store yet")
+                return True
+            print(f"{tool_name} versions in {store.get_store_dir(tool_name)}:")
+            for name in stored:
+                marker = '*' if name == active else ' '
+                print(f" {marker} {name}{'  (previous)' if name == store.previous_version(tool_name) else ''}")
+            return True
+        start = time.time()
+        try:
+            tool_version, _ = store.rollback(tool_name)
+        except (store.StoreError, OSError) as e:
+            print(f"❌ {e}")
+            return False
+        print(f"⏪ {tool_name} rolled back to {tool_version} (was {active}) in {(time.time() - start) * 1000:.0f}ms")
+        return True
+
+    if store.has_version(tool_name, tool_version):
+        start = time.time()
+        try:
+            store.activate(tool_name, tool_version)
+        except (store.StoreError, OSError) as e:
+            print(f"❌ {e}")
+            return False
+        print(f"⚡ {tool_name} switched to {tool_version} (was {active or 'none'}) "
+              f"in {(time.time() - start) * 1000:.0f}ms")
+        return True
+    return install_binary(tool_name, tool_version)
@@ -1,9 +1,14 @@
 
 import os
+import shutil
 import subprocess
-from utils import get_os, get_linux_distro
-from versioning import get_download_url
+import tempfile
+from utils import get_os, get_linux_distro, get_platform_tag
+from versioning import get_download_url, get_artifact_url, resolve_version
+from mirror import get_active_mirror
 from dependencies import dependency_manager
+from downloads import extract_zip_stream
+import process
 
 def install(version=None):
     os_type = get_os()
@@ -36,36 +41,27 @@ def _install_awscli_linux(distro, version=None):
     try:
         # Step 1: Download AWS CLI
         print("📥 Downloading AWS CLI...")
-        if version and version != "latest":
-            download_url = f"https://awscli.amazonaws.com/awscli-exe-linux-x86_64-{version}.zip"
-        else:
-            download_url = "https://awscli.amazonaws.com/awscli-exe-linux-x86_64.zip"
-        
-        subprocess.run(['curl', download_url, '-o', 'awscliv2.zip'], check=True, timeout=300)
-        
-        # Step 2: Install unzip if not available
-        print("📦 Installing unzip...")
-        if 'fedora' in distro.lower():
-            subprocess.run(['sudo', 'dnf', 'install', '-y', 'unzip'], check=True, timeout=120)
-        elif 'centos' in distro.lower() or 'rhel' in distro.lower():
-            subprocess.run(['sudo', 'yum', 'install', '-y', 'unzip'], check=True, timeout=120)
-        else:
-            subprocess.run(['sudo', 'apt', 'install', '-y', 'unzip'], check=True, timeout=120)
-        
-        # Step 3: Extract and install
-        print("📦 Extracting AWS CLI...")
-        subprocess.run(['unzip', 'awscliv2.zip'], check=True, timeout=60)
-        
-        print("🔧 Installing AWS CLI...")
-        subprocess.run(['sudo', './aws/install'], check=True, timeout=300)
-        
-        # Step 4: Clean up
-        print("🧹 Cleaning up...")
-        subprocess.run(['rm', '-rf', 'awscliv2.zip', 'aws'], check=True, timeout=30)
-        
-        # Step 5: Verify installation
+        if get_active_mirror() is not None:
+            # Offline bundles only carry versioned artifacts
+            version = resolve_version('awscli', version, 'Linux', distro)
+        download_url = get_artifact_url('awscli', version, get_platform_tag())
+        
+        # Step 2: Stream the zip into the extractor and unpack only the installer tree
+        staging = tempfile.mkdtemp(prefix='devops-cli-awscli-')
+        try:
+            print("📦 Extracting AWS CLI...")
+            extract_zip_stream(download_url, staging, members=['aws'], timeout=300)
+            
+            print("🔧 Installing AWS CLI...")
+            process.run(['sudo', os.path.join(staging, 'aws', 'install')], check=True, timeout=300)
+        finally:
+            # Step 3: Clean up
+            print("🧹 Cleaning up...")
+            shutil.rmtree(staging, ignore_errors=True)
+        
+        # Step 4: Verify installation
         print("✅ Verifying AWS CLI installation...")
-        result = subprocess.run(['aws', '--version'], capture_output=True, text=True, timeout=30)
+        result = process.run(['aws', '--version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ AWS CLI installed successfully: {result.stdout.strip()}")
             print("🧪 Test AWS CLI: aws --version")
@@ -98,17 +94,17 @@ def _install_awscli_macos(version=None):
         
         # Download and install
         print("📥 Downloading AWS CLI...")
-        subprocess.run(['curl', download_url, '-o', 'AWSCLIV2.pkg'], check=True, timeout=300)
+        process.run(['curl', download_url, '-o', 'AWSCLIV2.pkg'], check=True, timeout=300)
         
         print("🔧 Installing AWS CLI...")
-        subprocess.run(['sudo', 'installer', '-pkg', 'AWSCLIV2.pkg', '-target', '/'], check=True, timeout=300)
+        process.run(['sudo', 'installer', '-pkg', 'AWSCLIV2.pkg', '-target', '/'], check=True, timeout=300)
         
         # Clean up
-        subprocess.run(['rm', 'AWSCLIV2.pkg'], check=True, timeout=30)
+        process.run(['rm', 'AWSCLIV2.pkg'], check=True, timeout=30)
         
         # Verify installation
         print("✅ Verifying AWS CLI installation...")
-        result = subprocess.run(['aws', '--version'], capture_output=True, text=True, timeout=30)
+        result = process.run(['aws', '--version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ AWS CLI installed successfully: {result.stdout.strip()}")
             print("🧪 Test AWS CLI: aws --version")
@@ -141,16 +137,16 @@ def _install_awscli_windows(version=None):
         
         # Download and install
         print("📥 Downloading AWS CLI...")
-        subprocess.run([
+        process.run([
             'powershell', '-Command',
             f'Invoke-WebRequest -Uri {download_url} -OutFile .\\AWSCLIV2.msi'
         ], check=True, timeout=300)
         
         print("🔧 Installing AWS CLI...")
-        subprocess.run(['msiexec.exe', '/i', 'AWSCLIV2.msi', '/quiet'], check=True, timeout=300)
+        process.run(['msiexec.exe', '/i', 'AWSCLIV2.msi', '/quiet'], check=True, timeout=300)
         
         # Clean up
-        subprocess.run(['del', 'AWSCLIV2.msi'], check=True, timeout=30)
+        process.run(['del', 'AWSCLIV2.msi'], check=True, timeout=30)
         
         print("✅ AWS CLI installed successfully!")
         print("🧪 Test AWS CLI: aws --version")
@@ -173,18 +169,18 @@ def uninstall(version=None):
     try:
         if os_type == 'Linux':
             print('Uninstalling AWS CLI from Linux...')
-            subprocess.run(['sudo', 'rm', '-rf', '/usr/local/aws-cli'], check=True, timeout=30)
-            subprocess.run(['sudo', 'rm', '/usr/local/bin/aws'], check=True, timeout=30)
-            subprocess.run(['sudo', 'rm', '/usr/local/bin/aws_completer'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '-rf', '/usr/local/aws-cli'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '/usr/local/bin/aws'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '/usr/local/bin/aws_completer'], check=True, timeout=30)
         elif os_type == 'Darwin':
             print('Uninstalling AWS CLI from macOS...')
-            subprocess.run(['sudo', 'rm', '-rf', '/usr/local/aws-cli'], check=True, timeout=30)
-            subprocess.run(['sudo', 'rm', '/usr/local/bin/aws'], check=True, timeout=30)
-            subprocess.run(['sudo', 'rm', '/usr/local/bin/aws_completer'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '-rf', '/usr/local/aws-cli'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '/usr/local/bin/aws'], check=True, timeout=30)
+            process.run(['sudo', 'rm', '/usr/local/bin/aws_completer'], check=True, timeout=30)
         elif os_type == 'Windows':
             print('Uninstalling AWS CLI from Windows...')
             try:
-                subprocess.run(['winget', 'uninstall', 'Amazon.AWSCLI'], check=True, timeout=300)
+                process.run(['winget', 'uninstall', 'Amazon.AWSCLI'], check=True, timeout=300)
             except (subprocess.CalledProcessError, FileNotFoundError):
                 print('Please uninstall AWS CLI manually through "Add or remove programs"')
                 if version and version != "latest":
@@ -4,6 +4,8 @@ import subprocess
 import platform
 from utils import get_os, get_linux_distro
 from dependencies import dependency_manager
+from steps import StepGraph, StepFailed, NETWORK, PACKAGE_MANAGER
+import process
 
 def install(version=None):
     os_type = get_os()
@@ -34,58 +36,60 @@ def install(version=None):
 def _install_docker_ubuntu(distro, version=None):
     """Install Docker on Ubuntu/Debian with proper repository setup"""
     print(f'Installing Docker on {distro}...')
-    
-    try:
-        # Step 1: Update package index
-        print("🔄 Updating package index...")
-        subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
-        
-        # Step 2: Install required packages
-        print("📦 Installing required packages...")
-        required_packages = ['apt-transport-https', 'ca-certificates', 'curl', 'gnupg', 'lsb-release']
-        subprocess.run(['sudo', 'apt', 'install', '-y'] + required_packages, check=True, timeout=120)
-        
-        # Step 3: Add Docker's official GPG key
-        print("🔑 Adding Docker's official GPG key...")
-        subprocess.run([
-            'sudo', 'mkdir', '-p', '/etc/apt/keyrings'
-        ], check=True, timeout=30)
-        
-        subprocess.run([
-            'curl', '-fsSL', 'https://download.docker.com/linux/ubuntu/gpg'
-        ], stdout=subprocess.PIPE, check=True, timeout=30)
-        
-        # Step 4: Add Docker repository
-        print("📥 Adding Docker repository...")
-        docker_repo = 'deb [arch=amd64] https://download.docker.com/linux/ubuntu $(lsb_release -cs) stable'
-        with open('/etc/apt/sources.list.d/docker.list', 'w') as f:
-            f.write(docker_repo + '\n')
-        
-        # Step 5: Update package index again
-        print("🔄 Updating package index with Docker repository...")
-        subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
-        
-        # Step 6: Install Docker
-        print("🐳 Installing Docker...")
-        if version and version != "latest":
-            subprocess.run(['sudo', 'apt', 'install', '-y', f'docker-ce={version}', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
-        else:
-            subprocess.run(['sudo', 'apt', 'install', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
-        
-        # Step 7: Start and enable Docker service
-        print("🚀 Starting Docker service...")
-        subprocess.run(['sudo', 'systemctl', 'start', 'docker'], check=True, timeout=30)
-        subprocess.run(['sudo', 'systemctl', 'enable', 'docker'], check=True, timeout=30)
-        
-        # Step 8: Add current user to docker group
-        print("👤 Adding current user to docker group...")
+
+    def run(*command, timeout=60):
+        return process.run(list(command), check=True, timeout=timeout)
+
+    def add_repository():
+        codename = process.run(['lsb_release', '-cs'], capture_output=True, text=True,
+                                  check=True, timeout=30).stdout.strip()
+        docker_repo = (f'deb [arch=amd64 signed-by=/etc/apt/keyrings/docker.asc] '
+                       f'https://download.docker.com/linux/ubuntu {codename} stable')
+        process.run(['sudo', 'tee', '/etc/apt/sources.list.d/docker.list'], input=docker_repo + '\n',
+                       stdout=subprocess.DEVNULL, text=True, check=True, timeout=30)
+
+    def add_user_to_group():
         current_user = os.getenv('USER')
         if current_user:
-            subprocess.run(['sudo', 'usermod', '-aG', 'docker', current_user], check=True, timeout=30)
-        
-        # Step 9: Verify installation
+            run('sudo', 'usermod', '-aG', 'docker', current_user, timeout=30)
+
+    if version and version != "latest":
+        packages = [f'docker-ce={version}', 'docker-ce-cli', 'containerd.io']
+    else:
+        packages = ['docker-ce', 'docker-ce-cli', 'containerd.io']
+    required_packages = ['apt-transport-https', 'ca-certificates', 'curl', 'gnupg', 'lsb-release']
+
+    # Creating the keyrings directory overlaps with the apt steps, which hold
+    # the package-manager lock one at a time; fetching the key needs curl from
+    # the prerequisites.
+    graph = StepGraph('Docker installation')
+    graph.add('apt-update', lambda: run('sudo', 'apt', 'update'),
+              resources=[PACKAGE_MANAGER, NETWORK], description="🔄 Updating package index")
+    graph.add('prerequisites', lambda: run('sudo', 'apt', 'install', '-y', *required_packages, timeout=120),
+              after=['apt-update'], resources=[PACKAGE_MANAGER, NETWORK], description="📦 Installing required packages")
+    graph.add('keyrings', lambda: run('sudo', 'mkdir', '-p', '/etc/apt/keyrings', timeout=30),
+              description="📁 Creating /etc/apt/keyrings")
+    graph.add('gpg-key', lambda: run('sudo', 'curl', '-fsSL', 'https://download.docker.com/linux/ubuntu/gpg',
+                                     '-o', '/etc/apt/keyrings/docker.asc', timeout=30),
+              after=['keyrings', 'prerequisites'], resources=[NETWORK], description="🔑 Adding Docker's official GPG key")
+    graph.add('repository', add_repository, after=['prerequisites'],
+              description="📥 Adding Docker repository")
+    graph.add('apt-update-docker', lambda: run('sudo', 'apt', 'update'), after=['gpg-key', 'repository'],
+              resources=[PACKAGE_MANAGER, NETWORK], description="🔄 Updating package index with Docker repository")
+    graph.add('install', lambda: run('sudo', 'apt', 'install', '-y', *packages, timeout=300),
+              after=['apt-update-docker'], resources=[PACKAGE_MANAGER, NETWORK], description="🐳 Installing Docker")
+    graph.add('start', lambda: run('sudo', 'systemctl', 'start', 'docker', timeout=30),
+              after=['install'], description="🚀 Starting Docker service")
+    graph.add('enable', lambda: run('sudo', 'systemctl', 'enable', 'docker', timeout=30),
+              after=['install'], description="🔁 Enabling Docker service")
+    graph.add('docker-group', add_user_to_group, after=['install'],
+              description="👤 Adding current user to docker group")
+
+    try:
+        graph.run()
+
         print("✅ Verifying Docker installation...")
-        result = subprocess.run(['sudo', 'docker', '--version'], capture_output=True, text=True, timeout=30)
+        result = process.run(['sudo', 'docker', '--version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ Docker installed successfully: {result.stdout.strip()}")
             print("🔧 Important: You may need to log out and log back in for group changes to take effect")
@@ -94,12 +98,12 @@ def _install_docker_ubuntu(distro, version=None):
         else:
             print("❌ Docker installation verification failed")
             return False
-            
-    except subprocess.CalledProcessError as e:
-        print(f"❌ Failed to install Docker: {e}")
-        return False
-    except subprocess.TimeoutExpired:
-        print("⏰ Docker installation timed out")
+
+    except StepFailed as e:
+        if isinstance(e.error, subprocess.TimeoutExpired):
+            print(f"⏰ Docker installation timed out ({e.step.name})")
+        else:
+            print(f"❌ Failed to install Docker: {e}")
         return False
     except Exception as e:
         print(f"❌ Error during Docker installation: {e}")
@@ -113,19 +117,19 @@ def _install_docker_centos(distro, version=None):
         # Step 1: Install required packages
         print("📦 Installing required packages...")
         if 'fedora' in distro.lower():
-            subprocess.run(['sudo', 'dnf', 'install', '-y', 'dnf-plugins-core'], check=True, timeout=120)
+            process.run(['sudo', 'dnf', 'install', '-y', 'dnf-plugins-core'], check=True, timeout=120)
         else:
-            subprocess.run(['sudo', 'yum', 'install', '-y', 'yum-utils'], check=True, timeout=120)
+            process.run(['sudo', 'yum', 'install', '-y', 'yum-utils'], check=True, timeout=120)
         
         # Step 2: Add Docker repository
         print("📥 Adding Docker repository...")
         if 'fedora' in distro.lower():
-            subprocess.run([
+            process.run([
                 'sudo', 'dnf', 'config-manager', '--add-repo',
                 'https://download.docker.com/linux/fedora/docker-ce.repo'
             ], check=True, timeout=60)
         else:
-            subprocess.run([
+            process.run([
                 'sudo', 'yum-config-manager', '--add-repo',
                 'https://download.docker.com/linux/centos/docker-ce.repo'
             ], check=True, timeout=60)
@@ -134,29 +138,29 @@ def _install_docker_centos(distro, version=None):
         print("🐳 Installing Docker...")
         if 'fedora' in distro.lower():
             if version and version != "latest":
-                subprocess.run(['sudo', 'dnf', 'install', '-y', f'docker-ce-{version}', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
+                process.run(['sudo', 'dnf', 'install', '-y', f'docker-ce-{version}', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
             else:
-                subprocess.run(['sudo', 'dnf', 'install', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
+                process.run(['sudo', 'dnf', 'install', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
         else:
             if version and version != "latest":
-                subprocess.run(['sudo', 'yum', 'install', '-y', f'docker-ce-{version}', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
+                process.run(['sudo', 'yum', 'install', '-y', f'docker-ce-{version}', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
             else:
-                subprocess.run(['sudo', 'yum', 'install', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
+                process.run(['sudo', 'yum', 'install', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=300)
         
         # Step 4: Start and enable Docker service
         print("🚀 Starting Docker service...")
-        subprocess.run(['sudo', 'systemctl', 'start', 'docker'], check=True, timeout=30)
-        subprocess.run(['sudo', 'systemctl', 'enable', 'docker'], check=True, timeout=30)
+        process.run(['sudo', 'systemctl', 'start', 'docker'], check=True, timeout=30)
+        process.run(['sudo', 'systemctl', 'enable', 'docker'], check=True, timeout=30)
         
         # Step 5: Add current user to docker group
         print("👤 Adding current user to docker group...")
         current_user = os.getenv('USER')
         if current_user:
-            subprocess.run(['sudo', 'usermod', '-aG', 'docker', current_user], check=True, timeout=30)
+            process.run(['sudo', 'usermod', '-aG', 'docker', current_user], check=True, timeout=30)
         
         # Step 6: Verify installation
         print("✅ Verifying Docker installation...")
-        result = subprocess.run(['sudo', 'docker', '--version'], capture_output=True, text=True, timeout=30)
+        result = process.run(['sudo', 'docker', '--version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ Docker installed successfully: {result.stdout.strip()}")
             print("🔧 Important: You may need to log out and log back in for group changes to take effect")
@@ -183,10 +187,10 @@ def _install_docker_macos(version=None):
     try:
         if version and version != "latest":
             print(f'Installing Docker Desktop version {version} on macOS...')
-            subprocess.run(['brew', 'install', '--cask', f'docker@{version}'], check=True, timeout=300)
+            process.run(['brew', 'install', '--cask', f'docker@{version}'], check=True, timeout=300)
         else:
             print('Installing latest Docker Desktop on macOS...')
-            subprocess.run(['brew', 'install', '--cask', 'docker'], check=True, timeout=300)
+            process.run(['brew', 'install', '--cask', 'docker'], check=True, timeout=300)
         
         print("✅ Docker Desktop installed successfully!")
         print("🚀 Start Docker Desktop from Applications or run: open -a Docker")
@@ -214,9 +218,9 @@ def _install_docker_windows(version=None):
         # Try winget first
         try:
             if version and version != "latest":
-                subprocess.run(['winget', 'install', 'Docker.DockerDesktop', '--version', version], check=True, timeout=600)
+                process.run(['winget', 'install', 'Docker.DockerDesktop', '--version', version], check=True, timeout=600)
             else:
-                subprocess.run(['winget', 'install', 'Docker.DockerDesktop'], check=True, timeout=600)
+                process.run(['winget', 'install', 'Docker.DockerDesktop'], check=True, timeout=600)
             
             print("✅ Docker Desktop installed successfully!")
             print("🚀 Start Docker Desktop from Start Menu")
@@ -227,9 +231,9 @@ def _install_docker_windows(version=None):
             # Fallback to chocolatey
             try:
                 if version and version != "latest":
-                    subprocess.run(['choco', 'install', 'docker-desktop', '--version', version, '-y'], check=True, timeout=600)
+                    process.run(['choco', 'install', 'docker-desktop', '--version', version, '-y'], check=True, timeout=600)
                 else:
-                    subprocess.run(['choco', 'install', 'docker-desktop', '-y'], check=True, timeout=600)
+                    process.run(['choco', 'install', 'docker-desktop', '-y'], check=True, timeout=600)
                 
                 print("✅ Docker Desktop installed successfully!")
                 print("🚀 Start Docker Desktop from Start Menu")
@@ -255,34 +259,34 @@ def uninstall():
             distro = get_linux_distro()
             if 'ubuntu' in distro.lower() or 'debian' in distro.lower():
                 print('Uninstalling Docker from Ubuntu/Debian...')
-                subprocess.run(['sudo', 'apt', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
-                subprocess.run(['sudo', 'apt', 'autoremove', '-y'], check=True, timeout=60)
-                subprocess.run(['sudo', 'rm', '-rf', '/var/lib/docker'], check=True, timeout=30)
-                subprocess.run(['sudo', 'rm', '-rf', '/etc/docker'], check=True, timeout=30)
+                process.run(['sudo', 'apt', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
+                process.run(['sudo', 'apt', 'autoremove', '-y'], check=True, timeout=60)
+                process.run(['sudo', 'rm', '-rf', '/var/lib/docker'], check=True, timeout=30)
+                process.run(['sudo', 'rm', '-rf', '/etc/docker'], check=True, timeout=30)
             elif 'centos' in distro.lower() or 'rhel' in distro.lower() or 'fedora' in distro.lower():
                 print('Uninstalling Docker from CentOS/RHEL/Fedora...')
-                subprocess.run(['sudo', 'systemctl', 'stop', 'docker'], check=True, timeout=30)
+                process.run(['sudo', 'systemctl', 'stop', 'docker'], check=True, timeout=30)
                 if 'fedora' in distro.lower():
-                    subprocess.run(['sudo', 'dnf', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
+                    process.run(['sudo', 'dnf', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
                 else:
-                    subprocess.run(['sudo', 'yum', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
-                subprocess.run(['sudo', 'rm', '-rf', '/var/lib/docker'], check=True, timeout=30)
-                subprocess.run(['sudo', 'rm', '-rf', '/etc/docker'], check=True, timeout=30)
+                    process.run(['sudo', 'yum', 'remove', '-y', 'docker-ce', 'docker-ce-cli', 'containerd.io'], check=True, timeout=120)
+                process.run(['sudo', 'rm', '-rf', '/var/lib/docker'], check=True, timeout=30)
+                process.run(['sudo', 'rm', '-rf', '/etc/docker'], check=True, timeout=30)
             else:
                 print(f'Unsupported Linux distribution: {distro}')
                 return False
                 
         elif os_type == 'Darwin':
             print('Uninstalling Docker from macOS...')
-            subprocess.run(['brew', 'uninstall', '--cask', 'docker'], check=True, timeout=120)
+            process.run(['brew', 'uninstall', '--cask', 'docker'], check=True, timeout=120)
             
         elif os_type == 'Windows':
             print('Uninstalling Docker from Windows...')
             try:
-                subprocess.run(['winget', 'uninstall', 'Docker.DockerDesktop'], check=True, timeout=300)
+                process.run(['winget', 'uninstall', 'Docker.DockerDesktop'], check=True, timeout=300)
             except (subprocess.CalledProcessError, FileNotFoundError):
                 try:
-                    subprocess.run(['choco', 'uninstall', 'docker-desktop', '-y'], check=True, timeout=300)
+                    process.run(['choco', 'uninstall', 'docker-desktop', '-y'], check=True, timeout=300)
                 except (subprocess.CalledProcessError, FileNotFoundError):
                     print("Please uninstall Docker Desktop manually from Control Panel")
                     return False
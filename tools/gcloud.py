@@ -3,6 +3,7 @@ import os
 import subprocess
 from utils import get_os, get_linux_distro
 from dependencies import dependency_manager
+import process
 
 def install(version=None):
     os_type = get_os()
@@ -37,12 +38,12 @@ def _install_gcloud_linux(distro, version=None):
         print("📥 Downloading Google Cloud SDK installer...")
         if version and version != "latest":
             print(f'Installing Google Cloud SDK version {version}...')
-            subprocess.run([
+            process.run([
                 'curl', 'https://sdk.cloud.google.com', '|', 'bash', '-s', '--', f'--version={version}'
             ], shell=True, check=True, timeout=600)
         else:
             print('Installing latest Google Cloud SDK...')
-            subprocess.run([
+            process.run([
                 'curl', 'https://sdk.cloud.google.com', '|', 'bash'
             ], shell=True, check=True, timeout=600)
         
@@ -57,11 +58,11 @@ def _install_gcloud_linux(distro, version=None):
         
         # Step 3: Initialize gcloud
         print("🚀 Initializing Google Cloud SDK...")
-        subprocess.run([f'{gcloud_path}/gcloud', 'init', '--quiet'], check=True, timeout=300)
+        process.run([f'{gcloud_path}/gcloud', 'init', '--quiet'], check=True, timeout=300)
         
         # Step 4: Verify installation
         print("✅ Verifying Google Cloud SDK installation...")
-        result = subprocess.run([f'{gcloud_path}/gcloud', 'version'], capture_output=True, text=True, timeout=30)
+        result = process.run([f'{gcloud_path}/gcloud', 'version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ Google Cloud SDK installed successfully: {result.stdout.strip()}")
             print("🧪 Test gcloud: gcloud version")
@@ -90,12 +91,12 @@ def _install_gcloud_macos(version=None):
         print("📥 Downloading Google Cloud SDK installer...")
         if version and version != "latest":
             print(f'Installing Google Cloud SDK version {version}...')
-            subprocess.run([
+            process.run([
                 'curl', 'https://sdk.cloud.google.com', '|', 'bash', '-s', '--', f'--version={version}'
             ], shell=True, check=True, timeout=600)
         else:
             print('Installing latest Google Cloud SDK...')
-            subprocess.run([
+            process.run([
                 'curl', 'https://sdk.cloud.google.com', '|', 'bash'
             ], shell=True, check=True, timeout=600)
         
@@ -110,11 +111,11 @@ def _install_gcloud_macos(version=None):
         
         # Step 3: Initialize gcloud
         print("🚀 Initializing Google Cloud SDK...")
-        subprocess.run([f'{gcloud_path}/gcloud', 'init', '--quiet'], check=True, timeout=300)
+        process.run([f'{gcloud_path}/gcloud', 'init', '--quiet'], check=True, timeout=300)
         
         # Step 4: Verify installation
         print("✅ Verifying Google Cloud SDK installation...")
-        result = subprocess.run([f'{gcloud_path}/gcloud', 'version'], capture_output=True, text=True, timeout=30)
+        result = process.run([f'{gcloud_path}/gcloud', 'version'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ Google Cloud SDK installed successfully: {result.stdout.strip()}")
             print("🧪 Test gcloud: gcloud version")
@@ -142,7 +143,7 @@ def _install_gcloud_windows(version=None):
         # Step 1: Download the installer
         print("📥 Downloading Google Cloud SDK installer...")
         installer_url = "https://dl.google.com/dl/cloudsdk/channels/rapid/GoogleCloudSDKInstaller.exe"
-        subprocess.run([
+        process.run([
             'powershell', '-Command',
             f'Invoke-WebRequest -Uri {installer_url} -OutFile .\\GoogleCloudSDKInstaller.exe'
         ], check=True, timeout=300)
@@ -151,17 +152,17 @@ def _install_gcloud_windows(version=None):
         print("🔧 Installing Google Cloud SDK...")
         if version and version != "latest":
             print(f'Installing Google Cloud SDK version {version}...')
-            subprocess.run([
+            process.run([
                 '.\\GoogleCloudSDKInstaller.exe', '/S', f'/D=C:\\google-cloud-sdk'
             ], check=True, timeout=600)
         else:
             print('Installing latest Google Cloud SDK...')
-            subprocess.run([
+            process.run([
                 '.\\GoogleCloudSDKInstaller.exe', '/S', '/D=C:\\google-cloud-sdk'
             ], check=True, timeout=600)
         
         # Step 3: Clean up
-        subprocess.run(['del', 'GoogleCloudSDKInstaller.exe'], check=True, timeout=30)
+        process.run(['del', 'GoogleCloudSDKInstaller.exe'], check=True, timeout=30)
         
         print("✅ Google Cloud SDK installed successfully!")
         print("🧪 Test gcloud: gcloud version")
@@ -187,7 +188,7 @@ def uninstall(version=None):
             print('Uninstalling Google Cloud SDK...')
             gcloud_path = os.path.expanduser('~/google-cloud-sdk')
             if os.path.exists(gcloud_path):
-                subprocess.run(['rm', '-rf', gcloud_path], check=True, timeout=60)
+                process.run(['rm', '-rf', gcloud_path], check=True, timeout=60)
             
             # Remove from PATH
             shell_configs = ['.bashrc', '.zshrc', '.bash_profile']
@@ -207,7 +208,7 @@ def uninstall(version=None):
         elif os_type == 'Windows':
             print('Uninstalling Google Cloud SDK from Windows...')
             try:
-                subprocess.run(['winget', 'uninstall', 'Google.CloudSDK'], check=True, timeout=300)
+                process.run(['winget', 'uninstall', 'Google.CloudSDK'], check=True, timeout=300)
                 print("✅ Google Cloud SDK uninstalled successfully!")
                 return True
             except (subprocess.CalledProcessError, FileNotFoundError):
@@ -236,10 +237,10 @@ def update(version=None):
         if os.path.exists(gcloud_path):
             if version and version != "latest":
                 print(f'Updating Google Cloud SDK components to version {version}...')
-                subprocess.run([gcloud_path, 'components', 'update', f'--version={version}'], check=True, timeout=300)
+                process.run([gcloud_path, 'components', 'update', f'--version={version}'], check=True, timeout=300)
             else:
                 print('Updating Google Cloud SDK components to latest...')
-                subprocess.run([gcloud_path, 'components', 'update'], check=True, timeout=300)
+                process.run([gcloud_path, 'components', 'update'], check=True, timeout=300)
             
             print("✅ Google Cloud SDK updated successfully!")
             return True
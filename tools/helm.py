@@ -1,9 +1,21 @@
 
 import os
-from utils import get_os, get_linux_distro
+from utils import get_os, get_linux_distro, get_data_dir
 from versioning import get_download_url
+from strategies import use_binary, install_binary
+import process
+
+HELM_SCRIPT_URL = 'https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3'
+
+def get_helm_script():
+    """Where Helm's installer script is downloaded: devops-cli's download directory, cleaned by 'devops-cli gc'"""
+    directory = get_data_dir('downloads')
+    os.makedirs(directory, exist_ok=True)
+    return os.path.join(directory, 'get_helm.sh')
 
 def install(version=None):
+    if use_binary('helm'):
+        return install_binary('helm', version)
     os_type = get_os()
     if os_type == 'Linux':
         distro = get_linux_distro()
@@ -11,45 +23,47 @@ def install(version=None):
             print(f'Installing Helm on {distro}...')
             if version and version != "latest":
                 print(f'Installing Helm version {version} on Ubuntu...')
-                os.system('curl https://baltocdn.com/helm/signing.asc | sudo apt-key add -')
-                os.system('sudo apt-get install apt-transport-https --yes')
-                os.system('echo "deb https://baltocdn.com/helm/stable/debian/ all main" | sudo tee /etc/apt/sources.list.d/helm-stable-debian.list')
-                os.system('sudo apt-get update')
-                os.system(f'sudo apt-get install helm={version}')
+                process.system('curl https://baltocdn.com/helm/signing.asc | sudo apt-key add -')
+                process.system('sudo apt-get install apt-transport-https --yes')
+                process.system('echo "deb https://baltocdn.com/helm/stable/debian/ all main" | sudo tee /etc/apt/sources.list.d/helm-stable-debian.list')
+                process.system('sudo apt-get update')
+                process.system(f'sudo apt-get install helm={version}')
             else:
-                os.system('curl https://baltocdn.com/helm/signing.asc | sudo apt-key add -')
-                os.system('sudo apt-get install apt-transport-https --yes')
-                os.system('echo "deb https://baltocdn.com/helm/stable/debian/ all main" | sudo tee /etc/apt/sources.list.d/helm-stable-debian.list')
-                os.system('sudo apt-get update')
-                os.system('sudo apt-get install helm')
+                process.system('curl https://baltocdn.com/helm/signing.asc | sudo apt-key add -')
+                process.system('sudo apt-get install apt-transport-https --yes')
+                process.system('echo "deb https://baltocdn.com/helm/stable/debian/ all main" | sudo tee /etc/apt/sources.list.d/helm-stable-debian.list')
+                process.system('sudo apt-get update')
+                process.system('sudo apt-get install helm')
         elif 'centos' in distro.lower():
             print(f'Installing Helm on {distro}...')
             if version and version != "latest":
                 print(f'Installing Helm version {version} on CentOS...')
                 download_url = get_download_url('helm', version, os_type)
                 if download_url:
-                    os.system(f'curl -fsSL -o get_helm.sh https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 && chmod 700 get_helm.sh && ./get_helm.sh --version v{version}')
+                    script = get_helm_script()
+                    process.system(f'curl -fsSL -o {script} {HELM_SCRIPT_URL} && chmod 700 {script} && {script} --version v{version}')
                 else:
                     print(f'Could not generate download URL for version {version}')
             else:
-                os.system('curl -fsSL -o get_helm.sh https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3')
-                os.system('chmod 700 get_helm.sh')
-                os.system('./get_helm.sh')
+                script = get_helm_script()
+                process.system(f'curl -fsSL -o {script} {HELM_SCRIPT_URL}')
+                process.system(f'chmod 700 {script}')
+                process.system(script)
         else:
             print(f'Unsupported Linux distribution: {distro}')
     elif os_type == 'Darwin':
         print('Installing Helm on macOS...')
         if version and version != "latest":
             print(f'Installing Helm version {version} on macOS...')
-            os.system(f'brew install helm@{version}')
+            process.system(f'brew install helm@{version}')
         else:
-            os.system('brew install helm')
+            process.system('brew install helm')
     elif os_type == 'Windows':
         print('Installing Helm on Windows...')
         if version and version != "latest":
-            os.system(f'winget install -e --id Helm.Helm --version {version}')
+            process.system(f'winget install -e --id Helm.Helm --version {version}')
         else:
-            os.system('winget install -e --id Helm.Helm')
+            process.system('winget install -e --id Helm.Helm')
     else:
         print(f'Unsupported OS: {os_type}')
 
@@ -59,62 +73,66 @@ def uninstall(version=None):
         distro = get_linux_distro()
         if 'ubuntu' in distro.lower():
             print(f'Uninstalling Helm from {distro}...')
-            os.system('sudo apt-get remove helm')
+            process.system('sudo apt-get remove helm')
         elif 'centos' in distro.lower():
             print(f'Uninstalling Helm from {distro}...')
-            os.system('sudo rm /usr/local/bin/helm')
+            process.system('sudo rm /usr/local/bin/helm')
         else:
             print(f'Unsupported Linux distribution: {distro}')
     elif os_type == 'Darwin':
         print('Uninstalling Helm from macOS...')
         if version and version != "latest":
-            os.system(f'brew uninstall helm@{version}')
+            process.system(f'brew uninstall helm@{version}')
         else:
-            os.system('brew uninstall helm')
+            process.system('brew uninstall helm')
     elif os_type == 'Windows':
         print('Uninstalling Helm from Windows...')
         if version and version != "latest":
-            os.system(f'winget uninstall -e --id Helm.Helm --version {version}')
+            process.system(f'winget uninstall -e --id Helm.Helm --version {version}')
         else:
-            os.system('winget uninstall -e --id Helm.Helm')
+            process.system('winget uninstall -e --id Helm.Helm')
     else:
         print(f'Unsupported OS: {os_type}')
 
 def update(version=None):
+    if use_binary('helm'):
+        return install_binary('helm', version)
     os_type = get_os()
     if os_type == 'Linux':
         distro = get_linux_distro()
         if 'ubuntu' in distro.lower():
             print(f'Updating Helm on {distro}...')
             if version and version != "latest":
-                os.system('sudo apt-get update')
-                os.system(f'sudo apt-get install helm={version}')
+                process.system('sudo apt-get update')
+                process.system(f'sudo apt-get install helm={version}')
             else:
-                os.system('sudo apt-get update')
-                os.system('sudo apt-get install helm')
+                process.system('sudo apt-get update')
+                process.system('sudo apt-get install helm')
         elif 'centos' in distro.lower():
             print(f'Updating Helm on {distro}...')
             if version and version != "latest":
                 download_url = get_download_url('helm', version, os_type)
                 if download_url:
-                    os.system(f'curl -fsSL -o get_helm.sh https://raw.githubusercontent.com/helm/helm/main/scripts/get-helm-3 && chmod 700 get_helm.sh && ./get_helm.sh --version v{version}')
+                    script = get_helm_script()
+                    process.system(f'curl -fsSL -o {script} {HELM_SCRIPT_URL} && chmod 700 {script} && {script} --version v{version}')
                 else:
                     print(f'Could not generate download URL for version {version}')
             else:
-                os.system('./get_helm.sh')
+                script = get_helm_script()
+                process.system(f'curl -fsSL -o {script} {HELM_SCRIPT_URL} && chmod 700 {script} && {script}')
         else:
             print(f'Unsupported Linux distribution: {distro}')
     elif os_type == 'Darwin':
         print('Updating Helm on macOS...')
         if version and version != "latest":
-            os.system(f'brew upgrade helm@{version}')
+            process.system(f'brew upgrade helm@{version}')
         else:
-            os.system('brew upgrade helm')
+            process.system('brew upgrade helm')
     elif os_type == 'Windows':
         print('Updating Helm on Windows...')
         if version and version != "latest":
-            os.system(f'winget upgrade -e --id Helm.Helm --version {version}')
+            process.system(f'winget upgrade -e --id Helm.Helm --version {version}')
         else:
-            os.system('winget upgrade -e --id Helm.Helm')
+            process.system('winget upgrade -e --id Helm.Helm')
     else:
         print(f'Unsupported OS: {os_type}')
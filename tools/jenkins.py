@@ -4,6 +4,7 @@ import subprocess
 from utils import get_os, get_linux_distro
 from versioning import get_download_url
 from dependencies import dependency_manager
+import process
 
 def install(version=None):
     os_type = get_os()
@@ -23,7 +24,7 @@ def install(version=None):
             try:
                 # Download and add Jenkins key using modern method
                 print("📥 Adding Jenkins repository key...")
-                subprocess.run([
+                process.run([
                     'sudo', 'wget', '-O', '/etc/apt/keyrings/jenkins-keyring.asc',
                     'https://pkg.jenkins.io/debian-stable/jenkins.io-2023.key'
                 ], check=True, timeout=30)
@@ -36,15 +37,15 @@ def install(version=None):
                 
                 # Update package list
                 print("🔄 Updating package list...")
-                subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
+                process.run(['sudo', 'apt', 'update'], check=True, timeout=60)
                 
                 # Install Jenkins
                 if version and version != "latest":
                     print(f'Installing Jenkins version {version} on Ubuntu...')
-                    subprocess.run(['sudo', 'apt', 'install', '-y', f'jenkins={version}'], check=True, timeout=300)
+                    process.run(['sudo', 'apt', 'install', '-y', f'jenkins={version}'], check=True, timeout=300)
                 else:
                     print('Installing latest Jenkins on Ubuntu...')
-                    subprocess.run(['sudo', 'apt', 'install', '-y', 'jenkins'], check=True, timeout=300)
+                    process.run(['sudo', 'apt', 'install', '-y', 'jenkins'], check=True, timeout=300)
                 
                 print("✅ Jenkins installed successfully!")
                 print("🚀 To start Jenkins: sudo systemctl start jenkins")
@@ -64,14 +65,14 @@ def install(version=None):
             try:
                 # Add Jenkins repository for RHEL/CentOS/Fedora
                 print("📥 Adding Jenkins repository...")
-                subprocess.run([
+                process.run([
                     'sudo', 'wget', '-O', '/etc/yum.repos.d/jenkins.repo',
                     'https://pkg.jenkins.io/redhat-stable/jenkins.repo'
                 ], check=True, timeout=30)
                 
                 # Import Jenkins key
                 print("🔑 Importing Jenkins key...")
-                subprocess.run([
+                process.run([
                     'sudo', 'rpm', '--import', 
                     'https://pkg.jenkins.io/redhat-stable/jenkins.io.key'
                 ], check=True, timeout=30)
@@ -79,10 +80,10 @@ def install(version=None):
                 # Install Jenkins
                 if version and version != "latest":
                     print(f'Installing Jenkins version {version} on {distro}...')
-                    subprocess.run(['sudo', 'yum', 'install', '-y', f'jenkins-{version}'], check=True, timeout=300)
+                    process.run(['sudo', 'yum', 'install', '-y', f'jenkins-{version}'], check=True, timeout=300)
                 else:
                     print(f'Installing latest Jenkins on {distro}...')
-                    subprocess.run(['sudo', 'yum', 'install', '-y', 'jenkins'], check=True, timeout=300)
+                    process.run(['sudo', 'yum', 'install', '-y', 'jenkins'], check=True, timeout=300)
                 
                 print("✅ Jenkins installed successfully!")
                 print("🚀 To start Jenkins: sudo systemctl start jenkins")
@@ -103,10 +104,10 @@ def install(version=None):
         try:
             if version and version != "latest":
                 print(f'Installing Jenkins version {version} on macOS...')
-                subprocess.run(['brew', 'install', f'jenkins-lts@{version}'], check=True, timeout=300)
+                process.run(['brew', 'install', f'jenkins-lts@{version}'], check=True, timeout=300)
             else:
                 print('Installing latest Jenkins on macOS...')
-                subprocess.run(['brew', 'install', 'jenkins-lts'], check=True, timeout=300)
+                process.run(['brew', 'install', 'jenkins-lts'], check=True, timeout=300)
             
             print("✅ Jenkins installed successfully!")
             print("🚀 To start Jenkins: brew services start jenkins-lts")
@@ -128,7 +129,7 @@ def install(version=None):
             download_url = f"https://get.jenkins.io/war-stable/{jenkins_version}/jenkins.war"
             
             print(f"📥 Downloading Jenkins {jenkins_version}...")
-            subprocess.run([
+            process.run([
                 'powershell', '-Command',
                 f'Invoke-WebRequest -Uri {download_url} -OutFile .\\jenkins.war'
             ], check=True, timeout=300)
@@ -155,11 +156,11 @@ def uninstall(version=None):
             distro = get_linux_distro()
             if 'ubuntu' in distro.lower() or 'debian' in distro.lower():
                 print(f'Uninstalling Jenkins from {distro}...')
-                subprocess.run(['sudo', 'apt', 'remove', '-y', 'jenkins'], check=True, timeout=60)
-                subprocess.run(['sudo', 'apt', 'autoremove', '-y'], check=True, timeout=60)
+                process.run(['sudo', 'apt', 'remove', '-y', 'jenkins'], check=True, timeout=60)
+                process.run(['sudo', 'apt', 'autoremove', '-y'], check=True, timeout=60)
             elif 'centos' in distro.lower() or 'rhel' in distro.lower() or 'fedora' in distro.lower():
                 print(f'Uninstalling Jenkins from {distro}...')
-                subprocess.run(['sudo', 'yum', 'remove', '-y', 'jenkins'], check=True, timeout=60)
+                process.run(['sudo', 'yum', 'remove', '-y', 'jenkins'], check=True, timeout=60)
             else:
                 print(f'Unsupported Linux distribution: {distro}')
                 return False
@@ -167,9 +168,9 @@ def uninstall(version=None):
         elif os_type == 'Darwin':
             print('Uninstalling Jenkins from macOS...')
             if version and version != "latest":
-                subprocess.run(['brew', 'uninstall', f'jenkins-lts@{version}'], check=True, timeout=60)
+                process.run(['brew', 'uninstall', f'jenkins-lts@{version}'], check=True, timeout=60)
             else:
-                subprocess.run(['brew', 'uninstall', 'jenkins-lts'], check=True, timeout=60)
+                process.run(['brew', 'uninstall', 'jenkins-lts'], check=True, timeout=60)
                 
         elif os_type == 'Windows':
             print('Uninstalling Jenkins from Windows...')
@@ -3,8 +3,12 @@ import subprocess
 from utils import get_os, get_linux_distro
 from versioning import get_download_url
 from dependencies import dependency_manager
+from strategies import use_binary, install_binary
+import process
 
 def install(version=None):
+    if use_binary('kubectl'):
+        return install_binary('kubectl', version)
     os_type = get_os()
     
     # Install dependencies first
@@ -37,16 +41,16 @@ def _install_kubectl_ubuntu(distro, version=None):
     try:
         # Step 1: Update package index
         print("🔄 Updating package index...")
-        subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
+        process.run(['sudo', 'apt', 'update'], check=True, timeout=60)
         
         # Step 2: Install required packages
         print("📦 Installing required packages...")
         required_packages = ['apt-transport-https', 'ca-certificates', 'curl', 'gnupg']
-        subprocess.run(['sudo', 'apt', 'install', '-y'] + required_packages, check=True, timeout=120)
+        process.run(['sudo', 'apt', 'install', '-y'] + required_packages, check=True, timeout=120)
         
         # Step 3: Add Kubernetes GPG key (modern method)
         print("🔑 Adding Kubernetes GPG key...")
-        subprocess.run([
+        process.run([
             'curl', '-fsSL', 'https://pkgs.k8s.io/core:/stable:/v1.28/deb/Release.key'
         ], stdout=subprocess.PIPE, check=True, timeout=30)
         
@@ -58,18 +62,18 @@ def _install_kubectl_ubuntu(distro, version=None):
         
         # Step 5: Update package index
         print("🔄 Updating package index with Kubernetes repository...")
-        subprocess.run(['sudo', 'apt', 'update'], check=True, timeout=60)
+        process.run(['sudo', 'apt', 'update'], check=True, timeout=60)
         
         # Step 6: Install kubectl
         print("☸️ Installing kubectl...")
         if version and version != "latest":
-            subprocess.run(['sudo', 'apt', 'install', '-y', f'kubectl={version}'], check=True, timeout=300)
+            process.run(['sudo', 'apt', 'install', '-y', f'kubectl={version}'], check=True, timeout=300)
         else:
-            subprocess.run(['sudo', 'apt', 'install', '-y', 'kubectl'], check=True, timeout=300)
+            process.run(['sudo', 'apt', 'install', '-y', 'kubectl'], check=True, timeout=300)
         
         # Step 7: Verify installation
         print("✅ Verifying kubectl installation...")
-        result = subprocess.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
+        result = process.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ kubectl installed successfully: {result.stdout.strip()}")
             print("🧪 Test kubectl: kubectl version --client")
@@ -96,19 +100,19 @@ def _install_kubectl_centos(distro, version=None):
         # Step 1: Install required packages
         print("📦 Installing required packages...")
         if 'fedora' in distro.lower():
-            subprocess.run(['sudo', 'dnf', 'install', '-y', 'curl'], check=True, timeout=120)
+            process.run(['sudo', 'dnf', 'install', '-y', 'curl'], check=True, timeout=120)
         else:
-            subprocess.run(['sudo', 'yum', 'install', '-y', 'curl'], check=True, timeout=120)
+            process.run(['sudo', 'yum', 'install', '-y', 'curl'], check=True, timeout=120)
         
         # Step 2: Add Kubernetes repository
         print("📥 Adding Kubernetes repository...")
         if 'fedora' in distro.lower():
-            subprocess.run([
+            process.run([
                 'sudo', 'dnf', 'config-manager', '--add-repo',
                 'https://pkgs.k8s.io/core:/stable:/v1.28/rpm/'
             ], check=True, timeout=60)
         else:
-            subprocess.run([
+            process.run([
                 'sudo', 'yum-config-manager', '--add-repo',
                 'https://pkgs.k8s.io/core:/stable:/v1.28/rpm/'
             ], check=True, timeout=60)
@@ -117,18 +121,18 @@ def _install_kubectl_centos(distro, version=None):
         print("☸️ Installing kubectl...")
         if 'fedora' in distro.lower():
             if version and version != "latest":
-                subprocess.run(['sudo', 'dnf', 'install', '-y', f'kubectl-{version}'], check=True, timeout=300)
+                process.run(['sudo', 'dnf', 'install', '-y', f'kubectl-{version}'], check=True, timeout=300)
             else:
-                subprocess.run(['sudo', 'dnf', 'install', '-y', 'kubectl'], check=True, timeout=300)
+                process.run(['sudo', 'dnf', 'install', '-y', 'kubectl'], check=True, timeout=300)
         else:
             if version and version != "latest":
-                subprocess.run(['sudo', 'yum', 'install', '-y', f'kubectl-{version}'], check=True, timeout=300)
+                process.run(['sudo', 'yum', 'install', '-y', f'kubectl-{version}'], check=True, timeout=300)
             else:
-                subprocess.run(['sudo', 'yum', 'install', '-y', 'kubectl'], check=True, timeout=300)
+                process.run(['sudo', 'yum', 'install', '-y', 'kubectl'], check=True, timeout=300)
         
         # Step 4: Verify installation
         print("✅ Verifying kubectl installation...")
-        result = subprocess.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
+        result = process.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ kubectl installed successfully: {result.stdout.strip()}")
             print("🧪 Test kubectl: kubectl version --client")
@@ -154,14 +158,14 @@ def _install_kubectl_macos(version=None):
     try:
         if version and version != "latest":
             print(f'Installing kubectl version {version} on macOS...')
-            subprocess.run(['brew', 'install', f'kubectl@{version}'], check=True, timeout=300)
+            process.run(['brew', 'install', f'kubectl@{version}'], check=True, timeout=300)
         else:
             print('Installing latest kubectl on macOS...')
-            subprocess.run(['brew', 'install', 'kubectl'], check=True, timeout=300)
+            process.run(['brew', 'install', 'kubectl'], check=True, timeout=300)
         
         # Verify installation
         print("✅ Verifying kubectl installation...")
-        result = subprocess.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
+        result = process.run(['kubectl', 'version', '--client'], capture_output=True, text=True, timeout=30)
         if result.returncode == 0:
             print(f"✅ kubectl installed successfully: {result.stdout.strip()}")
             print("🧪 Test kubectl: kubectl version --client")
@@ -187,10 +191,10 @@ def _install_kubectl_windows(version=None):
     try:
         if version and version != "latest":
             print(f'Installing kubectl version {version} on Windows...')
-            subprocess.run(['winget', 'install', 'Kubernetes.kubectl', '--version', version], check=True, timeout=300)
+            process.run(['winget', 'install', 'Kubernetes.kubectl', '--version', version], check=True, timeout=300)
         else:
             print('Installing latest kubectl on Windows...')
-            subprocess.run(['winget', 'install', 'Kubernetes.kubectl'], check=True, timeout=300)
+            process.run(['winget', 'install', 'Kubernetes.kubectl'], check=True, timeout=300)
         
         print("✅ kubectl installed successfully!")
         print("🧪 Test kubectl: kubectl version --client")
@@ -215,15 +219,15 @@ def uninstall(version=None):
             distro = get_linux_distro()
             if 'ubuntu' in distro.lower() or 'debian' in distro.lower():
                 print(f'Uninstalling kubectl from {distro}...')
-                subprocess.run(['sudo', 'apt', 'remove', '-y', 'kubectl'], check=True, timeout=60)
-                subprocess.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
+                process.run(['sudo', 'apt', 'remove', '-y', 'kubectl'], check=True, timeout=60)
+                process.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
             elif 'centos' in distro.lower() or 'rhel' in distro.lower() or 'fedora' in distro.lower():
                 print(f'Uninstalling kubectl from {distro}...')
                 if 'fedora' in distro.lower():
-                    subprocess.run(['sudo', 'dnf', 'remove', '-y', 'kubectl'], check=True, timeout=60)
+                    process.run(['sudo', 'dnf', 'remove', '-y', 'kubectl'], check=True, timeout=60)
                 else:
-                    subprocess.run(['sudo', 'yum', 'remove', '-y', 'kubectl'], check=True, timeout=60)
-                subprocess.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
+                    process.run(['sudo', 'yum', 'remove', '-y', 'kubectl'], check=True, timeout=60)
+                process.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
             else:
                 print(f'Unsupported Linux distribution: {distro}')
                 return False
@@ -231,17 +235,17 @@ def uninstall(version=None):
         elif os_type == 'Darwin':
             print('Uninstalling kubectl from macOS...')
             if version and version != "latest":
-                subprocess.run(['brew', 'uninstall', f'kubectl@{version}'], check=True, timeout=60)
+                process.run(['brew', 'uninstall', f'kubectl@{version}'], check=True, timeout=60)
             else:
-                subprocess.run(['brew', 'uninstall', 'kubectl'], check=True, timeout=60)
-            subprocess.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
+                process.run(['brew', 'uninstall', 'kubectl'], check=True, timeout=60)
+            process.run(['sudo', 'rm', '-f', '/usr/local/bin/kubectl'], check=True, timeout=30)
             
         elif os_type == 'Windows':
             print('Uninstalling kubectl from Windows...')
             if version and version != "latest":
-                subprocess.run(['winget', 'uninstall', 'Kubernetes.kubectl', '--version', version], check=True, timeout=300)
+                process.run(['winget', 'uninstall', 'Kubernetes.kubectl', '--version', version], check=True, timeout=300)
             else:
-                subprocess.run(['winget', 'uninstall', 'Kubernetes.kubectl'], check=True, timeout=300)
+                process.run(['winget', 'uninstall', 'Kubernetes.kubectl'], check=True, timeout=300)
         else:
             print(f'Unsupported OS: {os_type}')
             return False
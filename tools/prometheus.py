@@ -1,49 +1,55 @@
 
 import os
 from utils import get_os, get_linux_distro
-from versioning import get_download_url
+from versioning import get_download_url, resolve_version
+from downloads import extract_tar_stream
+from integrity import get_expected_sha256
+from strategies import use_binary, install_binary
+import process
 
 def install(version=None):
+    if use_binary('prometheus'):
+        return install_binary('prometheus', version)
     os_type = get_os()
     if os_type == 'Linux':
         print('Installing Prometheus on Linux...')
         if version and version != "latest":
             print(f'Installing Prometheus version {version} on Linux...')
-            download_url = get_download_url('prometheus', version, os_type)
-            if download_url:
-                os.system(f'wget {download_url}')
-                os.system(f'tar xvfz prometheus-{version}.linux-amd64.tar.gz')
-                print(f'Prometheus downloaded and extracted. You can start it by running ./prometheus-{version}.linux-amd64/prometheus')
-            else:
-                print(f'Could not generate download URL for version {version}')
+        prometheus_version = resolve_version('prometheus', version, os_type, get_linux_distro())
+        download_url = get_download_url('prometheus', prometheus_version, os_type) if prometheus_version else None
+        if download_url:
+            # Stream the tarball straight into the extractor, verifying it against
+            # the release's sha256sums.txt as it is read
+            extract_dir = f'prometheus-{prometheus_version}.linux-amd64'
+            try:
+                sha256 = get_expected_sha256('prometheus', prometheus_version, download_url)
+                extract_tar_stream(download_url, '.', members=[extract_dir], sha256=sha256)
+            except Exception as e:
+                print(f'❌ Failed to download Prometheus {prometheus_version}: {e}')
+                return False
+            print(f'Prometheus downloaded and extracted. You can start it by running ./{extract_dir}/prometheus')
         else:
-            # Use latest version
-            download_url = get_download_url('prometheus', 'latest', os_type)
-            if download_url:
-                os.system(f'wget {download_url}')
-                os.system('tar xvfz prometheus-*.linux-amd64.tar.gz')
-                print('Prometheus downloaded and extracted. You can start it by running ./prometheus-*/prometheus')
-            else:
-                print('Could not generate download URL for latest version')
+            print(f'Could not generate download URL for version {version or "latest"}')
+            return False
     elif os_type == 'Darwin':
         print('Installing Prometheus on macOS...')
         if version and version != "latest":
             print(f'Installing Prometheus version {version} on macOS...')
-            os.system(f'brew install prometheus@{version}')
+            process.system(f'brew install prometheus@{version}')
         else:
-            os.system('brew install prometheus')
+            process.system('brew install prometheus')
     elif os_type == 'Windows':
         print('Installing Prometheus on Windows...')
         if version and version != "latest":
             download_url = get_download_url('prometheus', version, os_type)
             if download_url:
-                os.system(f'powershell -Command "Invoke-WebRequest -Uri {download_url} -OutFile .\\prometheus.zip; Expand-Archive .\\prometheus.zip -DestinationPath .\\prometheus"')
+                process.system(f'powershell -Command "Invoke-WebRequest -Uri {download_url} -OutFile .\\prometheus.zip; Expand-Archive .\\prometheus.zip -DestinationPath .\\prometheus"')
             else:
                 print(f'Could not generate download URL for version {version}')
         else:
             download_url = get_download_url('prometheus', 'latest', os_type)
             if download_url:
-                os.system(f'powershell -Command "Invoke-WebRequest -Uri {download_url} -OutFile .\\prometheus.zip; Expand-Archive .\\prometheus.zip -DestinationPath .\\prometheus"')
+                process.system(f'powershell -Command "Invoke-WebRequest -Uri {download_url} -OutFile .\\prometheus.zip; Expand-Archive .\\prometheus.zip -DestinationPath .\\prometheus"')
             else:
                 print('Could not generate download URL for latest version')
         print('Prometheus downloaded and unzipped to .\\prometheus. You can start it by running .\\prometheus\\prometheus.exe')
@@ -55,15 +61,15 @@ def uninstall(version=None):
     if os_type == 'Linux':
         print('Uninstalling Prometheus from Linux...')
         if version and version != "latest":
-            os.system(f'rm -rf prometheus-{version}.linux-amd64.tar.gz prometheus-{version}.linux-amd64')
+            process.system(f'rm -rf prometheus-{version}.linux-amd64.tar.gz prometheus-{version}.linux-amd64')
         else:
-            os.system('rm -rf prometheus-2.37.0.linux-amd64.tar.gz prometheus-2.37.0.linux-amd64')
+            process.system('rm -rf prometheus-2.37.0.linux-amd64.tar.gz prometheus-2.37.0.linux-amd64')
     elif os_type == 'Darwin':
         print('Uninstalling Prometheus from macOS...')
         if version and version != "latest":
-            os.system(f'brew uninstall prometheus@{version}')
+            process.system(f'brew uninstall prometheus@{version}')
         else:
-            os.system('brew uninstall prometheus')
+            process.system('brew uninstall prometheus')
     elif os_type == 'Windows':
         print('Uninstalling Prometheus from Windows...')
         print('Please delete the .\\prometheus directory manually.')
@@ -73,4 +79,4 @@ def uninstall(version=None):
         print(f'Unsupported OS: {os_type}')
 
 def update(version=None):
-    install(version) # The installation process also handles updates
+    return install(version) # The installation process also handles updates
@@ -0,0 +1,116 @@
+"""
+Tracing for DevOps CLI
+Records spans for commands, downloads and install steps and writes them in
+Chrome trace-event format (open in Perfetto or chrome://tracing)
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+_events = []
+_events_lock = threading.Lock()
+_thread_names = {}
+_enabled = False
+_origin = time.perf_counter()
+
+
+def enable():
+    """Start recording spans"""
+    global _enabled
+    _enabled = True
+
+
+def is_enabled():
+    return _enabled
+
+
+def reset():
+    """Drop recorded spans and stop recording"""
+    global _enabled
+    with _events_lock:
+        _events.clear()
+    _enabled = False
+
+
+def _now_us():
+    return (time.perf_counter() - _origin) * 1e6
+
+
+def _thread_id():
+    thread = threading.current_thread()
+    ident = threading.get_ident()
+    _thread_names.setdefault(ident, thread.name)
+    return ident
+
+
+@contextmanager
+def span(name, category='cli', **args):
+    """Record the enclosed block as one complete ('X') trace event
+
+    Yields a dict the caller can add args to. Free to use when tracing is
+    off. Exceptions propagate and are noted in the span's args.
+    """
+    if not _enabled:
+        yield {}
+        return
+
+    start = _now_us()
+    error = None
+    try:
+        yield args
+    except BaseException as e:
+        error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        event = {
+            'name': name,
+            'cat': category,
+            'ph': 'X',
+            'ts': round(start, 1),
+            'dur': round(_now_us() - start, 1),
+            'pid': os.getpid(),
+            'tid': _thread_id(),
+        }
+        if error:
+            args = dict(args, error=error)
+        if args:
+            event['args'] = args
+        with _events_lock:
+            _events.append(event)
+
+
+def traced(category, name):
+    """Decorator recording every call as a span; name(*args, **kwargs) builds the span name"""
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _enabled:
+                return function(*args, **kwargs)
+            with span(name(*args, **kwargs), category):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def get_events():
+    """Recorded events plus thread-name metadata, in the order they finished"""
+    with _events_lock:
+        events = list(_events)
+    pid = os.getpid()
+    metadata = [{'name': 'process_name', 'ph': 'M', 'pid': pid, 'tid': 0, 'args': {'name': 'devops-cli'}}]
+    for ident, thread_name in sorted(_thread_names.items()):
+        metadata.append({'name': 'thread_name', 'ph': 'M', 'pid': pid, 'tid': ident, 'args': {'name': thread_name}})
+    return metadata + events
+
+
+def write_trace(path):
+    """Write everything recorded so far as a Chrome trace file"""
+    partial = f"{path}.part"
+    with open(partial, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': get_events(), 'displayTimeUnit': 'ms'}, f)
+    os.replace(partial, path)
+    return path
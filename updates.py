@@ -0,0 +1,96 @@
+"""
+Parallel Updates for DevOps CLI
+Updates several tools at once: downloads and metadata lookups overlap, while
+commands needing the dpkg/rpm lock queue for it in the process layer
+"""
+
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import redirect_stdout
+
+from output import LiveOutput
+from tracing import span
+import metrics
+import process
+
+
+class UpdateResult:
+    """Outcome of updating one tool"""
+
+    def __init__(self, tool):
+        self.tool = tool
+        self.status = 'pending'
+        self.duration = 0.0
+        self.failed_commands = 0
+        self.error = None
+
+
+def update_one(tool_name, module):
+    """Run one tool's update() on this thread; never raises
+
+    Several installers return None (or an exit code) whatever happened, so
+    unless update() returned True a failed command means a failed update.
+    """
+    result = UpdateResult(tool_name)
+    start = time.time()
+    returned = False
+    with metrics.labels_context(tool=tool_name), process.labelled_output(tool_name), \
+            process.accounting_scope(tool_name) as scope, span(f"update {tool_name}", 'tool'):
+        try:
+            returned = module.update()
+        except Exception as e:
+            result.error = f"{type(e).__name__}: {e}"
+            print(f"❌ Error updating {tool_name}: {e}")
+    result.duration = time.time() - start
+    result.failed_commands = sum(1 for record in scope.records if record.returncode)
+    if returned is False or result.error or (returned is not True and result.failed_commands):
+        result.status = 'failed'
+    else:
+        result.status = 'ok'
+    return result
+
+
+def print_summary(results, wall_time):
+    """Per-tool timing table, as for fleet runs"""
+    width = max([len(r.tool) for r in results] + [4])
+    print()
+    print("Update Summary:")
+    print("=" * (width + 40))
+    print(f"{'TOOL':<{width}}  {'STATUS':<8} {'FAILED CMDS':>11}  {'TIME':>8}")
+    for result in sorted(results, key=lambda r: r.duration, reverse=True):
+        print(f"{result.tool:<{width}}  {result.status:<8} {result.failed_commands:>11}  {result.duration:>7.1f}s")
+    print("-" * (width + 40))
+    durations = sorted(r.duration for r in results)
+    if durations:
+        print(f"Wall time: {wall_time:.1f}s  (slowest tool {durations[-1]:.1f}s, serial sum {sum(durations):.1f}s)")
+    for result in results:
+        if result.error:
+            print(f"❌ {result.tool}: {result.error}")
+
+
+def update_tools(modules, max_workers=None):
+    """Update every tool in modules ({name: module}) concurrently; returns True if all succeeded
+
+    Each tool runs on its own thread; its output is prefixed by its name, or
+    on a terminal summarised in a live view (see output.LiveOutput). A tool
+    that fails or raises does not stop the others.
+    """
+    if not modules:
+        return True
+    workers = max(1, max_workers or len(modules))
+    print(f"🚀 Updating {len(modules)} tool(s), {min(workers, len(modules))} at a time...")
+
+    start = time.time()
+    with LiveOutput(sys.stdout, list(modules)) as live:
+        def run(item):
+            live.start_job(item[0])
+            result = update_one(*item)
+            live.finish_job(item[0], result.status == 'ok', result.error)
+            return result
+
+        with redirect_stdout(live), ThreadPoolExecutor(max_workers=workers, thread_name_prefix='update') as pool:
+            results = list(pool.map(run, modules.items()))
+
+    print_summary(results, time.time() - start)
+    return all(r.status == 'ok' for r in results)
@@ -1,9 +1,78 @@
 
+import os
 import platform
+import threading
 import distro
+from urllib.parse import urlsplit
 
 def get_os():
     return platform.system()
 
+_distro_name = None
+
 def get_linux_distro():
-    return distro.name()
+    """distro.name(), read once per process (it parses /etc/os-release and friends)"""
+    global _distro_name
+    if _distro_name is None:
+        _distro_name = distro.name()
+    return _distro_name
+
+_http_session = None
+_http_session_lock = threading.Lock()
+
+def get_http_session():
+    """One requests.Session per process, so repeated fetches reuse pooled keep-alive connections"""
+    global _http_session
+    with _http_session_lock:
+        if _http_session is None:
+            import requests
+            _http_session = requests.Session()
+        return _http_session
+
+def get_cache_dir(*parts):
+    """Return the DevOps CLI cache directory (created on demand)"""
+    base = os.environ.get('DEVOPS_CLI_CACHE_DIR')
+    if not base:
+        if platform.system() == 'Windows':
+            base = os.path.join(os.environ.get('LOCALAPPDATA', os.path.expanduser('~')), 'devops-cli', 'cache')
+        else:
+            base = os.path.join(os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'), 'devops-cli')
+    path = os.path.join(base, *parts)
+    os.makedirs(path, exist_ok=True)
+    return path
+
+def get_install_prefix():
+    """Prefix for tools devops-cli manages itself: DEVOPS_CLI_PREFIX, /usr/local for root, else ~/.local"""
+    prefix = os.environ.get('DEVOPS_CLI_PREFIX')
+    if prefix:
+        return os.path.abspath(os.path.expanduser(prefix))
+    if hasattr(os, 'geteuid') and os.geteuid() == 0:
+        return '/usr/local'
+    return os.path.expanduser('~/.local')
+
+def get_data_dir(*parts):
+    """devops-cli's own data directory (DEVOPS_CLI_DATA_DIR, else <prefix>/share/devops-cli): store, shims, downloads"""
+    base = os.environ.get('DEVOPS_CLI_DATA_DIR') or os.path.join(get_install_prefix(), 'share', 'devops-cli')
+    return os.path.join(os.path.abspath(os.path.expanduser(base)), *parts)
+
+def get_managed_bin_dir():
+    return os.path.join(get_install_prefix(), 'bin')
+
+def get_platform_tag():
+    """Return the current platform as '<os>-<arch>', e.g. 'linux-amd64'"""
+    machine = platform.machine().lower()
+    arch = {'x86_64': 'amd64', 'amd64': 'amd64', 'aarch64': 'arm64', 'arm64': 'arm64'}.get(machine, machine)
+    return f"{platform.system().lower()}-{arch}"
+
+def rewrite_url(url):
+    """Send an https://host/path request to DEVOPS_CLI_RELEASE_SERVER/host/path when that is set
+
+    Used to point version lookups, checksum manifests and downloads at a local
+    stand-in such as benchmarks/release_server.py instead of the real hosts.
+    """
+    server = os.environ.get('DEVOPS_CLI_RELEASE_SERVER')
+    if not server:
+        return url
+    parts = urlsplit(url)
+    rewritten = f"{server.rstrip('/')}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
@@ -6,6 +6,10 @@ from bs4 import BeautifulSoup
 from packaging import version
 import time
 import platform
+from mirror import get_active_mirror
+from utils import get_cache_dir, get_http_session, rewrite_url
+from tracing import span
+import metrics
 
 # Cache for version data to avoid repeated API calls
 _version_cache = {}
@@ -16,17 +20,67 @@ def _get_cached_versions(tool_name):
     if tool_name in _version_cache:
         cached_time, versions = _version_cache[tool_name]
         if time.time() - cached_time < _cache_timeout:
+            metrics.inc('devops_cli_cache_requests_total', cache='versions', result='hit')
             return versions
+    metrics.inc('devops_cli_cache_requests_total', cache='versions', result='miss')
     return None
 
 def _cache_versions(tool_name, versions):
     """Cache versions with timestamp"""
     _version_cache[tool_name] = (time.time(), versions)
+    _persist_versions(tool_name, versions)
+
+def _versions_cache_file():
+    return os.path.join(get_cache_dir(), 'versions.json')
+
+def _load_persisted_versions():
+    try:
+        with open(_versions_cache_file(), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def _persist_versions(tool_name, versions):
+    """Keep the last fetched version list on disk so offline commands can show it"""
+    try:
+        persisted = _load_persisted_versions()
+        persisted[tool_name] = {'fetched': time.time(), 'versions': versions}
+        partial = f"{_versions_cache_file()}.{os.getpid()}.part"
+        with open(partial, 'w', encoding='utf-8') as f:
+            json.dump(persisted, f)
+        os.replace(partial, _versions_cache_file())
+    except OSError:
+        pass
+
+def get_cached_latest_version(tool_name):
+    """Newest version seen by an earlier lookup, read from disk without any network access"""
+    for key, entry in _load_persisted_versions().items():
+        if key.rsplit('_', 1)[0] == tool_name:
+            for candidate in entry.get('versions', []):
+                if candidate != "latest":
+                    return candidate
+    return None
+
+def _http_get(url, timeout=10):
+    """requests.get with a trace span and latency metric, so slow version lookups show up"""
+    source = metrics.source_of(url)
+    with span(f"GET {url}", 'network', url=url), \
+            metrics.timer('devops_cli_metadata_fetch_duration_seconds', source=source):
+        try:
+            response = get_http_session().get(rewrite_url(url), timeout=timeout)
+        except requests.exceptions.RequestException:
+            metrics.record_failure('metadata_unreachable')
+            raise
+    if response.status_code in (403, 429):
+        metrics.record_failure('rate_limited')
+    elif response.status_code >= 400:
+        metrics.record_failure('metadata_error')
+    return response
 
 def _fetch_github_releases(repo_url, max_versions=5):
     """Fetch releases from GitHub API - gets latest 4 + latest (5 total)"""
     try:
-        response = requests.get(repo_url, timeout=10)
+        response = _http_get(repo_url)
         response.raise_for_status()
         releases = response.json()
         
@@ -104,7 +158,7 @@ def _fetch_docker_desktop_versions():
     """Fetch Docker Desktop versions from release notes"""
     try:
         url = 'https://docs.docker.com/desktop/release-notes/'
-        response = requests.get(url, timeout=10)
+        response = _http_get(url)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -135,7 +189,7 @@ def _fetch_jenkins_versions():
     try:
         # Jenkins has a specific API for LTS versions
         url = 'https://api.github.com/repos/jenkinsci/jenkins/releases'
-        response = requests.get(url, timeout=10)
+        response = _http_get(url)
         response.raise_for_status()
         releases = response.json()
         
@@ -163,7 +217,7 @@ def _fetch_gcloud_versions():
     try:
         # Google Cloud SDK versions are available via their API
         url = 'https://api.github.com/repos/GoogleCloudPlatform/cloud-sdk/releases'
-        response = requests.get(url, timeout=10)
+        response = _http_get(url)
         response.raise_for_status()
         releases = response.json()
         
@@ -658,4 +712,69 @@ def get_terraform_versions(os_type, distro=None):
         return get_terraform_versions_macos()
     elif os_type == 'Windows':
         return get_terraform_versions_windows()
-    return ["latest"]
\ No newline at end of file
+    return ["latest"]
+
+
+def get_version_candidates(tool_name, os_type, distro=None):
+    """Get the published versions of a tool, newest first, including 'latest'"""
+    # Offline installs only know about what the bundle contains
+    mirror = get_active_mirror()
+    if mirror is not None:
+        return mirror.versions(tool_name)
+
+    version_functions = {
+        'docker': get_docker_versions,
+        'kubectl': get_kubectl_versions,
+        'awscli': get_awscli_versions,
+        'gcloud': get_gcloud_versions,
+        'az': get_az_versions,
+        'jenkins': get_jenkins_versions,
+        'helm': get_helm_versions,
+        'prometheus': get_prometheus_versions,
+        'terraform': get_terraform_versions
+    }
+    if tool_name not in version_functions:
+        return []
+    return version_functions[tool_name](os_type, distro)
+
+
+def resolve_version(tool_name, requested_version, os_type, distro=None):
+    """Resolve 'latest' (or None) to the newest concrete version for a tool"""
+    if requested_version and requested_version != "latest":
+        return requested_version
+
+    for candidate in get_version_candidates(tool_name, os_type, distro):
+        if candidate != "latest":
+            return candidate
+    return None
+
+
+# Release artifacts published per platform, used for direct and offline installs
+_ARTIFACT_URLS = {
+    'kubectl': 'https://dl.k8s.io/release/v{version}/bin/{os}/{arch}/kubectl{exe}',
+    'helm': 'https://get.helm.sh/helm-v{version}-{os}-{arch}.{archive}',
+    'terraform': 'https://releases.hashicorp.com/terraform/{version}/terraform_{version}_{os}_{arch}.zip',
+    'prometheus': 'https://github.com/prometheus/prometheus/releases/download/v{version}/prometheus-{version}.{os}-{arch}.{archive}',
+    'jenkins': 'https://get.jenkins.io/war-stable/{version}/jenkins.war',
+}
+
+
+def get_artifact_url(tool_name, version, platform_tag):
+    """Get the release artifact URL for a tool on a '<os>-<arch>' platform"""
+    os_name, _, arch = platform_tag.partition('-')
+    if tool_name == 'awscli':
+        # The AWS CLI v2 bundled installer is only published as a Linux zip
+        if os_name != 'linux':
+            return None
+        machine = {'amd64': 'x86_64', 'arm64': 'aarch64'}.get(arch, arch)
+        suffix = f"-{version}" if version and version != "latest" else ""
+        return f"https://awscli.amazonaws.com/awscli-exe-linux-{machine}{suffix}.zip"
+
+    template = _ARTIFACT_URLS.get(tool_name)
+    if not template or not version or version == "latest":
+        return None
+    return template.format(
+        version=version, os=os_name, arch=arch,
+        exe='.exe' if os_name == 'windows' else '',
+        archive='zip' if os_name == 'windows' else 'tar.gz'
+    )